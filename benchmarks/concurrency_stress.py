@@ -0,0 +1,270 @@
+"""Нагрузочная проверка менеджера задач при одновременной работе читателей и писателей
+
+Несколько потоков-читателей выполняют запросы, поиск и статистику, пока потоки-писатели добавляют,
+редактируют и удаляют задачи, в том числе транзакциями с откатом. Читатели проверяют согласованность
+каждого ответа, а после остановки потоков индексы сверяются с перебором задач и с данными хранилища.
+
+Запуск из корня репозитория:
+    python -m benchmarks.concurrency_stress --tasks 5000 --readers 8 --writers 4 --seconds 10
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from datetime import date, timedelta
+from functools import partial
+
+from task_manager.query import TaskQuery
+from task_manager.storage import Storage
+from task_manager.task import Task
+from task_manager.task_manager import TaskManager
+
+# Задачи, которые писатели добавляют и удаляют только парами в одной транзакции
+PAIR_CATEGORY = "Личное"
+PAIR_PREFIX = "Пара"
+
+
+class Rollback(Exception):
+    """Исключение для намеренного отката транзакции"""
+
+
+class StressState:
+    """Общие счетчики и ошибки потоков"""
+
+    def __init__(self) -> None:
+        """Инициализация пустых счетчиков"""
+        self.lock = threading.Lock()
+        self.operations: Counter[str] = Counter()
+        self.errors: list[str] = []
+        self.rolled_back: set[str] = set()
+        self.next_pair = 0
+
+    def count(self, operation: str) -> None:
+        """
+        Учитывает выполненную операцию
+
+        :param operation: Название операции
+        """
+        with self.lock:
+            self.operations[operation] += 1
+
+    def fail(self, message: str) -> None:
+        """
+        Запоминает нарушение согласованности или неожиданное исключение
+
+        :param message: Описание ошибки
+        """
+        with self.lock:
+            self.errors.append(message)
+
+    def new_pair(self) -> str:
+        """
+        Выдает заголовок для новой пары задач
+
+        :return: Уникальный заголовок
+        """
+        with self.lock:
+            self.next_pair += 1
+            return f"{PAIR_PREFIX} {self.next_pair}"
+
+
+def random_task(title: str | None = None, category: str | None = None) -> Task:
+    """
+    Создает задачу со случайными полями
+
+    :param title: Заголовок. По умолчанию случайный
+    :param category: Категория. По умолчанию случайная, кроме категории пар
+    :return: Новая задача без ID
+    """
+    number = random.randrange(1_000_000)
+    categories = [category for category in Task.ALL_CATEGORIES if category != PAIR_CATEGORY]
+    return Task(
+        title or f"Задача {number}",
+        f"Описание задачи номер {number}",
+        date(2025, 1, 1) + timedelta(days=random.randrange(365)),
+        random.choice(Task.ALL_PRIORITIES),
+        category or random.choice(categories),
+        random.choice(Task.ALL_STATUSES),
+    )
+
+
+def writer(manager: TaskManager, state: StressState, deadline: float) -> None:
+    """
+    Поток-писатель: случайные изменения задач до наступления срока
+
+    ID берутся из снимка, поэтому задача может оказаться удаленной другим писателем;
+    такие операции завершаются `IndexError` и считаются конфликтами.
+
+    :param manager: Проверяемый менеджер
+    :param state: Общее состояние проверки
+    :param deadline: Время остановки по `time.perf_counter`
+    """
+    while time.perf_counter() < deadline:
+        operation = random.choice(("add", "edit", "delete", "pair", "unpair", "rollback"))
+        try:
+            if operation == "add":
+                manager.add_task(random_task())
+            elif operation == "edit":
+                task_ids = [task.id for task in manager.snapshot().values() if task.category != PAIR_CATEGORY]
+                if task_ids:
+                    manager.edit_task(random.choice(task_ids), random_task())
+            elif operation == "delete":
+                task_ids = [task.id for task in manager.snapshot().values() if task.category != PAIR_CATEGORY]
+                if task_ids:
+                    manager.delete_task(random.choice(task_ids))
+            elif operation == "pair":
+                title = state.new_pair()
+                manager.add_tasks([random_task(title, PAIR_CATEGORY), random_task(title, PAIR_CATEGORY)])
+            elif operation == "unpair":
+                with manager.transaction():
+                    pairs = manager.get_tasks_by_category(PAIR_CATEGORY)
+                    if pairs:
+                        title = random.choice(pairs).title
+                        manager.delete_tasks([task.id for task in pairs if task.title == title])
+            else:
+                title = state.new_pair()
+                with state.lock:
+                    state.rolled_back.add(title)
+                try:
+                    with manager.transaction():
+                        manager.add_task(random_task(title, PAIR_CATEGORY))
+                        manager.add_task(random_task(title, PAIR_CATEGORY))
+                        raise Rollback()
+                except Rollback:
+                    pass
+            state.count(operation)
+        except IndexError:
+            state.count("conflict")
+        except Exception as e:
+            state.fail(f"{operation}: {type(e).__name__}: {e}")
+
+
+def reader(manager: TaskManager, state: StressState, deadline: float) -> None:
+    """
+    Поток-читатель: запросы с проверкой согласованности каждого ответа до наступления срока
+
+    :param manager: Проверяемый менеджер
+    :param state: Общее состояние проверки
+    :param deadline: Время остановки по `time.perf_counter`
+    """
+    while time.perf_counter() < deadline:
+        operation = random.choice(("query", "stats", "pairs", "snapshot", "overdue"))
+        try:
+            if operation == "query":
+                status = random.choice(Task.ALL_STATUSES)
+                result = manager.query(TaskQuery(filters={"status": status}, sort=[("due_date", "asc")], limit=100))
+                if any(task.status != status for task in result):
+                    state.fail("query: задача с другим статусом")
+                keys = [(task.due_date, task.id) for task in result]
+                if keys != sorted(keys):
+                    state.fail("query: нарушен порядок сортировки")
+            elif operation == "stats":
+                stats = manager.get_stats()
+                for field in ("by_category", "by_priority", "by_status"):
+                    if sum(stats[field].values()) != stats["total"]:
+                        state.fail(f"stats: сумма {field} не равна общему количеству")
+                if sum(item["count"] for item in stats["breakdown"]) != stats["total"]:
+                    state.fail("stats: сумма breakdown не равна общему количеству")
+            elif operation == "pairs":
+                titles = Counter(task.title for task in manager.get_tasks_by_category(PAIR_CATEGORY))
+                if any(count != 2 for count in titles.values()):
+                    state.fail("pairs: видна половина транзакции")
+                with state.lock:
+                    rolled_back = state.rolled_back.intersection(titles)
+                if rolled_back:
+                    state.fail("pairs: видны задачи отмененной транзакции")
+            elif operation == "snapshot":
+                snapshot = manager.snapshot()
+                if any(task_id != task.id for task_id, task in snapshot.items()):
+                    state.fail("snapshot: ID задачи не совпадает с ключом")
+            else:
+                until = date(2025, 1, 1) + timedelta(days=random.randrange(365))
+                tasks = manager.get_overdue_tasks(until)
+                if any(task.status == "Завершено" or task.due_date >= until for task in tasks):
+                    state.fail("overdue: лишняя задача")
+            state.count(operation)
+        except Exception as e:
+            state.fail(f"{operation}: {type(e).__name__}: {e}")
+
+
+def verify(manager: TaskManager, storage: Callable[[], Storage], state: StressState) -> None:
+    """
+    Сверяет индексы с перебором задач и состояние менеджера с данными хранилища
+
+    :param manager: Проверяемый менеджер после остановки потоков
+    :param storage: Функция, открывающая хранилище проверяемого менеджера
+    :param state: Общее состояние проверки
+    """
+    tasks = list(manager.snapshot().values())
+    if len(manager) != len(tasks):
+        state.fail("итог: количество задач не совпадает со снимком")
+    all_values = {"category": Task.ALL_CATEGORIES, "priority": Task.ALL_PRIORITIES, "status": Task.ALL_STATUSES}
+    for field, values in all_values.items():
+        counts = Counter(getattr(task, field) for task in tasks)
+        if manager.count_tasks_by(field) != {value: counts[value] for value in values}:
+            state.fail(f"итог: счетчики по полю {field} не совпадают с перебором")
+    for category in Task.ALL_CATEGORIES:
+        if [task.id for task in manager.get_tasks_by_category(category)] != \
+                sorted(task.id for task in tasks if task.category == category):
+            state.fail(f"итог: индекс категории {category} не совпадает с перебором")
+    expected = sorted(tasks, key=lambda task: (task.due_date, task.id))
+    if list(manager.query(TaskQuery(sort=[("due_date", "asc")]))) != expected:
+        state.fail("итог: сортировка по сроку не совпадает с перебором")
+
+    manager.close()
+    reloaded = TaskManager(storage())
+    if {task.id: task.to_dict() for task in reloaded.tasks} != {task.id: task.to_dict() for task in tasks}:
+        state.fail("итог: данные хранилища не совпадают с менеджером")
+
+
+def main() -> None:
+    """Запуск проверки"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=5000, help="Количество задач перед началом")
+    parser.add_argument("--readers", type=int, default=8, help="Количество потоков-читателей")
+    parser.add_argument("--writers", type=int, default=4, help="Количество потоков-писателей")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Длительность нагрузки в секундах")
+    parser.add_argument(
+        "--storage", choices=("json", "bin", "db", "parts"), default="json", help="Формат хранилища"
+    )
+    parser.add_argument("--journal", action="store_true", help="Записывать изменения в журнал")
+    parser.add_argument("--write-behind", action="store_true", help="Записывать изменения в фоне")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage_path = os.path.join(directory, f"tasks.{args.storage}")
+        storage = partial(Storage, storage_path, journal=args.journal)
+        manager = TaskManager(storage(), write_behind=args.write_behind)
+        manager.add_tasks([random_task() for _ in range(args.tasks)])
+
+        state = StressState()
+        deadline = time.perf_counter() + args.seconds
+        threads = [threading.Thread(target=writer, args=(manager, state, deadline)) for _ in range(args.writers)]
+        threads += [threading.Thread(target=reader, args=(manager, state, deadline)) for _ in range(args.readers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        verify(manager, storage, state)
+
+    print(f"Хранилище: {args.storage}, задач в начале: {args.tasks}, "
+          f"читателей: {args.readers}, писателей: {args.writers}, время: {elapsed:.1f} с")
+    for operation, count in sorted(state.operations.items()):
+        print(f"{operation:<10} {count:>10}  {count / elapsed:10.1f} оп/с")
+    if state.errors:
+        print(f"Ошибок: {len(state.errors)}")
+        for message in Counter(state.errors).most_common(20):
+            print(f"  {message[1]:>6} x {message[0]}")
+        raise SystemExit(1)
+    print("Ошибок не обнаружено")
+
+
+if __name__ == "__main__":
+    main()
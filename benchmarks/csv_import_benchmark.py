@@ -0,0 +1,78 @@
+"""Замер скорости разбора CSV-файла в одном процессе и в пуле процессов
+
+Запуск из корня репозитория:
+    python -m benchmarks.csv_import_benchmark --rows 1000000 --workers 1 2 4 8
+"""
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from task_manager.importers import iter_csv_parallel, iter_csv_rows, task_from_csv_row, task_from_parsed
+from task_manager.task import Task
+
+
+def generate_csv(file_path: str, rows: int) -> None:
+    """
+    Создает CSV-файл со случайными задачами
+
+    :param file_path: Путь к создаваемому файлу
+    :param rows: Количество строк
+    """
+    start = date(2025, 1, 1)
+    with open(file_path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Title", "Description", "Due Date", "Priority", "Category", "Status"])
+        for number in range(rows):
+            writer.writerow([
+                f"Задача {number}",
+                f"Описание задачи номер {number}",
+                (start + timedelta(days=random.randrange(365))).isoformat(),
+                random.choice(Task.ALL_PRIORITIES),
+                random.choice(Task.ALL_CATEGORIES),
+                random.choice(Task.ALL_STATUSES),
+            ])
+
+
+def measure(label: str, parse) -> float:
+    """
+    Замеряет время полного разбора
+
+    :param label: Подпись для вывода
+    :param parse: Функция, возвращающая итератор по результатам разбора
+    :return: Время в секундах
+    """
+    started = time.perf_counter()
+    count = sum(1 for _ in parse())
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24} {count:>10} строк  {elapsed:8.2f} с")
+    return elapsed
+
+
+def main() -> None:
+    """Запуск замеров"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000, help="Количество строк в тестовом файле")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Количество процессов")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "tasks.csv")
+        generate_csv(file_path, args.rows)
+        print(f"Файл: {os.path.getsize(file_path) / 2 ** 20:.1f} МБ, ядер: {os.cpu_count()}")
+
+        baseline = measure("один процесс", lambda: (task_from_csv_row(row) for row in iter_csv_rows(file_path)))
+        for workers in args.workers:
+            elapsed = measure(
+                f"пул, процессов: {workers}",
+                lambda: (task_from_parsed(item) for item in iter_csv_parallel(file_path, workers))
+            )
+            print(f"{'':<24} ускорение x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
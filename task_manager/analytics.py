@@ -5,26 +5,25 @@ class Analytics:
         self.task_manager = task_manager
 
     def generate_report(self, start_date, end_date):
-        tasks = self.task_manager.get_tasks()
-        completed_tasks = [task for task in tasks if task.status == "Завершено" and start_date <= task.due_date <= end_date]
-        overdue_tasks = self.task_manager.get_overdue_tasks()
+        total_tasks = len(self.task_manager)
+        tasks_in_range = self.task_manager.get_tasks_due_between(start_date, end_date)
+        completed_tasks = [task for task in tasks_in_range if task.status == "Завершено"]
+        overdue_count = self.task_manager.count_overdue_tasks()
 
         report = {
-            "total_tasks": len(tasks),
+            "total_tasks": total_tasks,
             "completed_tasks": len(completed_tasks),
-            "overdue_tasks": len(overdue_tasks),
-            "completion_rate": len(completed_tasks) / len(tasks) if len(tasks) > 0 else 0
+            "overdue_tasks": overdue_count,
+            "completion_rate": len(completed_tasks) / total_tasks if total_tasks > 0 else 0
         }
         return report
 
+    def time_series(self, start_date, end_date, freq="day", window=7, category=None):
+        engine = self.task_manager.time_series()
+        return engine.series(start_date, end_date, freq=freq, window=window, category=category)
+
     def plot_tasks_by_category(self):
-        tasks = self.task_manager.get_tasks()
-        categories = {}
-        for task in tasks:
-            if task.category in categories:
-                categories[task.category] += 1
-            else:
-                categories[task.category] = 1
+        categories = self.task_manager.count_tasks_by("category")
 
         plt.bar(categories.keys(), categories.values())
         plt.xlabel("Категории")
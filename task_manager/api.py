@@ -1,32 +1,64 @@
 """Модуль для API взаимодействия с задачами"""
 
-from flask import Flask, jsonify, request
-from datetime import datetime
+from flask import Flask, Response, jsonify, request
+import base64
+import binascii
+import json
+import os
+from datetime import date, datetime, time, timezone
+from collections.abc import Callable, Iterator
 from typing import Any
 
+from .cache import ResultCache
+from .importers import validate_task
+from .query import QUERY_FIELDS, TaskQuery
 from .task_manager import TaskManager
 from .task import Task
+from .timeseries import default_period
 
 
 app = Flask(__name__)
 
+# Количество задач, которое потоковый ответ запрашивает у менеджера задач за один раз
+STREAM_PAGE_SIZE = 1000
+
+# Поля задачи, которые можно задавать через API
+EDITABLE_FIELDS = ("title", "description", "due_date", "priority", "category", "status")
+
+# Максимальное количество элементов в одном пакетном запросе
+MAX_BATCH_SIZE = 10_000
+
+# Хранилище общее для нескольких процессов API (например, воркеров gunicorn): TASKS_SHARED_STORAGE=1
+SHARED_STORAGE = os.environ.get("TASKS_SHARED_STORAGE") == "1"
+
 
 class TaskAPI:
     """Класс для обработки API запросов, связанных с задачами"""
 
-    def __init__(self) -> None:
-        """Инициализация API для работы с задачами"""
-        self.task_manager = TaskManager()
+    def __init__(self, shared: bool = SHARED_STORAGE) -> None:
+        """
+        Инициализация API для работы с задачами
+
+        Изменения записываются в хранилище в фоне, чтобы запросы не ждали сериализации всего списка.
+        Если хранилище общее для нескольких процессов, изменения записываются сразу под межпроцессной
+        блокировкой, а перед каждым запросом задачи перечитываются, если их изменил другой процесс
+        (см. `TaskManager` с параметром `shared`).
+
+        :param shared: Хранилище используется несколькими процессами. По умолчанию `SHARED_STORAGE`
+        """
+        self.task_manager = TaskManager(write_behind=not shared, shared=shared)
+        self.cache = ResultCache()
 
-    def task_to_dict(self, task: Task) -> dict[str, Any]:
+    def task_to_dict(self, task: Task, fields: list[str] | None = None) -> dict[str, Any]:
         """
         Преобразует задачу в словарь
 
         :param task: Объект задачи
+        :param fields: Поля, которые нужно включить в словарь. По умолчанию все поля
         :return: Словарь с данными задачи
         """
-        return {
-            "id": id(task),
+        data = {
+            "id": task.id,
             "title": task.title,
             "description": task.description,
             "due_date": task.due_date.isoformat(),
@@ -35,30 +67,244 @@ class TaskAPI:
             "status": task.status,
             "created_at": task.created_at.isoformat()
         }
+        if fields is None:
+            return data
+        return {field: data[field] for field in fields}
+
+    def _cached(self, name: str, compute: Callable[[], Any], date_sensitive: bool = False, **kwargs: Any) -> Any:
+        """
+        Возвращает результат запроса из кэша или вычисляет его
+
+        Ключ кэша составляется из имени запроса и параметров HTTP-запроса, а результат
+        привязывается к текущей версии данных менеджера задач.
+
+        :param name: Имя запроса
+        :param compute: Функция вычисления результата
+        :param date_sensitive: Результат зависит от текущей даты
+        :param kwargs: Дополнительные параметры `ResultCache.get_or_compute`
+        :return: Результат запроса
+        """
+        key = (name, tuple(sorted(request.args.items(multi=True))))
+        return self.cache.get_or_compute(key, self.task_manager.version, compute, date_sensitive, **kwargs)
+
+    def _conditional(self, respond: Callable[[], Response], date_sensitive: bool = False) -> Response:
+        """
+        Отвечает на условный GET-запрос по состоянию данных
+
+        ETag вычисляется из признака состояния данных (см. `TaskManager.state_tag`), а не из тела ответа,
+        поэтому если ETag у клиента совпадает с текущим (заголовок If-None-Match), ответ 304 возвращается
+        без выборки и сериализации задач. Признак записанных данных одинаков у всех процессов API, поэтому
+        ETag, полученный от одного процесса, подходит и для другого. Для ответов, зависящих от текущей даты,
+        в ETag входит дата.
+
+        :param respond: Функция, формирующая полный ответ
+        :param date_sensitive: Ответ зависит от текущей даты
+        :return: Ответ 304 или полный ответ с заголовками ETag и Last-Modified
+        """
+        etag = self.task_manager.state_tag
+        last_modified = self.task_manager.last_modified
+        if date_sensitive:
+            today = date.today()
+            etag = f"{etag}-{today:%Y%m%d}"
+            last_modified = max(last_modified, datetime.combine(today, time.min).astimezone(timezone.utc))
+
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = respond()
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        return response
 
     def get_tasks(self) -> jsonify:
         """
-        Возвращает список задач с возможностью сортировки
+        Возвращает список задач с возможностью фильтрации, сортировки и постраничного вывода
+
+        Параметры запроса: sort_by и order ("asc" или "desc") — сортировка; status, category, priority —
+        фильтры (несколько значений перечисляются через запятую); due_from и due_to — диапазон срока
+        выполнения в формате ISO; q — поиск по тексту; limit и offset — страница результата;
+        cursor — продолжение с места, на котором закончилась предыдущая страница; fields — поля задач
+        в ответе через запятую; stream=1 — потоковый ответ без ограничения размера страницы.
+        Общее количество подходящих задач возвращается в заголовке X-Total-Count, курсор следующей
+        страницы (если она есть) — в заголовке X-Next-Cursor.
+
+        :return: JSON-ответ со списком задач
+        """
+        try:
+            query = self._query_from_request()
+            fields = self._fields_from_request()
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
 
-        :return: JSON-ответ с отсортированным списком задач
+        if request.args.get("stream") in ("1", "true"):
+            return self._conditional(lambda: self._stream_tasks(query, fields))
+
+        def compute() -> tuple[list[dict[str, Any]], int, str | None]:
+            # Одна лишняя задача показывает, есть ли следующая страница
+            limit = query.limit
+            result = self.task_manager.query(self._page_query(query, None if limit is None else limit + 1))
+            page = result.tasks[:limit]
+            next_cursor = None
+            # Порядок по релевантности не продолжается курсором
+            if limit and len(result) > limit and (query.search is None or query.sort):
+                next_cursor = self._encode_cursor(query, page[-1])
+            return [self.task_to_dict(task, fields) for task in page], result.total, next_cursor
+
+        def respond() -> Response:
+            tasks, total, next_cursor = self._cached("tasks", compute, size=lambda value: len(value[0]))
+            response = jsonify(tasks)
+            response.headers["X-Total-Count"] = str(total)
+            if next_cursor is not None:
+                response.headers["X-Next-Cursor"] = next_cursor
+            return response
+
+        return self._conditional(respond)
+
+    def _stream_tasks(self, query: TaskQuery, fields: list[str] | None) -> Response:
         """
-        sort_column = request.args.get("sort_by", default=None)
-        sort_order = request.args.get("order", default="asc")
+        Возвращает задачи потоковым JSON-ответом
 
-        tasks = self.task_manager.get_tasks()
+        Задачи запрашиваются у менеджера задач страницами по `STREAM_PAGE_SIZE` и сериализуются
+        по мере отправки, поэтому ни полный список задач, ни весь ответ целиком в памяти не хранятся.
+        Следующая страница продолжает предыдущую по курсору, так что изменения задач во время отправки
+        не приводят к пропускам или повторам.
 
-        if sort_column:
-            reverse = sort_order == "desc"
-            if sort_column == "due_date":
-                tasks.sort(key=lambda x: x.due_date, reverse=reverse)
-            elif sort_column == "priority":
-                tasks.sort(key=lambda x: Task.ALL_PRIORITIES.index(x.priority), reverse=reverse)
-            elif sort_column == "status":
-                tasks.sort(key=lambda x: Task.ALL_STATUSES.index(x.status), reverse=reverse)
-            else:
-                tasks.sort(key=lambda x: getattr(x, sort_column), reverse=reverse)
+        :param query: Описание запроса
+        :param fields: Поля задач в ответе или None для всех полей
+        :return: Потоковый ответ с JSON-массивом задач
+        """
+        # Порядок по релевантности не продолжается курсором, поэтому такой результат выбирается целиком
+        page_size = STREAM_PAGE_SIZE if query.search is None or query.sort else None
+        first = self.task_manager.query(self._page_query(query, self._stream_limit(query.limit, page_size)))
+
+        def generate() -> Iterator[str]:
+            result, remaining, separator = first, query.limit, "["
+            while True:
+                for task in result:
+                    yield separator + json.dumps(self.task_to_dict(task, fields))
+                    separator = ","
+                if remaining is not None:
+                    remaining -= len(result)
+                if page_size is None or len(result) < page_size or remaining == 0:
+                    break
+                after = query.cursor(result[-1])
+                result = self.task_manager.query(
+                    self._page_query(query, self._stream_limit(remaining, page_size), offset=0, after=after)
+                )
+            yield "]" if separator == "," else "[]"
+
+        response = Response(generate(), mimetype="application/json")
+        response.headers["X-Total-Count"] = str(first.total)
+        return response
+
+    @staticmethod
+    def _stream_limit(remaining: int | None, page_size: int | None) -> int | None:
+        """
+        Размер очередной страницы потокового ответа
+
+        :param remaining: Сколько задач осталось отправить или None без ограничения
+        :param page_size: Размер страницы или None, если результат выбирается целиком
+        :return: Размер страницы или None
+        """
+        if page_size is None:
+            return remaining
+        return page_size if remaining is None else min(page_size, remaining)
+
+    @staticmethod
+    def _page_query(
+            query: TaskQuery, limit: int | None, offset: int | None = None, after: list | None = None
+    ) -> TaskQuery:
+        """
+        Создает копию запроса с другой страницей результата
+
+        :param query: Исходный запрос
+        :param limit: Размер страницы
+        :param offset: Смещение. По умолчанию как в исходном запросе
+        :param after: Курсор. По умолчанию как в исходном запросе
+        :return: Новый запрос
+        """
+        return TaskQuery(
+            filters=query.filters, due_from=query.due_from, due_to=query.due_to, search=query.search,
+            sort=query.sort, limit=limit, offset=query.offset if offset is None else offset,
+            after=query.after if after is None else after
+        )
+
+    @staticmethod
+    def _encode_cursor(query: TaskQuery, task: Task) -> str:
+        """
+        Кодирует положение задачи в порядке запроса в курсор для параметра cursor
+
+        Курсор содержит сортировку запроса, чтобы его нельзя было применить к запросу с другой сортировкой.
+
+        :param query: Описание запроса
+        :param task: Последняя задача страницы
+        :return: Курсор в виде строки base64
+        """
+        data = {"sort": [list(item) for item in query.sort], "after": query.cursor(task)}
+        return base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort: list[tuple[str, str]]) -> list:
+        """
+        Декодирует курсор из параметра cursor
+
+        :param cursor: Курсор в виде строки base64
+        :param sort: Сортировка текущего запроса
+        :return: Значения ключа сортировки и ID задачи (см. `TaskQuery.after`)
+        :raises ValueError: Если курсор поврежден или получен для другой сортировки
+        """
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            cursor_sort, after = data["sort"], data["after"]
+        except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+            raise ValueError("Недопустимый курсор")
+        if cursor_sort != [list(item) for item in sort] or not isinstance(after, list):
+            raise ValueError("Курсор не соответствует сортировке запроса")
+        return after
+
+    def _fields_from_request(self) -> list[str] | None:
+        """
+        Разбирает параметр fields со списком полей задач в ответе
 
-        return jsonify([self.task_to_dict(task) for task in tasks])
+        :return: Список полей или None, если нужны все поля
+        :raises ValueError: Если поле неизвестно
+        """
+        if not request.args.get("fields"):
+            return None
+        fields = list(dict.fromkeys(field.strip() for field in request.args["fields"].split(",")))
+        for field in fields:
+            if field not in QUERY_FIELDS:
+                raise ValueError(f"Неизвестное поле: {field}")
+        return fields
+
+    def _query_from_request(self) -> TaskQuery:
+        """
+        Составляет запрос к задачам из параметров HTTP-запроса
+
+        :return: Описание запроса
+        :raises ValueError: Если значение какого-либо параметра недопустимо
+        """
+        args = request.args
+        filters = {}
+        for field in ("status", "category", "priority"):
+            if args.get(field):
+                values = args[field].split(",")
+                filters[field] = values if len(values) > 1 else values[0]
+
+        sort = []
+        if args.get("sort_by"):
+            sort.append((args["sort_by"], args.get("order", "asc")))
+
+        due_from = date.fromisoformat(args["due_from"]) if args.get("due_from") else None
+        due_to = date.fromisoformat(args["due_to"]) if args.get("due_to") else None
+        limit = int(args["limit"]) if args.get("limit") else None
+        offset = int(args.get("offset") or 0)
+        after = self._decode_cursor(args["cursor"], sort) if args.get("cursor") else None
+
+        return TaskQuery(
+            filters=filters, due_from=due_from, due_to=due_to, search=args.get("q") or None,
+            sort=sort, limit=limit, offset=offset, after=after
+        )
 
     def add_task(self) -> jsonify:
         """
@@ -68,15 +314,7 @@ class TaskAPI:
         """
         data = request.json
         try:
-            new_task = Task(
-                title=data["title"],
-                description=data["description"],
-                due_date=datetime.fromisoformat(data["due_date"]),
-                priority=data["priority"],
-                category=data["category"],
-                status=data.get("status", "В работе")
-            )
-            self.task_manager.add_task(new_task)
+            self.task_manager.add_task(self._task_from_data(data))
             return jsonify({"status": "success", "message": "Задача добавлена"}), 201
         except Exception as e:
             return jsonify({"status": "error", "message": str(e)}), 400
@@ -90,15 +328,7 @@ class TaskAPI:
         """
         data = request.json
         try:
-            updated_task = Task(
-                title=data["title"],
-                description=data["description"],
-                due_date=datetime.fromisoformat(data["due_date"]),
-                priority=data["priority"],
-                category=data["category"],
-                status=data["status"]
-            )
-            self.task_manager.edit_task(task_id, updated_task)
+            self.task_manager.edit_task(task_id, self._task_from_data(data))
             return jsonify({"status": "success", "message": "Задача обновлена"})
         except IndexError:
             return jsonify({"status": "error", "message": "Задача не найдена"}), 404
@@ -118,14 +348,192 @@ class TaskAPI:
         except IndexError:
             return jsonify({"status": "error", "message": "Задача не найдена"}), 404
 
+    def patch_task(self, task_id: int) -> jsonify:
+        """
+        Изменяет отдельные поля задачи по ID
+
+        Поля, которых нет в теле запроса, остаются прежними.
+
+        :param task_id: ID задачи для изменения
+        :return: JSON-ответ с результатом операции и обновленной задачей
+        """
+        data = request.json
+        if not isinstance(data, dict):
+            return jsonify({"status": "error", "message": "Ожидается JSON-объект с полями задачи"}), 400
+        try:
+            self._check_fields(data)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        # Задача читается и изменяется под одной блокировкой, чтобы не потерять параллельные изменения
+        with self.task_manager.transaction():
+            try:
+                updated_task = self._task_from_data(data, self.task_manager.get_task(task_id))
+            except IndexError:
+                return jsonify({"status": "error", "message": "Задача не найдена"}), 404
+            except ValueError as e:
+                return jsonify({"status": "error", "message": str(e)}), 400
+            self.task_manager.edit_task(task_id, updated_task)
+        return jsonify({"status": "success", "message": "Задача обновлена", "task": self.task_to_dict(updated_task)})
+
+    def batch_tasks(self) -> jsonify:
+        """
+        Добавляет и изменяет несколько задач одним запросом
+
+        Тело запроса — JSON-массив задач (или объект с ключом "tasks"). Элемент без "id" добавляется
+        как новая задача, элемент с "id" изменяет указанные поля существующей задачи. Пакет применяется
+        атомарно и сохраняется одной записью: если хотя бы один элемент недопустим, ни одна задача
+        не изменяется. Результат содержит итог по каждому элементу в порядке запроса.
+
+        :return: JSON-ответ с результатами по элементам
+        """
+        items = self._batch_from_request("tasks")
+        if isinstance(items, str):
+            return jsonify({"status": "error", "message": items}), 400
+
+        results = []
+        new_tasks = []
+        updates: dict[int, Task] = {}
+        with self.task_manager.transaction():
+            for index, data in enumerate(items):
+                try:
+                    if not isinstance(data, dict):
+                        raise ValueError("Ожидается JSON-объект с полями задачи")
+                    self._check_fields(data, allowed=("id",))
+                    task_id = data.get("id")
+                    if task_id is None:
+                        new_tasks.append(self._task_from_data(data))
+                        results.append({"index": index, "status": "success", "op": "created", "id": None})
+                        continue
+                    if isinstance(task_id, bool) or not isinstance(task_id, int):
+                        raise ValueError("Недопустимый ID задачи")
+                    base = updates.get(task_id) or self.task_manager.get_task(task_id)
+                    updates[task_id] = self._task_from_data(data, base)
+                    results.append({"index": index, "status": "success", "op": "updated", "id": task_id})
+                except IndexError:
+                    results.append({"index": index, "status": "error", "message": "Задача не найдена"})
+                except ValueError as e:
+                    results.append({"index": index, "status": "error", "message": str(e)})
+
+            if any(result["status"] == "error" for result in results):
+                return jsonify({
+                    "status": "error", "message": "Пакет не применен: есть недопустимые элементы", "results": results
+                }), 400
+
+            self.task_manager.update_tasks(updates)
+            new_ids = iter(self.task_manager.add_tasks(new_tasks))
+
+        for result in results:
+            if result["op"] == "created":
+                result["id"] = next(new_ids)
+        return jsonify({"status": "success", "results": results})
+
+    def batch_delete_tasks(self) -> jsonify:
+        """
+        Удаляет несколько задач одним запросом
+
+        Тело запроса — JSON-массив ID (или объект с ключом "ids"). Удаление атомарно и сохраняется
+        одной записью: если какой-либо задачи нет, ни одна задача не удаляется.
+
+        :return: JSON-ответ с результатами по элементам
+        """
+        items = self._batch_from_request("ids")
+        if isinstance(items, str):
+            return jsonify({"status": "error", "message": items}), 400
+
+        with self.task_manager.transaction():
+            results = []
+            for index, task_id in enumerate(items):
+                if isinstance(task_id, bool) or not isinstance(task_id, int):
+                    results.append({"index": index, "status": "error", "message": "Недопустимый ID задачи"})
+                    continue
+                try:
+                    self.task_manager.get_task(task_id)
+                    results.append({"index": index, "status": "success", "id": task_id})
+                except IndexError:
+                    results.append({"index": index, "status": "error", "id": task_id, "message": "Задача не найдена"})
+
+            if any(result["status"] == "error" for result in results):
+                return jsonify({
+                    "status": "error", "message": "Пакет не применен: есть недопустимые элементы", "results": results
+                }), 400
+
+            self.task_manager.delete_tasks(list(dict.fromkeys(items)))
+        return jsonify({"status": "success", "results": results})
+
+    @staticmethod
+    def _batch_from_request(key: str) -> list | str:
+        """
+        Извлекает элементы пакетного запроса из тела запроса
+
+        :param key: Ключ списка, если тело запроса — объект
+        :return: Список элементов или сообщение об ошибке
+        """
+        data = request.json
+        if isinstance(data, dict):
+            data = data.get(key)
+        if not isinstance(data, list):
+            return f"Ожидается JSON-массив или объект с ключом \"{key}\""
+        if len(data) > MAX_BATCH_SIZE:
+            return f"Пакет не может содержать больше {MAX_BATCH_SIZE} элементов"
+        return data
+
+    @staticmethod
+    def _check_fields(data: dict[str, Any], allowed: tuple[str, ...] = ()) -> None:
+        """
+        Проверяет, что JSON-объект содержит только изменяемые поля задачи
+
+        :param data: Поля задачи
+        :param allowed: Дополнительно допустимые поля
+        :raises ValueError: Если объект содержит другие поля
+        """
+        unknown = [field for field in data if field not in EDITABLE_FIELDS and field not in allowed]
+        if unknown:
+            raise ValueError(f"Неизменяемые поля: {', '.join(unknown)}")
+
+    @staticmethod
+    def _task_from_data(data: dict[str, Any], base: Task | None = None) -> Task:
+        """
+        Создает задачу из полей JSON-объекта
+
+        :param data: Поля задачи
+        :param base: Задача, из которой берутся недостающие поля. Если не передана, обязательны все поля,
+            кроме статуса (по умолчанию "В работе")
+        :return: Новый объект задачи
+        :raises ValueError: Если поле отсутствует или его значение недопустимо (см. `validate_task`)
+        """
+        values = {}
+        for field in EDITABLE_FIELDS:
+            if field in data:
+                values[field] = data[field]
+            elif base is not None:
+                values[field] = getattr(base, field)
+            elif field == "status":
+                values[field] = "В работе"
+            else:
+                raise ValueError(f"Не указано поле: {field}")
+
+        for field in ("title", "description", "priority", "category", "status"):
+            if not isinstance(values[field], str):
+                raise ValueError(f"Поле {field} должно быть строкой")
+        if isinstance(values["due_date"], str):
+            try:
+                values["due_date"] = datetime.fromisoformat(values["due_date"]).date()
+            except ValueError:
+                raise ValueError(f"Недопустимая дата: {values['due_date']}")
+        elif not isinstance(values["due_date"], date):
+            raise ValueError("Поле due_date должно быть датой в формате ISO")
+        return validate_task(Task(**values))
+
     def get_completed_tasks(self) -> jsonify:
         """
         Возвращает список завершенных задач
 
         :return: JSON-ответ с завершенными задачами
         """
-        completed_tasks = [task for task in self.task_manager.get_tasks() if task.status == "Завершено"]
-        return jsonify([self.task_to_dict(task) for task in completed_tasks])
+        return self._conditional(lambda: jsonify(self._cached("completed", lambda: [
+            self.task_to_dict(task) for task in self.task_manager.get_tasks_by_status("Завершено")
+        ])))
 
     def get_overdue_tasks(self) -> jsonify:
         """
@@ -133,8 +541,64 @@ class TaskAPI:
 
         :return: JSON-ответ с просроченными задачами
         """
-        overdue_tasks = self.task_manager.get_overdue_tasks()
-        return jsonify([self.task_to_dict(task) for task in overdue_tasks])
+        return self._conditional(lambda: jsonify(self._cached("overdue", lambda: [
+            self.task_to_dict(task) for task in self.task_manager.get_overdue_tasks()
+        ], date_sensitive=True)), date_sensitive=True)
+
+    def search_tasks(self) -> jsonify:
+        """
+        Ищет задачи по словам запроса
+
+        Параметры запроса: q — строка поиска, limit — максимальное количество результатов
+
+        :return: JSON-ответ с найденными задачами в порядке релевантности
+        """
+        query = request.args.get("q", default="")
+        if not query.strip():
+            return jsonify({"status": "error", "message": "Пустой поисковый запрос"}), 400
+        limit = request.args.get("limit") or None
+        if limit is not None:
+            if not limit.isdecimal():
+                return jsonify({"status": "error", "message": "Недопустимое значение limit"}), 400
+            limit = int(limit)
+
+        return self._conditional(lambda: jsonify(self._cached("search", lambda: [
+            self.task_to_dict(task) for task in self.task_manager.search_tasks(query, limit=limit)
+        ])))
+
+    def get_time_series(self) -> jsonify:
+        """
+        Возвращает временные ряды по задачам
+
+        Параметры запроса: freq — размер интервала ("day", "week", "month"); start и end — границы
+        периода в формате ISO (по умолчанию последние 30 интервалов); window — размер скользящего
+        окна для доли завершенных задач; category — учитывать только задачи категории.
+
+        :return: JSON-ответ с рядами (см. `TaskTimeSeries.series`)
+        """
+        args = request.args
+        freq = args.get("freq", "day")
+        try:
+            start_date, end_date = default_period(freq)
+            if args.get("end"):
+                end_date = date.fromisoformat(args["end"])
+                start_date = default_period(freq, end_date=end_date)[0]
+            if args.get("start"):
+                start_date = date.fromisoformat(args["start"])
+            window = int(args.get("window", 7))
+
+            def respond() -> Response:
+                series = self._cached("timeseries", lambda: self.task_manager.time_series().series(
+                    start_date, end_date, freq=freq, window=window, category=args.get("category")
+                ), date_sensitive=True)
+                return jsonify({
+                    "freq": freq, "start": start_date.isoformat(), "end": end_date.isoformat(), "window": window,
+                    **series
+                })
+
+            return self._conditional(respond, date_sensitive=True)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
 
     def visualize_tasks(self) -> jsonify:
         """
@@ -143,40 +607,43 @@ class TaskAPI:
         :return: JSON-ответ с данными для визуализации
         """
         criteria = request.args.get("criteria", "category")
-        tasks = self.task_manager.get_tasks()
-
-        data = {}
-        if criteria == "category":
-            all_values = Task.ALL_CATEGORIES
-        elif criteria == "priority":
-            all_values = Task.ALL_PRIORITIES
-        elif criteria == "status":
-            all_values = Task.ALL_STATUSES
-        else:
+        if criteria not in ("category", "priority", "status"):
             return jsonify({"status": "error", "message": "Недопустимый критерий"}), 400
 
-        for value in all_values:
-            data[value] = 0
+        return self._conditional(lambda: jsonify({
+            "criteria": criteria, "data": self._cached("visualize", lambda: self.task_manager.count_tasks_by(criteria))
+        }))
+
+    def get_stats(self) -> jsonify:
+        """
+        Возвращает сводную статистику по задачам
 
-        for task in tasks:
-            key = None
-            if criteria == "category":
-                key = task.category
-            elif criteria == "priority":
-                key = task.priority
-            elif criteria == "status":
-                key = task.status
+        :return: JSON-ответ со статистикой (см. `TaskManager.get_stats`)
+        """
+        return self._conditional(
+            lambda: jsonify(self._cached("stats", self.task_manager.get_stats, date_sensitive=True)),
+            date_sensitive=True
+        )
 
-            if key in data:
-                data[key] += 1
+    def get_cache_stats(self) -> jsonify:
+        """
+        Возвращает статистику кэша результатов для мониторинга
 
-        return jsonify({"criteria": criteria, "data": data})
+        :return: JSON-ответ со статистикой (см. `ResultCache.stats`)
+        """
+        return jsonify(self.cache.stats())
 
 
 # Создание экземпляра API
 task_api = TaskAPI()
 
 
+# Задачи, измененные другими процессами, перечитываются перед обработкой запроса
+@app.before_request
+def refresh_tasks():
+    task_api.task_manager.refresh()
+
+
 # Настройка маршрутов
 @app.route("/tasks", methods=["GET"])
 def get_tasks():
@@ -193,6 +660,21 @@ def edit_task(task_id):
     return task_api.edit_task(task_id)
 
 
+@app.route("/tasks/<int:task_id>", methods=["PATCH"])
+def patch_task(task_id):
+    return task_api.patch_task(task_id)
+
+
+@app.route("/tasks/batch", methods=["POST"])
+def batch_tasks():
+    return task_api.batch_tasks()
+
+
+@app.route("/tasks/batch-delete", methods=["POST"])
+def batch_delete_tasks():
+    return task_api.batch_delete_tasks()
+
+
 @app.route("/tasks/<int:task_id>", methods=["DELETE"])
 def delete_task(task_id):
     return task_api.delete_task(task_id)
@@ -208,6 +690,26 @@ def get_overdue_tasks():
     return task_api.get_overdue_tasks()
 
 
+@app.route("/tasks/search", methods=["GET"])
+def search_tasks():
+    return task_api.search_tasks()
+
+
+@app.route("/tasks/stats", methods=["GET"])
+def get_stats():
+    return task_api.get_stats()
+
+
+@app.route("/tasks/timeseries", methods=["GET"])
+def get_time_series():
+    return task_api.get_time_series()
+
+
+@app.route("/cache/stats", methods=["GET"])
+def get_cache_stats():
+    return task_api.get_cache_stats()
+
+
 @app.route("/tasks/visualize", methods=["GET"])
 def visualize_tasks():
     return task_api.visualize_tasks()
@@ -2,44 +2,66 @@
 
 import schedule
 import time
-from datetime import datetime
+from datetime import date, timedelta
 
 from .task_manager import TaskManager
 from .email_notifier import EmailNotifier
 
+# Менеджер задач планировщика: создается один раз и дальше поддерживается в актуальном состоянии
+# самим менеджером, а не перечитывается из хранилища при каждой проверке
+_task_manager: TaskManager | None = None
 
-def check_deadlines() -> None:
+
+def _get_task_manager() -> TaskManager:
+    """
+    Возвращает долгоживущий менеджер задач планировщика, создавая его при первом обращении
+    """
+    global _task_manager
+    if _task_manager is None:
+        _task_manager = TaskManager()
+    return _task_manager
+
+
+def check_deadlines(task_manager: TaskManager | None = None) -> None:
     """
     Проверяет задачи на наличие просроченных дедлайнов и отправляет уведомления
     Если задача просрочена и не завершена, отправляет уведомление на почту
+
+    :param task_manager: Менеджер задач. По умолчанию долгоживущий менеджер планировщика
     """
-    task_manager = TaskManager()
+    if task_manager is None:
+        task_manager = _get_task_manager()
     email_notifier = EmailNotifier()
 
-    tasks = task_manager.get_tasks()
-    now = datetime.now()
+    # Изменения, сделанные другими процессами (например, GUI или API), подхватываются без полной перезагрузки
+    task_manager.refresh()
+
+    # Незавершенные задачи со сроком не позже сегодняшнего дня
+    tasks = task_manager.get_overdue_tasks(until=date.today() + timedelta(days=1))
 
     for task in tasks:
-        if task.due_date <= now and task.status != "Завершено":
-            subject = f"Напоминание: Срок выполнения задачи '{task.title}'"
-            message = (
-                f"Заголовок: {task.title}\n"
-                f"Описание: {task.description}\n"
-                f"Срок выполнения: {task.due_date}\n"
-                f"Категория: {task.category}\n"
-                f"Приоритет: {task.priority}\n\n"
-                "Пожалуйста, завершите задачу!"
-            )
-            email_notifier.send_email("pamagite@yandex.ru", subject, message)
-
-
-def start_background_scheduler() -> None:
+        subject = f"Напоминание: Срок выполнения задачи '{task.title}'"
+        message = (
+            f"Заголовок: {task.title}\n"
+            f"Описание: {task.description}\n"
+            f"Срок выполнения: {task.due_date}\n"
+            f"Категория: {task.category}\n"
+            f"Приоритет: {task.priority}\n\n"
+            "Пожалуйста, завершите задачу!"
+        )
+        email_notifier.send_email("pamagite@yandex.ru", subject, message)
+
+
+def start_background_scheduler(task_manager: TaskManager | None = None) -> None:
     """
     Запускает фоновый планировщик для проверки дедлайнов
     Планировщик проверяет задачи каждую минуту
+
+    :param task_manager: Менеджер задач приложения. Если передан, планировщик видит изменения сразу
+        и не загружает задачи повторно. По умолчанию долгоживущий менеджер планировщика
     """
     # Проверка дедлайнов каждую минуту
-    schedule.every(1).minutes.do(check_deadlines)
+    schedule.every(1).minutes.do(check_deadlines, task_manager)
 
     # Запуск планировщика в бесконечном цикле
     while True:
@@ -0,0 +1,160 @@
+"""Модуль для резервного копирования хранилища задач"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+# Уровень сжатия копий: копия создается при каждом сохранении, поэтому важнее скорость, чем размер.
+# Уровень 1 примерно в 10 раз быстрее уровня 9, а копии JSON получаются больше лишь на 10-20%
+COMPRESS_LEVEL = 1
+
+
+class BackupManager:
+    """
+    Класс для хранения резервных копий с дедупликацией по содержимому
+
+    Каждая копия сжимается gzip (с быстрым уровнем `COMPRESS_LEVEL`) и сохраняется в `objects/<sha256>.json.gz`,
+    поэтому одинаковые снимки хранятся один раз. Журнал копий (время и хеш) ведется в файле `index.json`.
+    Подряд идущие одинаковые снимки не записываются вовсе.
+
+    Политика хранения: всегда сохраняются последние `keep_last` копий, из более старых остается
+    по одной (самой поздней) копии на каждый час за последние `keep_hourly` часов и на каждый день
+    за последние `keep_daily` дней. Остальные копии удаляются вместе с неиспользуемыми объектами.
+    """
+
+    def __init__(
+            self, backup_dir: str = "data/backup", keep_last: int = 20, keep_hourly: int = 24, keep_daily: int = 30
+    ) -> None:
+        """
+        Инициализация менеджера резервных копий
+
+        :param backup_dir: Директория для резервных копий. По умолчанию "data/backup"
+        :param keep_last: Сколько последних копий хранить всегда. По умолчанию 20
+        :param keep_hourly: За сколько последних часов хранить по одной копии в час. По умолчанию 24
+        :param keep_daily: За сколько последних дней хранить по одной копии в день. По умолчанию 30
+        """
+        self.backup_dir = backup_dir
+        self.objects_dir = os.path.join(backup_dir, "objects")
+        self.index_path = os.path.join(backup_dir, "index.json")
+        self.keep_last = keep_last
+        self.keep_hourly = keep_hourly
+        self.keep_daily = keep_daily
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def backup(self, data: bytes) -> str | None:
+        """
+        Сохраняет резервную копию данных
+
+        :param data: Содержимое снимка
+        :return: Хеш сохраненной копии или None, если снимок совпадает с последней копией
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        entries = self.list_backups()
+        if entries and entries[-1]["hash"] == digest:
+            return None
+
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            self._write_atomic(object_path, gzip.compress(data, compresslevel=COMPRESS_LEVEL))
+
+        entries.append({"timestamp": datetime.now().isoformat(), "hash": digest})
+        self._save_index(self._apply_retention(entries))
+        return digest
+
+    def list_backups(self) -> list[dict[str, str]]:
+        """
+        Возвращает список резервных копий от старых к новым
+
+        :return: Список словарей с ключами "timestamp" и "hash"
+        """
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, "r") as file:
+            return json.load(file)
+
+    def restore(self, point: datetime | None = None) -> bytes:
+        """
+        Возвращает содержимое резервной копии на указанный момент времени
+
+        :param point: Момент времени. Берется последняя копия, сделанная не позже него.
+            По умолчанию последняя копия
+        :return: Содержимое снимка
+        :raises LookupError: Если подходящей копии нет
+        """
+        candidates = self.list_backups()
+        if point is not None:
+            candidates = [entry for entry in candidates if datetime.fromisoformat(entry["timestamp"]) <= point]
+        if not candidates:
+            raise LookupError("Резервная копия не найдена")
+
+        with open(self._object_path(candidates[-1]["hash"]), "rb") as file:
+            return gzip.decompress(file.read())
+
+    def _apply_retention(self, entries: list[dict[str, str]]) -> list[dict[str, str]]:
+        """
+        Применяет политику хранения и удаляет объекты, на которые больше нет ссылок
+
+        :param entries: Список копий от старых к новым
+        :return: Оставшиеся копии от старых к новым
+        """
+        now = datetime.now()
+        hourly_since = now - timedelta(hours=self.keep_hourly)
+        daily_since = now - timedelta(days=self.keep_daily)
+        seen_hours = set()
+        seen_days = set()
+
+        kept = []
+        for position, entry in enumerate(reversed(entries)):
+            timestamp = datetime.fromisoformat(entry["timestamp"])
+            hour = timestamp.strftime("%Y%m%d%H")
+            day = timestamp.strftime("%Y%m%d")
+
+            keep = position < self.keep_last
+            if not keep and timestamp >= hourly_since and hour not in seen_hours:
+                keep = True
+            if not keep and timestamp >= daily_since and day not in seen_days:
+                keep = True
+
+            if keep:
+                kept.append(entry)
+                seen_hours.add(hour)
+                seen_days.add(day)
+        kept.reverse()
+
+        referenced = {entry["hash"] for entry in kept}
+        for digest in {entry["hash"] for entry in entries} - referenced:
+            if os.path.exists(self._object_path(digest)):
+                os.remove(self._object_path(digest))
+        return kept
+
+    def _save_index(self, entries: list[dict[str, str]]) -> None:
+        """
+        Сохраняет журнал копий
+
+        :param entries: Список копий от старых к новым
+        """
+        self._write_atomic(self.index_path, json.dumps(entries, indent=4).encode())
+
+    def _object_path(self, digest: str) -> str:
+        """
+        Возвращает путь к объекту копии по хешу
+
+        :param digest: Хеш содержимого
+        :return: Путь к файлу объекта
+        """
+        return os.path.join(self.objects_dir, f"{digest}.json.gz")
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        """
+        Записывает файл через временный файл и переименование
+
+        :param path: Путь к файлу
+        :param data: Содержимое файла
+        """
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
@@ -0,0 +1,133 @@
+"""Модуль для кэширования результатов запросов к задачам"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from datetime import date
+from typing import Any
+
+
+class ResultCache:
+    """
+    LRU-кэш результатов запросов с привязкой к версии данных
+
+    Результат хранится вместе с версией данных (`TaskManager.version`), при которой он вычислен.
+    Как только версия меняется, все результаты прежних версий удаляются. Результаты, зависящие от текущей
+    даты (например, просроченные задачи), дополнительно привязываются к дню и удаляются при смене даты.
+    Размер кэша ограничен количеством записей и суммарным количеством элементов в результатах.
+    """
+
+    def __init__(self, max_entries: int = 256, max_items: int = 1_000_000) -> None:
+        """
+        Инициализация кэша
+
+        :param max_entries: Максимальное количество результатов. По умолчанию 256
+        :param max_items: Максимальное суммарное количество элементов (например, задач) во всех результатах.
+            По умолчанию 1 000 000
+        """
+        self.max_entries = max_entries
+        self.max_items = max_items
+        self._entries: OrderedDict[Hashable, tuple[Any, int, date | None]] = OrderedDict()
+        self._items = 0
+        self._version: int | None = None
+        self._day: date | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_compute(
+            self, key: Hashable, version: int, compute: Callable[[], Any], date_sensitive: bool = False,
+            size: Callable[[Any], int] | None = None
+    ) -> Any:
+        """
+        Возвращает результат из кэша или вычисляет и сохраняет его
+
+        :param key: Ключ запроса (например, имя запроса и его параметры)
+        :param version: Текущая версия данных
+        :param compute: Функция вычисления результата
+        :param date_sensitive: Результат зависит от текущей даты. По умолчанию нет
+        :param size: Функция подсчета элементов в результате. По умолчанию `len` для коллекций и 1 для остальных
+        :return: Результат запроса
+        """
+        today = date.today()
+        with self._lock:
+            self._invalidate(version, today)
+            entry = self._entries.get(key)
+            if entry is not None and self._version == version and (not date_sensitive or entry[2] == today):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = compute()
+        if size is not None:
+            items = size(value)
+        else:
+            items = len(value) if isinstance(value, (list, tuple)) else 1
+        if items > self.max_items:
+            return value
+
+        with self._lock:
+            # Пока результат вычислялся, данные могли измениться: такой результат не сохраняется
+            if self._version != version or key in self._entries:
+                return value
+            self._entries[key] = (value, items, today if date_sensitive else None)
+            self._items += items
+            while len(self._entries) > self.max_entries or self._items > self.max_items:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._items -= evicted_size
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """
+        Удаляет все результаты
+        """
+        with self._lock:
+            self._entries.clear()
+            self._items = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Возвращает статистику работы кэша
+
+        :return: Словарь с количеством попаданий, промахов, вытеснений и сбросов, долей попаданий,
+            текущим количеством записей и элементов
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "items": self._items,
+                "version": self._version,
+            }
+
+    def _invalidate(self, version: int, today: date) -> None:
+        """
+        Удаляет устаревшие результаты. Вызывается под блокировкой
+
+        Версия, меньшая уже известной, означает запрос, начатый до изменения данных: кэш при этом
+        не сбрасывается, а результат такого запроса не сохраняется.
+
+        :param version: Текущая версия данных
+        :param today: Текущая дата
+        """
+        if self._version is None or version > self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._items = 0
+            self._version = version
+            self._day = today
+        elif self._day != today:
+            stale = [key for key, (_, _, day) in self._entries.items() if day is not None and day != today]
+            for key in stale:
+                self._items -= self._entries.pop(key)[1]
+            self._day = today
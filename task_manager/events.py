@@ -0,0 +1,98 @@
+"""Модуль для публикации событий об изменении задач"""
+
+import threading
+from collections.abc import Callable, Iterable
+
+from .task import Task
+
+# Виды событий
+TASK_ADDED = "added"
+TASK_UPDATED = "updated"
+TASK_DELETED = "deleted"
+EVENT_KINDS = (TASK_ADDED, TASK_UPDATED, TASK_DELETED)
+
+
+class TaskEvent:
+    """Событие об изменении задачи"""
+
+    __slots__ = ("kind", "task_id", "old", "new", "version")
+
+    def __init__(self, kind: str, task_id: int, old: Task | None, new: Task | None, version: int) -> None:
+        """
+        Инициализация события
+
+        :param kind: Вид события: "added", "updated" или "deleted"
+        :param task_id: ID задачи
+        :param old: Задача до изменения (None для "added")
+        :param new: Задача после изменения (None для "deleted")
+        :param version: Версия данных менеджера после изменения
+        """
+        self.kind = kind
+        self.task_id = task_id
+        self.old = old
+        self.new = new
+        self.version = version
+
+    def __repr__(self) -> str:
+        return f"TaskEvent({self.kind!r}, task_id={self.task_id}, version={self.version})"
+
+
+class EventBus:
+    """
+    Класс для доставки событий подписчикам
+
+    События доставляются пачками: все изменения одной операции или транзакции приходят подписчику
+    одним списком. Обработчики вызываются синхронно в потоке, который изменил задачи, поэтому
+    должны работать быстро. Ошибка в обработчике не прерывает доставку остальным подписчикам.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация без подписчиков"""
+        self._subscribers: list[tuple[Callable[[list[TaskEvent]], None], frozenset[str] | None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(
+            self, callback: Callable[[list[TaskEvent]], None], kinds: Iterable[str] | None = None
+    ) -> Callable[[list[TaskEvent]], None]:
+        """
+        Подписывает обработчик на события
+
+        :param callback: Обработчик, получающий список событий
+        :param kinds: Виды событий, которые нужно получать. По умолчанию все
+        :return: Тот же обработчик (для последующей отписки)
+        :raises ValueError: Если вид события неизвестен
+        """
+        if kinds is not None:
+            kinds = frozenset(kinds)
+            unknown = kinds.difference(EVENT_KINDS)
+            if unknown:
+                raise ValueError(f"Неизвестный вид события: {', '.join(sorted(unknown))}")
+        with self._lock:
+            self._subscribers.append((callback, kinds))
+        return callback
+
+    def unsubscribe(self, callback: Callable[[list[TaskEvent]], None]) -> None:
+        """
+        Отписывает обработчик от всех событий
+
+        :param callback: Обработчик, переданный в `subscribe`
+        """
+        with self._lock:
+            self._subscribers = [item for item in self._subscribers if item[0] is not callback]
+
+    def publish(self, events: list[TaskEvent]) -> None:
+        """
+        Доставляет события подписчикам
+
+        :param events: События в порядке изменений
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, kinds in subscribers:
+            selected = events if kinds is None else [event for event in events if event.kind in kinds]
+            if not selected:
+                continue
+            try:
+                callback(selected)
+            except Exception as e:
+                print(f"Ошибка в обработчике событий задач: {e}")
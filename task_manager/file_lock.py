@@ -0,0 +1,116 @@
+"""Модуль для межпроцессной блокировки файлов хранилища"""
+
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Рекомендательная (advisory) блокировка файла для нескольких процессов
+
+    Блокировка ставится на отдельный файл рядом с данными (`fcntl.flock` в Unix, `msvcrt.locking` в Windows),
+    поэтому соблюдается только процессами, которые тоже ее берут. Внутри процесса блокировка реентерабельна
+    и дополнительно защищена обычной блокировкой потоков, так как `flock` не различает потоки одного процесса.
+
+    Используется как контекстный менеджер: `with storage.lock: ...`
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.05) -> None:
+        """
+        Инициализация блокировки. Файл блокировки создается при первом захвате
+
+        :param path: Путь к файлу блокировки
+        :param poll_interval: Интервал повторных попыток захвата в Windows в секундах. По умолчанию 0.05
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+        self._thread_lock = threading.RLock()
+        self._file = None
+        self._depth = 0
+
+    @property
+    def depth(self) -> int:
+        """
+        Глубина вложенных захватов в текущем процессе
+
+        :return: 0, если блокировка не захвачена
+        """
+        return self._depth
+
+    def acquire(self) -> None:
+        """
+        Захватывает блокировку, ожидая ее освобождения другими процессами
+        """
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._lock_file()
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self) -> None:
+        """
+        Освобождает блокировку
+
+        :raises RuntimeError: Если блокировка не захвачена
+        """
+        if self._depth == 0:
+            raise RuntimeError("Блокировка не захвачена")
+        self._depth -= 1
+        if self._depth == 0:
+            self._unlock_file()
+        self._thread_lock.release()
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def _lock_file(self) -> None:
+        """
+        Открывает файл блокировки и блокирует его для других процессов
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+                return
+            while True:
+                try:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                    return
+                except OSError:
+                    time.sleep(self.poll_interval)
+        except BaseException:
+            self._file.close()
+            self._file = None
+            raise
+
+    def _unlock_file(self) -> None:
+        """
+        Снимает блокировку и закрывает файл блокировки
+        """
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
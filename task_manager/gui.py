@@ -1,13 +1,21 @@
 """Клиентская часть"""
 
 import tkinter as tk
+from bisect import bisect_left
 from tkinter import ttk, messagebox, filedialog
 from tkcalendar import DateEntry
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+from .events import TASK_ADDED, TASK_DELETED, TASK_UPDATED, TaskEvent
+from .importers import ImportResult
+from .query import TaskQuery
 from .task_manager import TaskManager
 from .task import Task
+from .timeseries import default_period
+
+# Количество событий, начиная с которого список задач перестраивается целиком, а не построчно
+INCREMENTAL_UPDATE_LIMIT = 200
 
 
 class TaskManagerApp:
@@ -21,15 +29,31 @@ class TaskManagerApp:
         self.root.title("Менеджер задач")
         self.root.geometry("1000x800")
 
-        self.task_manager = TaskManager()
-        self.original_tasks = []  # Исходный список задач
+        self.task_manager = TaskManager(write_behind=True)
         self.sorted_tasks = []  # Отсортированный список задач
+        self.sorted_keys = []  # Ключи сортировки задач из sorted_tasks
+        self.sort_key = None  # Функция ключа текущей сортировки
+        self.events_suspended = False  # События не применяются к списку (например, во время импорта)
         self.sort_column = None  # Текущий столбец для сортировки
         self.sort_order = "default"  # Порядок сортировки: "asc", "desc", "default"
 
         self.create_widgets()
         self.update_task_list()
 
+        # Построчное обновление списка задач при их изменении
+        self.task_manager.events.subscribe(self.on_tasks_changed)
+
+        # Сохранение отложенных изменений при закрытии окна
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self) -> None:
+        """
+        Сохранение всех отложенных изменений и закрытие главного окна
+        :return: None
+        """
+        self.task_manager.close()
+        self.root.destroy()
+
     def create_widgets(self) -> None:
         """
         Создание и размещение виджетов на главном окне
@@ -119,12 +143,17 @@ class TaskManagerApp:
             filetypes=[("JSON files", "*.json")]
         )
         if file_path:
+            # Импорт может добавить много задач, поэтому список перестраивается один раз в конце
+            self.events_suspended = True
             try:
-                self.task_manager.storage.import_from_json(file_path)
-                self.update_task_list()
-                messagebox.showinfo("Успех", "Задачи успешно импортированы из JSON файла")
+                result = self.task_manager.import_from_json(file_path, on_progress=self._show_import_progress)
+                self._show_import_result(result, "JSON")
             except Exception as e:
                 messagebox.showerror("Ошибка", f"Не удалось импортировать задачи: {e}")
+            finally:
+                self.events_suspended = False
+                self.update_task_list()
+                self.root.title("Менеджер задач")
 
     def import_from_csv(self) -> None:
         """
@@ -136,12 +165,43 @@ class TaskManagerApp:
             filetypes=[("CSV files", "*.csv")]
         )
         if file_path:
+            # Импорт может добавить много задач, поэтому список перестраивается один раз в конце
+            self.events_suspended = True
             try:
-                self.task_manager.storage.import_from_csv(file_path)
-                self.update_task_list()
-                messagebox.showinfo("Успех", "Задачи успешно импортированы из CSV файла")
+                result = self.task_manager.import_from_csv(file_path, on_progress=self._show_import_progress)
+                self._show_import_result(result, "CSV")
             except Exception as e:
                 messagebox.showerror("Ошибка", f"Не удалось импортировать задачи: {e}")
+            finally:
+                self.events_suspended = False
+                self.update_task_list()
+                self.root.title("Менеджер задач")
+
+    def _show_import_progress(self, result: ImportResult) -> None:
+        """
+        Отображение хода импорта в заголовке окна
+        :param result: Текущие итоги импорта
+        :return: None
+        """
+        self.root.title(f"Менеджер задач — импорт: {result.imported} задач, ошибок: {result.error_count}")
+        self.root.update_idletasks()
+
+    def _show_import_result(self, result: ImportResult, file_type: str) -> None:
+        """
+        Отображение итогов импорта
+        :param result: Итоги импорта
+        :param file_type: Тип файла (JSON, CSV)
+        :return: None
+        """
+        if not result.error_count:
+            messagebox.showinfo("Успех", f"Задачи успешно импортированы из {file_type} файла")
+            return
+
+        errors = "\n".join(f"Запись {row_number}: {message}" for row_number, message in result.errors[:10])
+        messagebox.showwarning(
+            "Импорт завершен с ошибками",
+            f"Импортировано задач: {result.imported}\nПропущено записей: {result.error_count}\n\n{errors}"
+        )
 
     def reset_sorting(self) -> None:
         """
@@ -182,9 +242,9 @@ class TaskManagerApp:
             messagebox.showwarning("Предупреждение", "Выберите задачу для редактирования")
             return
 
-        # Получение индекса задачи в отсортированном списке
-        selected_index = self.task_tree.index(selected_item[0])
-        task = self.sorted_tasks[selected_index]
+        # Получение задачи по ID, который хранится в идентификаторе строки Treeview
+        task_id = int(selected_item[0])
+        task = self.task_manager.get_task(task_id)
 
         # Окно для редактирования задачи
         self.edit_task_window = tk.Toplevel(self.root)
@@ -223,13 +283,13 @@ class TaskManagerApp:
 
         # Кнопка сохранения изменений
         ttk.Button(
-            self.edit_task_window, text="Сохранить", command=lambda: self.save_edited_task(selected_index)
+            self.edit_task_window, text="Сохранить", command=lambda: self.save_edited_task(task_id)
         ).grid(row=6, column=0, columnspan=2, pady=10)
 
-    def save_edited_task(self, selected_index: int) -> None:
+    def save_edited_task(self, task_id: int) -> None:
         """
         Сохранение изменений в задаче
-        :param selected_index: Индекс задачи в отсортированном списке
+        :param task_id: ID задачи
         :return: None
         """
         # Получение данных из полей ввода
@@ -243,17 +303,12 @@ class TaskManagerApp:
         # Создание обновленной задачи
         updated_task = Task(title, description, due_date, priority, category, status)
 
-        # Получение задачи из отсортированного списка
-        task = self.sorted_tasks[selected_index]
-
-        # Нахождение индекса задачи в исходном списке
-        original_index = self.original_tasks.index(task)
-
-        # Сохранение изменений в исходном списке
-        self.task_manager.edit_task(original_index, updated_task)
-
-        # Обновление списка задач
-        self.update_task_list()
+        # Сохранение изменений (список задач обновится по событию)
+        try:
+            self.task_manager.edit_task(task_id, updated_task)
+        except ValueError as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить задачу: {e}")
+            return
 
         # Закрытие окна редактирования
         self.edit_task_window.destroy()
@@ -263,25 +318,14 @@ class TaskManagerApp:
         Обновление списка задач с учетом сортировки
         :return: None
         """
-        # Получаем исходный список задач
-        self.original_tasks = self.task_manager.get_tasks()
-
-        # Создаем копию списка для сортировки
-        self.sorted_tasks = self.original_tasks.copy()
-
-        # Сортировка задач (если требуется)
+        # Сортировка задач (если требуется) выполняется по поддерживаемому представлению столбца
+        sort = []
         if self.sort_column and self.sort_order != "default":
-            reverse = self.sort_order == "desc"
-            if self.sort_column == "Due Date":
-                self.sorted_tasks.sort(key=lambda x: x.due_date, reverse=reverse)
-            elif self.sort_column == "Priority":
-                self.sorted_tasks.sort(key=lambda x: Task.ALL_PRIORITIES.index(x.priority), reverse=reverse)
-            elif self.sort_column == "Status":
-                self.sorted_tasks.sort(key=lambda x: Task.ALL_STATUSES.index(x.status), reverse=reverse)
-            else:
-                self.sorted_tasks.sort(
-                    key=lambda x: getattr(x, self.sort_column.lower().replace(" ", "_")), reverse=reverse
-                )
+            sort = [(self.sort_column.lower().replace(" ", "_"), self.sort_order)]
+        query = TaskQuery(sort=sort)
+        self.sort_key = query.sort_key() or (lambda task: (task.id,))
+        self.sorted_tasks = list(self.task_manager.query(query))
+        self.sorted_keys = [self.sort_key(task) for task in self.sorted_tasks]
 
         # Очистка текущего списка задач
         for item in self.task_tree.get_children():
@@ -289,14 +333,65 @@ class TaskManagerApp:
 
         # Загрузка задач в Treeview
         for task in self.sorted_tasks:
-            self.task_tree.insert("", tk.END, values=(
-                task.title,
-                task.description,
-                task.due_date.strftime("%d-%m-%Y"),
-                task.priority,
-                task.category,
-                task.status
-            ))
+            self.task_tree.insert("", tk.END, iid=str(task.id), values=self._row_values(task))
+
+    def on_tasks_changed(self, events: list[TaskEvent]) -> None:
+        """
+        Построчное обновление списка задач по событиям менеджера задач
+        Строки добавляются, удаляются и перемещаются на место, соответствующее текущей сортировке.
+        При большом количестве событий список перестраивается целиком
+        :param events: События об изменении задач
+        :return: None
+        """
+        if self.events_suspended:
+            return
+        if len(events) >= INCREMENTAL_UPDATE_LIMIT:
+            self.update_task_list()
+            return
+
+        for event in events:
+            iid = str(event.task_id)
+            if event.kind != TASK_ADDED:
+                position = bisect_left(self.sorted_keys, self.sort_key(event.old))
+                if position == len(self.sorted_tasks) or self.sorted_tasks[position].id != event.task_id:
+                    # Строка не найдена на ожидаемом месте: список перестраивается целиком
+                    self.update_task_list()
+                    return
+                del self.sorted_tasks[position]
+                del self.sorted_keys[position]
+                if event.kind == TASK_DELETED:
+                    self.task_tree.delete(iid)
+                    continue
+
+            key = self.sort_key(event.new)
+            position = bisect_left(self.sorted_keys, key)
+            self.sorted_tasks.insert(position, event.new)
+            self.sorted_keys.insert(position, key)
+            if event.kind == TASK_UPDATED and self.task_tree.index(iid) == position:
+                self.task_tree.item(iid, values=self._row_values(event.new))
+                continue
+            selected = event.kind == TASK_UPDATED and iid in self.task_tree.selection()
+            if event.kind == TASK_UPDATED:
+                self.task_tree.delete(iid)
+            self.task_tree.insert("", position, iid=iid, values=self._row_values(event.new))
+            if selected:
+                self.task_tree.selection_add(iid)
+
+    @staticmethod
+    def _row_values(task: Task) -> tuple:
+        """
+        Значения столбцов строки задачи в Treeview
+        :param task: Задача
+        :return: Кортеж значений столбцов
+        """
+        return (
+            task.title,
+            task.description,
+            task.due_date.strftime("%d-%m-%Y"),
+            task.priority,
+            task.category,
+            task.status
+        )
 
     def open_add_task_dialog(self) -> None:
         """
@@ -352,10 +447,11 @@ class TaskManagerApp:
 
         # Создание новой задачи
         new_task = Task(title, description, due_date, priority, category, status)
-        self.task_manager.add_task(new_task)
-
-        # Обновление списка задач
-        self.update_task_list()
+        try:
+            self.task_manager.add_task(new_task)
+        except ValueError as e:
+            messagebox.showerror("Ошибка", f"Не удалось добавить задачу: {e}")
+            return
 
         # Закрытие окна добавления задачи
         self.add_task_window.destroy()
@@ -371,20 +467,17 @@ class TaskManagerApp:
             messagebox.showwarning("Предупреждение", "Выберите задачу для удаления")
             return
 
-        # Удаление задачи
-        task_id = self.task_tree.index(selected_item[0])
+        # Удаление задачи по ID (строка удалится из списка по событию)
+        task_id = int(selected_item[0])
         self.task_manager.delete_task(task_id)
 
-        # Обновление списка задач
-        self.update_task_list()
-
     def show_completed_report(self) -> None:
         """
         Отображение отчета по выполненным задачам
         :return: None
         """
         # Получение выполненных задач
-        completed_tasks = [task for task in self.task_manager.get_tasks() if task.status == "Завершено"]
+        completed_tasks = self.task_manager.get_tasks_by_status("Завершено")
 
         # Отображение отчета
         report_window = tk.Toplevel(self.root)
@@ -441,7 +534,7 @@ class TaskManagerApp:
         ttk.Label(visualize_window, text="Выберите критерий:").pack(padx=10, pady=5)
         criteria_var = tk.StringVar(value="Категория")  # По умолчанию выбрана категория
         criteria_combobox = ttk.Combobox(
-            visualize_window, textvariable=criteria_var, values=["Категория", "Приоритет", "Статус"]
+            visualize_window, textvariable=criteria_var, values=["Категория", "Приоритет", "Статус", "Динамика"]
         )
         criteria_combobox.pack(padx=10, pady=5)
 
@@ -453,39 +546,25 @@ class TaskManagerApp:
     def _draw_graph(self, criteria: str) -> None:
         """
         Построение графика по выбранному критерию
-        :param criteria: Критерий для визуализации (Категория, Приоритет, Статус)
+        :param criteria: Критерий для визуализации (Категория, Приоритет, Статус, Динамика)
         :return: None
         """
-        # Получение данных в зависимости от выбранного критерия
-        tasks = self.task_manager.get_tasks()
-        data = {}
+        if criteria == "Динамика":
+            self._draw_time_series()
+            return
 
-        # Определяем все возможные значения для выбранного критерия
+        # Определяем поле задачи для выбранного критерия
         if criteria == "Категория":
-            all_values = Task.ALL_CATEGORIES
+            field = "category"
         elif criteria == "Приоритет":
-            all_values = Task.ALL_PRIORITIES
+            field = "priority"
         elif criteria == "Статус":
-            all_values = Task.ALL_STATUSES
+            field = "status"
         else:
             raise Exception('Ошибка выбора отчета')
 
-        # Инициализация данных нулевыми значениями
-        for value in all_values:
-            data[value] = 0
-
-        # Подсчет задач для каждого значения
-        for task in tasks:
-            key = None
-            if criteria == "Категория":
-                key = task.category
-            elif criteria == "Приоритет":
-                key = task.priority
-            elif criteria == "Статус":
-                key = task.status
-
-            if key in data:
-                data[key] += 1
+        # Количество задач для каждого значения берется из счетчиков менеджера задач
+        data = self.task_manager.count_tasks_by(field)
 
         # Создание графика
         fig, ax = plt.subplots()
@@ -502,6 +581,35 @@ class TaskManagerApp:
         canvas.draw()
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+    def _draw_time_series(self) -> None:
+        """
+        Построение графика динамики задач за последние 30 дней
+        :return: None
+        """
+        start_date, end_date = default_period("day", 30)
+        series = self.task_manager.time_series().series(start_date, end_date, freq="day")
+        days = [period[8:10] + "." + period[5:7] for period in series["periods"]]
+
+        # Создание графика
+        fig, ax = plt.subplots()
+        ax.plot(days, series["created"], label="Создано")
+        ax.plot(days, series["completed"], label="Завершено")
+        ax.plot(days, series["overdue"], label="Просрочено")
+        ax.plot(days, series["backlog"], label="В работе")
+        ax.set_xlabel("День")
+        ax.set_ylabel("Количество задач")
+        ax.set_title("Динамика задач за 30 дней")
+        ax.tick_params(axis="x", labelrotation=90)
+        ax.legend()
+
+        # Отображение графика в новом окне
+        graph_window = tk.Toplevel(self.root)
+        graph_window.title("График динамики задач")
+
+        canvas = FigureCanvasTkAgg(fig, master=graph_window)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
 
 def run_gui() -> None:
     """
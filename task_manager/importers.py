@@ -0,0 +1,348 @@
+"""Модуль для потокового импорта задач из CSV и JSON файлов"""
+
+import csv
+import io
+import json
+import os
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Any
+
+from .task import Task
+
+# Размер блока, которым читается JSON-файл
+JSON_CHUNK_SIZE = 64 * 1024
+
+# Размер части CSV-файла, которую разбирает один процесс при параллельном импорте
+CSV_PARALLEL_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class ImportResult:
+    """
+    Класс с итогами импорта
+
+    Сохраняются только первые `max_errors` ошибок, чтобы память не росла вместе с размером файла.
+    Полный поток ошибок можно получить через callback `on_error`.
+    """
+
+    def __init__(self, max_errors: int = 1000) -> None:
+        """
+        Инициализация итогов импорта
+
+        :param max_errors: Сколько ошибок хранить в `errors`. По умолчанию 1000
+        """
+        self.processed = 0
+        self.imported = 0
+        self.error_count = 0
+        self.errors: list[tuple[int, str]] = []
+        self.max_errors = max_errors
+
+    def add_error(self, row_number: int, message: str) -> None:
+        """
+        Регистрирует ошибку в строке
+
+        :param row_number: Номер записи в файле (с 1)
+        :param message: Описание ошибки
+        """
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((row_number, message))
+
+
+def iter_json_records(file_path: str, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Последовательно читает элементы JSON-массива, не загружая файл целиком
+
+    :param file_path: Путь к JSON-файлу, содержащему массив
+    :param chunk_size: Размер блока чтения в символах
+    :return: Итератор по элементам массива
+    :raises ValueError: Если файл не является JSON-массивом
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, "r", encoding="utf-8") as file:
+        buffer = ""
+        position = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buffer, position, eof
+            chunk = file.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[position:] + chunk
+            position = 0
+            return True
+
+        def skip_whitespace() -> None:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position < len(buffer) or not fill():
+                    return
+
+        skip_whitespace()
+        if position >= len(buffer) or buffer[position] != "[":
+            raise ValueError("Ожидается JSON-массив задач")
+        position += 1
+
+        # После "[" и после каждой запятой ожидается значение, после значения — запятая или "]"
+        expect_value = True
+        empty = True
+        while True:
+            skip_whitespace()
+            if position >= len(buffer):
+                raise ValueError("Неожиданный конец JSON-файла")
+
+            char = buffer[position]
+            if char == "]":
+                if expect_value and not empty:
+                    raise ValueError("Некорректный JSON-массив: запятая перед ]")
+                return
+            if char == ",":
+                if expect_value:
+                    raise ValueError("Некорректный JSON-массив: лишняя запятая")
+                position += 1
+                expect_value = True
+                continue
+            if not expect_value:
+                raise ValueError("Некорректный JSON-массив: пропущена запятая")
+
+            while True:
+                try:
+                    record, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if eof or not fill():
+                        raise
+                    continue
+                # Число, за которым в блоке ничего нет или идет его недочитанная часть (например, "1." или "1e"),
+                # может продолжаться в следующем блоке
+                if (end < len(buffer) and buffer[end] not in "0123456789+-.eE") or eof or not fill():
+                    break
+            position = end
+            expect_value = False
+            empty = False
+            yield record
+
+
+def iter_csv_rows(file_path: str) -> Iterator[dict[str, str]]:
+    """
+    Последовательно читает строки CSV-файла
+
+    :param file_path: Путь к CSV-файлу с заголовком
+    :return: Итератор по строкам в виде словарей
+    """
+    with open(file_path, "r", encoding="utf-8", newline="") as file:
+        yield from csv.DictReader(file)
+
+
+def split_csv_ranges(file_path: str, chunk_size: int = CSV_PARALLEL_CHUNK_SIZE) -> tuple[str, list[tuple[int, int]]]:
+    """
+    Делит CSV-файл на диапазоны байтов по границам строк
+
+    Поля в кавычках с переводами строк внутри не поддерживаются: граница диапазона может попасть
+    внутрь такого поля.
+
+    :param file_path: Путь к CSV-файлу с заголовком
+    :param chunk_size: Примерный размер диапазона в байтах
+    :return: Строка заголовка и список диапазонов (начало, конец) после заголовка
+    """
+    size = os.path.getsize(file_path)
+    ranges = []
+    with open(file_path, "rb") as file:
+        header = file.readline().decode("utf-8-sig")
+        start = file.tell()
+        while start < size:
+            file.seek(min(start + chunk_size, size))
+            file.readline()
+            end = min(file.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def parse_csv_range(file_path: str, header: str, start: int, end: int) -> list[tuple | str]:
+    """
+    Разбирает и проверяет строки CSV-файла из диапазона байтов
+
+    Функция выполняется в отдельном процессе. Задачи возвращаются кортежами полей (дата — порядковым
+    номером дня), а ошибки — строками, потому что такие значения передаются между процессами
+    намного быстрее объектов `Task`.
+
+    :param file_path: Путь к CSV-файлу
+    :param header: Строка заголовка файла
+    :param start: Начало диапазона в байтах
+    :param end: Конец диапазона в байтах
+    :return: Для каждой строки диапазона кортеж полей задачи или текст ошибки
+    """
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        chunk = file.read(end - start).decode("utf-8")
+
+    results = []
+    for row in csv.DictReader(io.StringIO(header + chunk, newline="")):
+        try:
+            task = task_from_csv_row(row)
+        except ValueError as e:
+            results.append(str(e))
+            continue
+        results.append((
+            task.title, task.description, task.due_date.toordinal(), task.priority, task.category, task.status
+        ))
+    return results
+
+
+def iter_csv_parallel(
+        file_path: str, workers: int | None = None, chunk_size: int = CSV_PARALLEL_CHUNK_SIZE
+) -> Iterator[tuple | str]:
+    """
+    Разбирает CSV-файл в пуле процессов, сохраняя порядок строк
+
+    Одновременно в обработке находится не больше двух диапазонов на процесс, поэтому память
+    ограничена независимо от размера файла.
+
+    :param file_path: Путь к CSV-файлу с заголовком
+    :param workers: Количество процессов. По умолчанию количество ядер процессора
+    :param chunk_size: Примерный размер диапазона, который разбирает один процесс
+    :return: Итератор по результатам `parse_csv_range` в порядке строк файла
+    """
+    header, ranges = split_csv_ranges(file_path, chunk_size)
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for start, end in ranges:
+            in_flight.append(executor.submit(parse_csv_range, file_path, header, start, end))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def task_from_parsed(item: tuple | str) -> Task:
+    """
+    Создает задачу из результата `parse_csv_range`
+
+    :param item: Кортеж полей задачи или текст ошибки
+    :return: Объект задачи
+    :raises ValueError: Если строку не удалось разобрать
+    """
+    if isinstance(item, str):
+        raise ValueError(item)
+    title, description, due_date, priority, category, status = item
+    return Task(title, description, date.fromordinal(due_date), priority, category, status)
+
+
+def validate_task(task: Task) -> Task:
+    """
+    Проверяет значения полей задачи
+
+    :param task: Объект задачи
+    :return: Та же задача
+    :raises ValueError: Если значение какого-либо поля недопустимо
+    """
+    if not task.title:
+        raise ValueError("Пустой заголовок")
+    if task.priority not in Task.ALL_PRIORITIES:
+        raise ValueError(f"Недопустимый приоритет: {task.priority}")
+    if task.category not in Task.ALL_CATEGORIES:
+        raise ValueError(f"Недопустимая категория: {task.category}")
+    if task.status not in Task.ALL_STATUSES:
+        raise ValueError(f"Недопустимый статус: {task.status}")
+    return task
+
+
+def task_from_json_record(record: dict[str, Any]) -> Task:
+    """
+    Создает задачу из записи JSON-файла
+
+    ID из файла не используется, новый ID назначает `TaskManager`.
+
+    :param record: Словарь с данными задачи
+    :return: Объект задачи
+    :raises ValueError: Если запись некорректна
+    """
+    try:
+        task = Task.from_dict(record)
+    except KeyError as e:
+        raise ValueError(f"Отсутствует поле {e}")
+    except (TypeError, AttributeError):
+        raise ValueError("Запись не является объектом задачи")
+    task.id = None
+    return validate_task(task)
+
+
+def task_from_csv_row(row: dict[str, str]) -> Task:
+    """
+    Создает задачу из строки CSV-файла
+
+    :param row: Словарь с колонками Title, Description, Due Date, Priority, Category, Status
+    :return: Объект задачи
+    :raises ValueError: Если строка некорректна
+    """
+    try:
+        task = Task(
+            title=row["Title"],
+            description=row["Description"],
+            due_date=datetime.fromisoformat(row["Due Date"]).date(),
+            priority=row["Priority"],
+            category=row["Category"],
+            status=row["Status"]
+        )
+    except KeyError as e:
+        raise ValueError(f"Отсутствует колонка {e}")
+    except TypeError:
+        raise ValueError("Неполная строка")
+    return validate_task(task)
+
+
+def import_records(
+        records: Iterator[Any], convert: Callable[[Any], Task], add_batch: Callable[[list[Task]], Any],
+        batch_size: int = 1000, on_progress: Callable[[ImportResult], None] | None = None,
+        on_error: Callable[[int, str], None] | None = None
+) -> ImportResult:
+    """
+    Импортирует записи пачками
+
+    В памяти одновременно находится не больше `batch_size` новых задач. Некорректные записи
+    пропускаются и регистрируются как ошибки, остальные записи импортируются.
+
+    :param records: Итератор по записям файла
+    :param convert: Функция преобразования записи в задачу, при ошибке бросает ValueError
+    :param add_batch: Функция добавления пачки задач в хранилище
+    :param batch_size: Размер пачки. По умолчанию 1000
+    :param on_progress: Вызывается после сохранения каждой пачки с текущими итогами
+    :param on_error: Вызывается для каждой некорректной записи с ее номером и описанием ошибки
+    :return: Итоги импорта
+    """
+    result = ImportResult()
+    batch = []
+
+    def flush_batch() -> None:
+        add_batch(batch)
+        result.imported += len(batch)
+        batch.clear()
+        if on_progress is not None:
+            on_progress(result)
+
+    for row_number, record in enumerate(records, start=1):
+        result.processed += 1
+        try:
+            batch.append(convert(record))
+        except ValueError as e:
+            result.add_error(row_number, str(e))
+            if on_error is not None:
+                on_error(row_number, str(e))
+            continue
+
+        if len(batch) >= batch_size:
+            flush_batch()
+
+    if batch:
+        flush_batch()
+    elif on_progress is not None:
+        on_progress(result)
+    return result
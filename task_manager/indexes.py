@@ -0,0 +1,533 @@
+"""Модуль со вторичными индексами задач"""
+
+import bisect
+import math
+import re
+import unicodedata
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date
+from typing import Any
+
+from .task import Task
+
+# Веса вхождения слова в поле задачи при ранжировании результатов поиска
+TEXT_FIELD_WEIGHTS = {"title": 3, "description": 1, "category": 1, "status": 1}
+
+# Во сколько раз точное совпадение слова ценнее совпадения по префиксу
+EXACT_MATCH_BONUS = 2
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Приводит текст к виду для поиска
+
+    Текст приводится к нормальной форме NFKC и к нижнему регистру через `casefold`,
+    буква "ё" заменяется на "е".
+
+    :param text: Исходный текст
+    :return: Нормализованный текст
+    """
+    return unicodedata.normalize("NFKC", text).casefold().replace("ё", "е")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Разбивает текст на нормализованные слова
+
+    :param text: Исходный текст
+    :return: Список слов
+    """
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+class FieldIndex:
+    """
+    Индекс задач по значению поля
+
+    Для каждого значения поля хранится множество ID задач, поэтому выборка по значению
+    стоит O(размер результата), а не O(количество задач).
+    """
+
+    def __init__(self, field: str) -> None:
+        """
+        Инициализация индекса
+
+        :param field: Имя атрибута задачи (status, category, priority)
+        """
+        self.field = field
+        self._ids: dict[str, set[int]] = {}
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """
+        Строит индекс заново
+
+        :param tasks: Все задачи
+        """
+        self._ids = {}
+        for task in tasks:
+            self.add(task)
+
+    def add(self, task: Task) -> None:
+        """
+        Добавляет задачу в индекс
+
+        :param task: Объект задачи с назначенным ID
+        """
+        self._ids.setdefault(getattr(task, self.field), set()).add(task.id)
+
+    def remove(self, task: Task) -> None:
+        """
+        Удаляет задачу из индекса
+
+        :param task: Объект задачи с назначенным ID
+        """
+        value = getattr(task, self.field)
+        ids = self._ids.get(value)
+        if ids is not None:
+            ids.discard(task.id)
+            if not ids:
+                del self._ids[value]
+
+    def replace(self, old_task: Task, new_task: Task) -> None:
+        """
+        Обновляет индекс при изменении задачи
+
+        :param old_task: Задача до изменения
+        :param new_task: Задача после изменения
+        """
+        if getattr(old_task, self.field) != getattr(new_task, self.field):
+            self.remove(old_task)
+            self.add(new_task)
+
+    def get(self, value: str) -> list[int]:
+        """
+        Возвращает ID задач с указанным значением поля
+
+        :param value: Значение поля
+        :return: Список ID по возрастанию
+        """
+        return sorted(self._ids.get(value, ()))
+
+    def count(self, value: str) -> int:
+        """
+        Возвращает количество задач с указанным значением поля
+
+        :param value: Значение поля
+        :return: Количество задач
+        """
+        return len(self._ids.get(value, ()))
+
+
+class DueDateIndex:
+    """
+    Упорядоченный индекс задач по сроку выполнения
+
+    Хранит отсортированный список пар (порядковый номер дня срока, ID задачи), поэтому выборка
+    задач со сроком в диапазоне — это двоичный поиск и срез. Даты хранятся порядковыми номерами,
+    чтобы сроки типа `date` и `datetime` сравнивались одинаково.
+    """
+
+    def __init__(self, exclude_status: str | None = None) -> None:
+        """
+        Инициализация индекса
+
+        :param exclude_status: Статус, задачи с которым не попадают в индекс. По умолчанию индексируются все задачи
+        """
+        self.exclude_status = exclude_status
+        self._entries: list[tuple[int, int]] = []
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """
+        Строит индекс заново
+
+        :param tasks: Все задачи
+        """
+        self._entries = sorted(
+            (task.due_date.toordinal(), task.id) for task in tasks if task.status != self.exclude_status
+        )
+
+    def add(self, task: Task) -> None:
+        """
+        Добавляет задачу в индекс
+
+        :param task: Объект задачи с назначенным ID
+        """
+        if task.status != self.exclude_status:
+            bisect.insort(self._entries, (task.due_date.toordinal(), task.id))
+
+    def remove(self, task: Task) -> None:
+        """
+        Удаляет задачу из индекса
+
+        :param task: Объект задачи с назначенным ID
+        """
+        if task.status == self.exclude_status:
+            return
+        entry = (task.due_date.toordinal(), task.id)
+        position = bisect.bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def replace(self, old_task: Task, new_task: Task) -> None:
+        """
+        Обновляет индекс при изменении задачи
+
+        :param old_task: Задача до изменения
+        :param new_task: Задача после изменения
+        """
+        if old_task.due_date != new_task.due_date or old_task.status != new_task.status:
+            self.remove(old_task)
+            self.add(new_task)
+
+    def range(self, due_from: date | None = None, due_to: date | None = None) -> list[int]:
+        """
+        Возвращает ID задач со сроком в диапазоне
+
+        :param due_from: Нижняя граница срока выполнения (включительно). По умолчанию без ограничения
+        :param due_to: Верхняя граница срока выполнения (не включительно). По умолчанию без ограничения
+        :return: Список ID в порядке срока выполнения, при равных сроках — по возрастанию ID
+        """
+        start, end = self._bounds(due_from, due_to)
+        return [task_id for _, task_id in self._entries[start:end]] if start < end else []
+
+    def count(self, due_from: date | None = None, due_to: date | None = None) -> int:
+        """
+        Возвращает количество задач со сроком в диапазоне
+
+        :param due_from: Нижняя граница срока выполнения (включительно). По умолчанию без ограничения
+        :param due_to: Верхняя граница срока выполнения (не включительно). По умолчанию без ограничения
+        :return: Количество задач
+        """
+        start, end = self._bounds(due_from, due_to)
+        return max(end - start, 0)
+
+    def _bounds(self, due_from: date | None, due_to: date | None) -> tuple[int, int]:
+        """
+        Находит двоичным поиском границы диапазона в списке записей
+
+        :param due_from: Нижняя граница срока выполнения (включительно)
+        :param due_to: Верхняя граница срока выполнения (не включительно)
+        :return: Позиции начала и конца среза
+        """
+        start = 0 if due_from is None else bisect.bisect_left(self._entries, (due_from.toordinal(),))
+        end = len(self._entries) if due_to is None else bisect.bisect_left(self._entries, (due_to.toordinal(),))
+        return start, end
+
+
+class TextIndex:
+    """
+    Инвертированный индекс слов заголовка, описания, категории и статуса задач
+
+    Для каждого слова хранится словарь {ID задачи: вес}, где вес — сумма весов полей, в которых
+    встречается слово (см. `TEXT_FIELD_WEIGHTS`). Словарь слов дополнительно хранится отсортированным,
+    чтобы слова с заданным префиксом находились двоичным поиском.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пустого индекса"""
+        self._postings: dict[str, dict[int, int]] = {}
+        self._vocabulary: list[str] = []
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """
+        Строит индекс заново
+
+        :param tasks: Все задачи
+        """
+        self._postings = {}
+        for task in tasks:
+            for term, weight in self._task_terms(task).items():
+                self._postings.setdefault(term, {})[task.id] = weight
+        self._vocabulary = sorted(self._postings)
+
+    def add(self, task: Task) -> None:
+        """
+        Добавляет задачу в индекс
+
+        :param task: Объект задачи с назначенным ID
+        """
+        for term, weight in self._task_terms(task).items():
+            if term not in self._postings:
+                self._postings[term] = {}
+                bisect.insort(self._vocabulary, term)
+            self._postings[term][task.id] = weight
+
+    def remove(self, task: Task) -> None:
+        """
+        Удаляет задачу из индекса
+
+        :param task: Объект задачи с назначенным ID (с тем же текстом, с которым она была добавлена)
+        """
+        for term in self._task_terms(task):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(task.id, None)
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+
+    def replace(self, old_task: Task, new_task: Task) -> None:
+        """
+        Обновляет индекс при изменении задачи
+
+        :param old_task: Задача до изменения
+        :param new_task: Задача после изменения
+        """
+        if any(getattr(old_task, field) != getattr(new_task, field) for field in TEXT_FIELD_WEIGHTS):
+            self.remove(old_task)
+            self.add(new_task)
+
+    def search(self, query: str) -> list[int] | None:
+        """
+        Ищет задачи, содержащие все слова запроса
+
+        Каждое слово запроса совпадает со словами задачи, начинающимися с него. Результаты
+        упорядочены по убыванию релевантности: суммы весов совпавших слов, где точное совпадение
+        весит в `EXACT_MATCH_BONUS` раз больше совпадения по префиксу.
+
+        :param query: Строка запроса
+        :return: Список ID задач или None, если в запросе нет ни одного слова
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+
+        scores: dict[int, int] | None = None
+        for term in dict.fromkeys(terms):
+            term_scores = self._prefix_scores(term)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {task_id: score + term_scores[task_id] for task_id, score in scores.items()
+                          if task_id in term_scores}
+            if not scores:
+                return []
+        return sorted(scores, key=lambda task_id: (-scores[task_id], task_id))
+
+    def _prefix_scores(self, prefix: str) -> dict[int, int]:
+        """
+        Считает вес задач, содержащих слова с заданным префиксом
+
+        :param prefix: Нормализованное слово запроса
+        :return: Словарь {ID задачи: вес}
+        """
+        scores: dict[int, int] = {}
+        position = bisect.bisect_left(self._vocabulary, prefix)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(prefix):
+            term = self._vocabulary[position]
+            bonus = EXACT_MATCH_BONUS if term == prefix else 1
+            for task_id, weight in self._postings[term].items():
+                scores[task_id] = scores.get(task_id, 0) + weight * bonus
+            position += 1
+        return scores
+
+    @staticmethod
+    def _task_terms(task: Task) -> dict[str, int]:
+        """
+        Разбивает текстовые поля задачи на слова с весами
+
+        :param task: Объект задачи
+        :return: Словарь {слово: вес}
+        """
+        terms: dict[str, int] = {}
+        for field, weight in TEXT_FIELD_WEIGHTS.items():
+            for term in tokenize(getattr(task, field)):
+                terms[term] = terms.get(term, 0) + weight
+        return terms
+
+
+class SortedView:
+    """
+    Поддерживаемое упорядоченное представление задач по одному столбцу
+
+    Хранит отсортированный список пар (ключ сортировки, ID задачи), который обновляется двоичным
+    поиском при каждом изменении, поэтому задачи в порядке столбца выдаются без сортировки.
+    """
+
+    def __init__(self, key: Callable[[Task], Any]) -> None:
+        """
+        Инициализация представления
+
+        :param key: Функция ключа сортировки задачи
+        """
+        self.key = key
+        self._entries: list[tuple[Any, int]] = []
+
+    def __len__(self) -> int:
+        """
+        Количество задач в представлении
+
+        :return: Количество задач
+        """
+        return len(self._entries)
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """
+        Строит представление заново
+
+        :param tasks: Все задачи
+        """
+        self._entries = sorted((self.key(task), task.id) for task in tasks)
+
+    def add(self, task: Task) -> None:
+        """
+        Добавляет задачу в представление
+
+        :param task: Объект задачи с назначенным ID
+        """
+        bisect.insort(self._entries, (self.key(task), task.id))
+
+    def remove(self, task: Task) -> None:
+        """
+        Удаляет задачу из представления
+
+        :param task: Объект задачи с назначенным ID
+        """
+        entry = (self.key(task), task.id)
+        position = bisect.bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def replace(self, old_task: Task, new_task: Task) -> None:
+        """
+        Обновляет представление при изменении задачи
+
+        :param old_task: Задача до изменения
+        :param new_task: Задача после изменения
+        """
+        if self.key(old_task) != self.key(new_task):
+            self.remove(old_task)
+            self.add(new_task)
+
+    def ids(self, descending: bool = False, after: tuple[Any, int] | None = None) -> Iterator[int]:
+        """
+        Перебирает ID задач в порядке столбца
+
+        При равных значениях столбца ID идут по возрастанию в обоих направлениях.
+
+        :param descending: Порядок по убыванию значений столбца
+        :param after: Пара (ключ сортировки, ID), после которой начинается перебор. По умолчанию с начала
+        :return: Итератор по ID
+        """
+        if not descending:
+            start = 0 if after is None else bisect.bisect_right(self._entries, after)
+            for position in range(start, len(self._entries)):
+                yield self._entries[position][1]
+            return
+
+        end = len(self._entries)
+        if after is not None:
+            # Сначала оставшиеся задачи с тем же значением столбца, затем задачи с меньшими значениями
+            key = after[0]
+            start = bisect.bisect_left(self._entries, (key,))
+            group_end = bisect.bisect_right(self._entries, (key, math.inf))
+            for _, task_id in self._entries[bisect.bisect_right(self._entries, after, lo=start):group_end]:
+                yield task_id
+            end = start
+        while end > 0:
+            key = self._entries[end - 1][0]
+            start = bisect.bisect_left(self._entries, (key,), hi=end)
+            for _, task_id in self._entries[start:end]:
+                yield task_id
+            end = start
+
+
+class AggregateCounters:
+    """
+    Счетчики задач по сочетаниям категории, приоритета и статуса
+
+    Хранится количество задач для каждого встречающегося сочетания (категория, приоритет, статус).
+    Сочетаний немного, поэтому количество задач по любому полю или набору полей считается суммированием
+    счетчиков без обхода задач.
+    """
+
+    FIELDS = ("category", "priority", "status")
+
+    def __init__(self) -> None:
+        """Инициализация пустых счетчиков"""
+        self._counts: dict[tuple[str, str, str], int] = {}
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """
+        Пересчитывает счетчики заново
+
+        :param tasks: Все задачи
+        """
+        self._counts = {}
+        for task in tasks:
+            self.add(task)
+
+    def add(self, task: Task) -> None:
+        """
+        Учитывает новую задачу
+
+        :param task: Объект задачи
+        """
+        key = (task.category, task.priority, task.status)
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+    def remove(self, task: Task) -> None:
+        """
+        Исключает удаленную задачу
+
+        :param task: Объект задачи
+        """
+        key = (task.category, task.priority, task.status)
+        count = self._counts.get(key, 0) - 1
+        if count > 0:
+            self._counts[key] = count
+        else:
+            self._counts.pop(key, None)
+
+    def replace(self, old_task: Task, new_task: Task) -> None:
+        """
+        Обновляет счетчики при изменении задачи
+
+        :param old_task: Задача до изменения
+        :param new_task: Задача после изменения
+        """
+        self.remove(old_task)
+        self.add(new_task)
+
+    def count(self, category: str | None = None, priority: str | None = None, status: str | None = None) -> int:
+        """
+        Возвращает количество задач с указанными значениями полей
+
+        :param category: Категория. По умолчанию любая
+        :param priority: Приоритет. По умолчанию любой
+        :param status: Статус. По умолчанию любой
+        :return: Количество задач
+        """
+        return sum(
+            count for (task_category, task_priority, task_status), count in self._counts.items()
+            if (category is None or task_category == category)
+            and (priority is None or task_priority == priority)
+            and (status is None or task_status == status)
+        )
+
+    def count_by(self, field: str) -> dict[str, int]:
+        """
+        Группирует количество задач по значениям поля
+
+        :param field: Поле группировки: category, priority или status
+        :return: Словарь {значение поля: количество задач}
+        :raises ValueError: Если поле не поддерживается
+        """
+        if field not in self.FIELDS:
+            raise ValueError(f"Недопустимое поле группировки: {field}")
+        position = self.FIELDS.index(field)
+        counts: dict[str, int] = {}
+        for key, count in self._counts.items():
+            counts[key[position]] = counts.get(key[position], 0) + count
+        return counts
+
+    def items(self) -> list[tuple[tuple[str, str, str], int]]:
+        """
+        Возвращает счетчики всех встречающихся сочетаний
+
+        :return: Список пар ((категория, приоритет, статус), количество)
+        """
+        return list(self._counts.items())
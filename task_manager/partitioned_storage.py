@@ -0,0 +1,385 @@
+"""Модуль для хранения задач в отдельных файлах по категориям или месяцам срока выполнения"""
+
+import json
+import os
+import threading
+from collections.abc import Iterable
+from datetime import date
+
+from .storage import Storage
+from .task import Task
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = 1
+
+# Способы разбиения задач на разделы
+PARTITION_KEYS = ("category", "due_month")
+
+
+class PartitionedStorage(Storage):
+    """
+    Хранилище задач, разбитое на разделы
+
+    Каждый раздел (категория или месяц срока выполнения в виде "ГГГГ-ММ") хранится в отдельном
+    JSON-файле в директории хранилища. Манифест содержит способ разбиения, для каждого раздела — имя файла,
+    количество задач и диапазон их ID, а также максимальный выданный ID. Изменения переписывают только
+    затронутые разделы, а `TaskManager` загружает разделы по мере того, как они нужны запросам.
+
+    Резервная копия всего хранилища создается при полной перезаписи и после каждых `compact_threshold`
+    изменений (см. `needs_compaction` и `compact`).
+    """
+
+    partitioned = True
+
+    def __init__(
+            self, file_path: str = "data/tasks.parts", journal: bool = False, compact_threshold: int = 1000,
+            partition_by: str = "category"
+    ) -> None:
+        """
+        Инициализация хранилища
+
+        Если директория уже содержит манифест, способ разбиения берется из него.
+
+        :param file_path: Путь к директории хранилища. По умолчанию "data/tasks.parts"
+        :param journal: Не используется, изменения всегда пишутся в файлы разделов
+        :param compact_threshold: Количество изменений, после которого создается резервная копия
+        :param partition_by: Способ разбиения: "category" или "due_month". По умолчанию "category"
+        :raises ValueError: Если способ разбиения неизвестен
+        """
+        super().__init__(file_path, journal=False, compact_threshold=compact_threshold)
+        self.manifest_path = os.path.join(file_path, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self._locations: dict[int, str] = {}
+        self._changes_since_backup = 0
+
+        self.manifest = {"format": MANIFEST_FORMAT, "partition_by": partition_by, "max_id": 0,
+                         "next_file": 1, "partitions": {}}
+        self._read_manifest()
+        if self.manifest["partition_by"] not in PARTITION_KEYS:
+            raise ValueError(f"Неизвестный способ разбиения: {self.manifest['partition_by']}")
+
+    @property
+    def partition_by(self) -> str:
+        """
+        Способ разбиения задач на разделы
+
+        :return: "category" или "due_month"
+        """
+        return self.manifest["partition_by"]
+
+    @property
+    def incremental_writes(self) -> bool:
+        """
+        Хранилище записывает только изменения
+
+        :return: Всегда True
+        """
+        return True
+
+    @property
+    def needs_compaction(self) -> bool:
+        """
+        Пора ли создать резервную копию хранилища
+
+        :return: True, если с последней копии накопилось `compact_threshold` изменений
+        """
+        return self._changes_since_backup >= self.compact_threshold
+
+    def partition_of(self, task: Task) -> str:
+        """
+        Возвращает раздел, в котором хранится задача
+
+        :param task: Объект задачи
+        :return: Ключ раздела
+        """
+        if self.partition_by == "category":
+            return task.category
+        return f"{task.due_date.year:04d}-{task.due_date.month:02d}"
+
+    def partition_keys(self) -> list[str]:
+        """
+        Возвращает ключи всех разделов хранилища
+
+        :return: Отсортированный список ключей
+        """
+        with self._lock:
+            return sorted(self.manifest["partitions"])
+
+    def max_id(self) -> int:
+        """
+        Возвращает максимальный ID, когда-либо сохраненный в хранилище
+
+        :return: Максимальный ID или 0
+        """
+        with self._lock:
+            return self.manifest["max_id"]
+
+    def partitions_for(
+            self, category: str | Iterable[str] | None = None, due_from: date | None = None, due_to: date | None = None
+    ) -> list[str] | None:
+        """
+        Определяет разделы, в которых могут находиться задачи, подходящие под условия
+
+        :param category: Категория или несколько категорий
+        :param due_from: Нижняя граница срока выполнения (включительно)
+        :param due_to: Верхняя граница срока выполнения (включительно)
+        :return: Список ключей разделов или None, если по условиям разделы сузить нельзя
+        """
+        if self.partition_by == "category":
+            if category is None:
+                return None
+            return [category] if isinstance(category, str) else list(category)
+
+        if due_from is None and due_to is None:
+            return None
+        low = "" if due_from is None else f"{due_from.year:04d}-{due_from.month:02d}"
+        high = "9999-99" if due_to is None else f"{due_to.year:04d}-{due_to.month:02d}"
+        return [key for key in self.partition_keys() if low <= key <= high]
+
+    def partitions_for_id(self, task_id: int) -> list[str]:
+        """
+        Определяет разделы, диапазон ID которых включает указанный ID
+
+        :param task_id: ID задачи
+        :return: Список ключей разделов
+        """
+        with self._lock:
+            if task_id in self._locations:
+                return [self._locations[task_id]]
+            return [
+                key for key, info in self.manifest["partitions"].items()
+                if info["count"] and info["min_id"] <= task_id <= info["max_id"]
+            ]
+
+    def load_partitions(self, keys: Iterable[str]) -> list[Task]:
+        """
+        Загружает задачи указанных разделов
+
+        :param keys: Ключи разделов. Разделы, которых нет в хранилище, пропускаются
+        :return: Список задач
+        """
+        tasks = []
+        with self._lock:
+            for key in keys:
+                for task in self._read_partition(key):
+                    self._locations[task.id] = key
+                    tasks.append(task)
+        return tasks
+
+    def load_tasks(self) -> list[Task]:
+        """
+        Загружает задачи всех разделов
+
+        :return: Список задач
+        """
+        return self.load_partitions(self.partition_keys())
+
+    def save_tasks(self, tasks: Iterable[Task]) -> None:
+        """
+        Полностью перезаписывает хранилище переданными задачами
+
+        Разделы, в которых не осталось задач, удаляются.
+
+        :param tasks: Все задачи хранилища
+        """
+        partitions: dict[str, list[Task]] = {}
+        for task in tasks:
+            partitions.setdefault(self.partition_of(task), []).append(task)
+
+        with self._lock:
+            for key in list(self.manifest["partitions"]):
+                if key not in partitions:
+                    self._remove_partition(key)
+            self._register_partitions(partitions)
+            self._locations = {}
+            for key, partition_tasks in partitions.items():
+                self._write_partition(key, partition_tasks)
+                self._locations.update((task.id, key) for task in partition_tasks)
+            self._write_manifest()
+            self._changes_since_backup = 0
+            data = self._snapshot()
+        self._create_backup(data)
+
+    def write_changes(self, tasks: Iterable[Task] | None, changes: list[tuple[str, int, Task | None]]) -> None:
+        """
+        Применяет изменения к затронутым разделам
+
+        Каждый затронутый раздел читается, изменяется и перезаписывается один раз за вызов.
+
+        :param tasks: Не используется
+        :param changes: Изменения в виде кортежей (операция, ID задачи, задача)
+        """
+        with self._lock:
+            partitions: dict[str, dict[int, Task]] = {}
+
+            def partition(key: str) -> dict[int, Task]:
+                if key not in partitions:
+                    partitions[key] = {task.id: task for task in self._read_partition(key)}
+                return partitions[key]
+
+            for op, task_id, task in changes:
+                # ID новой задачи больше любого сохраненного, поэтому искать ее в разделах не нужно
+                old_key = self._locate(task_id) if task_id <= self.manifest["max_id"] else None
+                if old_key is not None and (op == "delete" or old_key != self.partition_of(task)):
+                    partition(old_key).pop(task_id, None)
+                    del self._locations[task_id]
+                if op in ("add", "edit"):
+                    new_key = self.partition_of(task)
+                    partition(new_key)[task_id] = task
+                    self._locations[task_id] = new_key
+                    self.manifest["max_id"] = max(self.manifest["max_id"], task_id)
+
+            self._register_partitions(partitions)
+            for key, partition_tasks in partitions.items():
+                if partition_tasks:
+                    self._write_partition(key, list(partition_tasks.values()))
+                else:
+                    self._remove_partition(key)
+            self._write_manifest()
+            self._changes_since_backup += len(changes)
+
+    def compact(self, tasks: Iterable[Task]) -> None:
+        """
+        Создает резервную копию всего хранилища
+
+        Копия собирается из файлов разделов, потому что у `TaskManager` могут быть загружены не все разделы.
+
+        :param tasks: Не используется
+        """
+        with self._lock:
+            self._changes_since_backup = 0
+            data = self._snapshot()
+        self._create_backup(data)
+
+    def reopen(self) -> None:
+        """
+        Перечитывает манифест и сбрасывает известные расположения задач
+        """
+        with self._lock:
+            self._read_manifest()
+            self._locations = {}
+
+    def _watched_paths(self) -> list[str]:
+        """
+        Манифест, который перезаписывается при каждом изменении разделов
+
+        :return: Список путей
+        """
+        return [self.manifest_path]
+
+    def _read_manifest(self) -> None:
+        """
+        Загружает манифест из файла, если он существует
+        """
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as file:
+                self.manifest = json.load(file)
+
+    def _locate(self, task_id: int) -> str | None:
+        """
+        Находит раздел задачи. Вызывается под блокировкой
+
+        Читаются только разделы, диапазон ID которых включает искомый ID: задача всегда лежит
+        в пределах диапазона своего раздела.
+
+        :param task_id: ID задачи
+        :return: Ключ раздела или None, если задачи нет в хранилище
+        """
+        if task_id in self._locations:
+            return self._locations[task_id]
+        candidates = [
+            key for key, info in self.manifest["partitions"].items()
+            if info["count"] and info["min_id"] <= task_id <= info["max_id"]
+        ]
+        for key in candidates:
+            for task in self._read_partition(key):
+                self._locations.setdefault(task.id, key)
+            if task_id in self._locations:
+                return self._locations[task_id]
+        return None
+
+    def _read_partition(self, key: str) -> list[Task]:
+        """
+        Читает задачи раздела из файла
+
+        :param key: Ключ раздела
+        :return: Список задач (пустой, если раздела нет)
+        """
+        info = self.manifest["partitions"].get(key)
+        if info is None:
+            return []
+        path = os.path.join(self.file_path, info["file"])
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as file:
+            return [Task.from_dict(task_data) for task_data in json.load(file)]
+
+    def _register_partitions(self, keys: Iterable[str]) -> None:
+        """
+        Добавляет в манифест новые разделы и сохраняет его до записи их файлов
+
+        Так файл нового раздела никогда не оказывается вне манифеста, даже при сбое во время записи.
+
+        :param keys: Ключи разделов
+        """
+        new_keys = [key for key in keys if key not in self.manifest["partitions"]]
+        for key in new_keys:
+            self.manifest["partitions"][key] = {
+                "file": f"part-{self.manifest['next_file']:05d}.json", "count": 0, "min_id": 0, "max_id": 0
+            }
+            self.manifest["next_file"] += 1
+        if new_keys:
+            self._write_manifest()
+
+    def _write_partition(self, key: str, tasks: list[Task]) -> None:
+        """
+        Записывает файл раздела и обновляет его описание в манифесте (без сохранения манифеста)
+
+        :param key: Ключ раздела
+        :param tasks: Задачи раздела
+        """
+        info = self.manifest["partitions"][key]
+        ids = [task.id for task in tasks]
+        info.update(count=len(tasks), min_id=min(ids, default=0), max_id=max(ids, default=0))
+        self.manifest["max_id"] = max(self.manifest["max_id"], info["max_id"])
+        self._write_atomic(os.path.join(self.file_path, info["file"]), [task.to_dict() for task in tasks])
+
+    def _remove_partition(self, key: str) -> None:
+        """
+        Удаляет раздел из манифеста и его файл (без сохранения манифеста)
+
+        :param key: Ключ раздела
+        """
+        info = self.manifest["partitions"].pop(key)
+        path = os.path.join(self.file_path, info["file"])
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _write_manifest(self) -> None:
+        """
+        Сохраняет манифест
+        """
+        self._write_atomic(self.manifest_path, self.manifest)
+
+    def _write_atomic(self, path: str, data: object) -> None:
+        """
+        Записывает JSON-файл через временный файл
+
+        :param path: Путь к файлу
+        :param data: Данные для записи
+        """
+        os.makedirs(self.file_path, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4)
+        os.replace(temp_path, path)
+
+    def _snapshot(self) -> bytes:
+        """
+        Собирает содержимое всех разделов в формате JSON-хранилища для резервной копии
+
+        :return: JSON-массив всех задач
+        """
+        tasks = [task for key in sorted(self.manifest["partitions"]) for task in self._read_partition(key)]
+        tasks.sort(key=lambda task: task.id)
+        return json.dumps([task.to_dict() for task in tasks], indent=4).encode()
@@ -0,0 +1,341 @@
+"""Модуль для выполнения запросов к задачам: фильтрация, сортировка и постраничный вывод"""
+
+import heapq
+from itertools import islice
+from collections.abc import Callable, Iterator, Mapping
+from datetime import date
+from typing import Any
+
+from .indexes import DueDateIndex, FieldIndex, SortedView, TextIndex
+from .task import Task
+
+# Поля задачи, по которым можно фильтровать и сортировать
+QUERY_FIELDS = ("id", "title", "description", "due_date", "priority", "category", "status", "created_at")
+
+# Ключи сортировки по полям. Приоритет и статус упорядочиваются по смыслу (по `Task.PRIORITY_RANK`
+# и `Task.STATUS_RANK`), даты — по порядковому номеру дня, остальные поля — по значению
+SORT_KEYS: dict[str, Callable[[Task], Any]] = {
+    "id": lambda task: task.id,
+    "title": lambda task: task.title,
+    "description": lambda task: task.description,
+    "due_date": lambda task: task.due_date.toordinal(),
+    "priority": lambda task: Task.PRIORITY_RANK.get(task.priority, -1),
+    "category": lambda task: task.category,
+    "status": lambda task: Task.STATUS_RANK.get(task.status, -1),
+    "created_at": lambda task: task.created_at.toordinal(),
+}
+
+SORT_DIRECTIONS = ("asc", "desc")
+
+# Поля, ключ сортировки которых — строка (у остальных полей — целое число)
+TEXT_SORT_FIELDS = ("title", "description", "category")
+
+
+class _Descending:
+    """Обертка значения ключа сортировки с обратным порядком сравнения"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+class TaskQuery:
+    """
+    Описание запроса к задачам
+
+    Все условия объединяются через "и". Без сортировки задачи возвращаются в порядке ID, а при
+    поиске по тексту — в порядке релевантности.
+
+    Для постраничного вывода вместо offset можно передать `after` — положение последней задачи предыдущей
+    страницы (см. `cursor`). Такая страница начинается сразу после этой задачи, поэтому задачи, добавленные
+    или удаленные между запросами страниц, не сдвигают следующие страницы.
+    """
+
+    def __init__(
+            self, filters: Mapping[str, Any] | None = None, due_from: date | None = None, due_to: date | None = None,
+            search: str | None = None, sort: list[tuple[str, str]] | None = None,
+            limit: int | None = None, offset: int = 0, after: list | tuple | None = None
+    ) -> None:
+        """
+        Инициализация запроса
+
+        :param filters: Условия равенства {поле: значение}. Если значение — список, кортеж или множество,
+            поле должно совпадать с одним из значений
+        :param due_from: Нижняя граница срока выполнения (включительно)
+        :param due_to: Верхняя граница срока выполнения (включительно)
+        :param search: Строка полнотекстового поиска (см. `TextIndex.search`)
+        :param sort: Ключи сортировки в виде списка пар (поле, "asc" или "desc")
+        :param limit: Максимальное количество задач в результате. По умолчанию без ограничения
+        :param offset: Сколько задач пропустить от начала результата. По умолчанию 0
+        :param after: Значения ключа сортировки и ID задачи, после которой начинается результат (см. `cursor`)
+        :raises ValueError: Если поле или направление сортировки неизвестно, limit или offset отрицательны,
+            либо `after` не соответствует сортировке
+        """
+        self.filters = dict(filters or {})
+        self.due_from = due_from
+        self.due_to = due_to
+        self.search = search
+        self.sort = list(sort or [])
+        self.limit = limit
+        self.offset = offset
+        self.after = None if after is None else tuple(after)
+
+        for field in self.filters:
+            if field not in QUERY_FIELDS:
+                raise ValueError(f"Неизвестное поле фильтра: {field}")
+        for field, direction in self.sort:
+            if field not in SORT_KEYS:
+                raise ValueError(f"Неизвестное поле сортировки: {field}")
+            if direction not in SORT_DIRECTIONS:
+                raise ValueError(f"Неизвестное направление сортировки: {direction}")
+        if limit is not None and limit < 0:
+            raise ValueError("limit не может быть отрицательным")
+        if offset < 0:
+            raise ValueError("offset не может быть отрицательным")
+        if self.after is not None:
+            if search is not None and not self.sort:
+                raise ValueError("Курсор не поддерживается для поиска без сортировки")
+            types = [str if field in TEXT_SORT_FIELDS else int for field, _ in self.sort] + [int]
+            if len(self.after) != len(types) or not all(map(isinstance, self.after, types)):
+                raise ValueError("Курсор не соответствует сортировке запроса")
+
+    def matches(self, task: Task) -> bool:
+        """
+        Проверяет задачу на соответствие фильтрам запроса (без учета поиска по тексту)
+
+        :param task: Объект задачи
+        :return: True, если задача подходит под все фильтры
+        """
+        for field, value in self.filters.items():
+            if isinstance(value, (list, tuple, set, frozenset)):
+                if getattr(task, field) not in value:
+                    return False
+            elif getattr(task, field) != value:
+                return False
+        due = task.due_date.toordinal()
+        if self.due_from is not None and due < self.due_from.toordinal():
+            return False
+        if self.due_to is not None and due > self.due_to.toordinal():
+            return False
+        return True
+
+    def sort_key(self) -> Callable[[Task], tuple] | None:
+        """
+        Строит составной ключ сортировки
+
+        Последним элементом ключа всегда идет ID задачи, поэтому порядок задач с равными
+        значениями полей определен однозначно.
+
+        :return: Функция ключа или None, если сортировка не задана
+        """
+        if not self.sort:
+            return None
+        keys = []
+        for field, direction in self.sort:
+            key = SORT_KEYS[field]
+            if direction == "desc":
+                key = (lambda key: lambda task: _Descending(key(task)))(key)
+            keys.append(key)
+        return lambda task: (*(key(task) for key in keys), task.id)
+
+    def cursor(self, task: Task) -> list:
+        """
+        Возвращает положение задачи в порядке запроса для параметра `after` следующей страницы
+
+        :param task: Объект задачи (обычно последняя задача страницы)
+        :return: Значения ключей сортировки и ID задачи
+        """
+        return [*(SORT_KEYS[field](task) for field, _ in self.sort), task.id]
+
+    def after_key(self) -> tuple | None:
+        """
+        Строит из `after` значение, сравнимое с ключом сортировки (см. `sort_key`)
+
+        Без сортировки ключом считается кортеж из ID задачи.
+
+        :return: Кортеж ключа или None, если `after` не задан
+        """
+        if self.after is None:
+            return None
+        values = [
+            _Descending(value) if direction == "desc" else value
+            for value, (_, direction) in zip(self.after, self.sort)
+        ]
+        return (*values, self.after[-1])
+
+
+class QueryResult:
+    """
+    Результат запроса: неизменяемый список задач страницы и общее количество подходящих задач
+    """
+
+    def __init__(self, tasks: tuple[Task, ...], total: int, offset: int = 0, limit: int | None = None) -> None:
+        """
+        Инициализация результата
+
+        :param tasks: Задачи запрошенной страницы
+        :param total: Количество задач, подходящих под условия, без учета limit, offset и курсора
+        :param offset: Смещение страницы
+        :param limit: Размер страницы
+        """
+        self.tasks = tasks
+        self.total = total
+        self.offset = offset
+        self.limit = limit
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self.tasks)
+
+    def __getitem__(self, position: int) -> Task:
+        return self.tasks[position]
+
+
+class QueryEngine:
+    """
+    Класс для выполнения запросов к задачам
+
+    Кандидаты выбираются по самому избирательному из доступных индексов (поиск по тексту, индекс поля
+    или срока выполнения), остальные условия проверяются на отобранных задачах. Сортировка по одному
+    столбцу выполняется обходом поддерживаемого представления столбца (`SortedView`, индекс "sort_<поле>"),
+    если оно есть. Иначе при заданном limit нужная страница выбирается через кучу (O(n log k))
+    без полной сортировки.
+    """
+
+    def __init__(self, tasks: Mapping[int, Task], indexes: Mapping[str, Any]) -> None:
+        """
+        Инициализация
+
+        :param tasks: Задачи по ID
+        :param indexes: Вторичные индексы `TaskManager` по имени
+        """
+        self.tasks = tasks
+        self.indexes = indexes
+
+    def execute(self, query: TaskQuery) -> QueryResult:
+        """
+        Выполняет запрос
+
+        Исходные задачи и индексы не изменяются.
+
+        :param query: Описание запроса
+        :return: Результат запроса
+        """
+        candidate_ids, ordered = self._candidates(query)
+
+        if len(query.sort) == 1:
+            field, direction = query.sort[0]
+            view = self.indexes.get(f"sort_{field}")
+            # Обход представления стоит O(n), поэтому для небольшого набора кандидатов выгоднее их сортировка
+            if view is not None and (candidate_ids is None or len(candidate_ids) * 8 > len(view)):
+                return self._execute_with_view(query, view, direction == "desc", candidate_ids)
+
+        if candidate_ids is None:
+            # Словарь задач обходится в порядке добавления, то есть в порядке ID
+            tasks = [task for task in self.tasks.values() if query.matches(task)]
+            ordered = True
+        else:
+            tasks = [task for task in map(self.tasks.__getitem__, candidate_ids) if query.matches(task)]
+        total = len(tasks)
+
+        key = query.sort_key()
+        if query.after is not None:
+            after_key = query.after_key()
+            position_key = key or (lambda task: (task.id,))
+            tasks = [task for task in tasks if after_key < position_key(task)]
+        if key is None and not ordered:
+            key = SORT_KEYS["id"]
+
+        end = None if query.limit is None else query.offset + query.limit
+        if key is not None:
+            if end is not None and end < len(tasks):
+                page = heapq.nsmallest(end, tasks, key=key)[query.offset:]
+            else:
+                page = sorted(tasks, key=key)[query.offset:end]
+        else:
+            page = tasks[query.offset:end]
+        return QueryResult(tuple(page), total, query.offset, query.limit)
+
+    def _execute_with_view(
+            self, query: TaskQuery, view: SortedView, descending: bool, candidate_ids: list[int] | None
+    ) -> QueryResult:
+        """
+        Выполняет запрос с сортировкой по одному столбцу, обходя поддерживаемое представление столбца
+
+        :param query: Описание запроса
+        :param view: Упорядоченное представление столбца сортировки
+        :param descending: Порядок по убыванию
+        :param candidate_ids: ID задач-кандидатов или None, если подходят все задачи
+        :return: Результат запроса
+        """
+        end = None if query.limit is None else query.offset + query.limit
+
+        if candidate_ids is None and not query.filters and query.due_from is None and query.due_to is None:
+            task_ids = view.ids(descending, after=query.after)
+            page = [self.tasks[task_id] for task_id in islice(task_ids, query.offset, end)]
+            return QueryResult(tuple(page), len(self.tasks), query.offset, query.limit)
+
+        # Общее количество считается по всем подходящим задачам, а страница — по задачам после курсора
+        after_key = query.after_key()
+        key = query.sort_key()
+        candidates = None if candidate_ids is None else set(candidate_ids)
+        page = []
+        total = 0
+        position = 0
+        for task_id in view.ids(descending):
+            if candidates is not None and task_id not in candidates:
+                continue
+            task = self.tasks[task_id]
+            if not query.matches(task):
+                continue
+            total += 1
+            if after_key is not None:
+                if not after_key < key(task):
+                    continue
+                after_key = None
+            if position >= query.offset and (end is None or position < end):
+                page.append(task)
+            position += 1
+        return QueryResult(tuple(page), total, query.offset, query.limit)
+
+    def _candidates(self, query: TaskQuery) -> tuple[list[int] | None, bool]:
+        """
+        Выбирает ID задач-кандидатов по индексам
+
+        :param query: Описание запроса
+        :return: Список ID (или None, если нужно просмотреть все задачи) и признак того, что порядок
+            кандидатов уже является порядком результата без сортировки
+        """
+        if query.search is not None:
+            text_index: TextIndex | None = self.indexes.get("text")
+            if text_index is not None:
+                task_ids = text_index.search(query.search)
+                if task_ids is not None:
+                    return task_ids, True
+
+        best: list[int] | None = None
+        for field, value in query.filters.items():
+            index: FieldIndex | None = self.indexes.get(field)
+            if not isinstance(index, FieldIndex):
+                continue
+            values = dict.fromkeys(value) if isinstance(value, (list, tuple, set, frozenset)) else (value,)
+            if best is not None and sum(index.count(item) for item in values) >= len(best):
+                continue
+            best = [task_id for item in values for task_id in index.get(item)]
+
+        due_index: DueDateIndex | None = self.indexes.get("due_date")
+        if due_index is not None and (query.due_from is not None or query.due_to is not None):
+            due_to = None if query.due_to is None else date.fromordinal(query.due_to.toordinal() + 1)
+            if best is None or due_index.count(query.due_from, due_to) < len(best):
+                best = due_index.range(query.due_from, due_to)
+
+        return best, False
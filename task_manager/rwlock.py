@@ -0,0 +1,141 @@
+"""Модуль для блокировки чтения-записи между потоками"""
+
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """
+    Блокировка чтения-записи для потоков одного процесса
+
+    Читать могут несколько потоков одновременно, изменять — только один, и пока он держит блокировку записи,
+    никто не читает. Чтения и записи чередуются: ожидающий писатель пропускается вперед новых читателей,
+    а читатели, дождавшиеся окончания записи, входят раньше следующего писателя. Писатели получают
+    блокировку в порядке очереди. Поэтому ни непрерывный поток чтений, ни непрерывный поток записей
+    не откладывает другие потоки бесконечно.
+
+    Блокировка реентерабельна: писатель может повторно захватить запись и чтение, читатель — чтение
+    (даже если уже ждет писатель). Захват записи читателем не поддерживается: два потока, повышающие
+    чтение до записи, ждали бы друг друга бесконечно.
+
+    Используется через контекстные менеджеры: `with lock.read(): ...`, `with lock.write(): ...`
+    """
+
+    def __init__(self) -> None:
+        """Инициализация свободной блокировки"""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers: dict[int, int] = {}
+        self._writer: int | None = None
+        self._write_depth = 0
+        self._write_queue: deque[int] = deque()
+        self._readers_waiting = 0
+        # Сколько ожидающих читателей входит после окончания записи раньше следующего писателя
+        self._readers_admitted = 0
+
+    def acquire_read(self) -> None:
+        """
+        Захватывает блокировку чтения, ожидая завершения записи
+        """
+        thread_id = threading.get_ident()
+        with self._condition:
+            if self._writer != thread_id and thread_id not in self._readers:
+                self._readers_waiting += 1
+                try:
+                    while self._writer is not None or (self._write_queue and not self._readers_admitted):
+                        self._condition.wait()
+                except BaseException:
+                    # Писатели не должны ждать читателя, который больше не войдет
+                    self._readers_waiting -= 1
+                    self._readers_admitted = min(self._readers_admitted, self._readers_waiting)
+                    self._condition.notify_all()
+                    raise
+                self._readers_waiting -= 1
+                if self._readers_admitted:
+                    self._readers_admitted -= 1
+            self._readers[thread_id] = self._readers.get(thread_id, 0) + 1
+
+    def release_read(self) -> None:
+        """
+        Освобождает блокировку чтения
+
+        :raises RuntimeError: Если текущий поток не удерживает блокировку чтения
+        """
+        thread_id = threading.get_ident()
+        with self._condition:
+            depth = self._readers.get(thread_id)
+            if not depth:
+                raise RuntimeError("Блокировка чтения не захвачена")
+            if depth > 1:
+                self._readers[thread_id] = depth - 1
+                return
+            del self._readers[thread_id]
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """
+        Захватывает блокировку записи, ожидая завершения чтения и записи в других потоках
+
+        :raises RuntimeError: Если текущий поток удерживает только блокировку чтения
+        """
+        thread_id = threading.get_ident()
+        with self._condition:
+            if self._writer == thread_id:
+                self._write_depth += 1
+                return
+            if thread_id in self._readers:
+                raise RuntimeError("Нельзя захватить блокировку записи, удерживая блокировку чтения")
+            self._write_queue.append(thread_id)
+            try:
+                while (
+                        self._write_queue[0] != thread_id or self._writer is not None
+                        or self._readers or self._readers_admitted
+                ):
+                    self._condition.wait()
+            except BaseException:
+                # Читатели и писатели, пропускавшие этого писателя вперед, больше не должны его ждать
+                self._write_queue.remove(thread_id)
+                self._condition.notify_all()
+                raise
+            self._write_queue.popleft()
+            self._writer = thread_id
+            self._write_depth = 1
+
+    def release_write(self) -> None:
+        """
+        Освобождает блокировку записи
+
+        :raises RuntimeError: Если текущий поток не удерживает блокировку записи
+        """
+        with self._condition:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("Блокировка записи не захвачена")
+            self._write_depth -= 1
+            if self._write_depth == 0:
+                self._writer = None
+                self._readers_admitted = self._readers_waiting
+                self._condition.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """
+        Блокировка чтения на время блока `with`
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """
+        Блокировка записи на время блока `with`
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
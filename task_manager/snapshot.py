@@ -0,0 +1,349 @@
+"""Модуль для хранения задач в бинарном формате снимка с ленивой загрузкой"""
+
+import bisect
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator, MutableMapping
+from datetime import date, datetime
+
+from .storage import Storage
+from .task import Task
+from .task_table import CATEGORY_CODES, PRIORITY_CODES, STATUS_CODES
+
+# Формат файла снимка:
+#   заголовок: сигнатура, версия формата, количество записей, смещение кучи строк,
+#   максимальный ID, когда-либо выданный в хранилище;
+#   таблица записей фиксированной длины, отсортированная по ID задачи;
+#   куча строк в UTF-8, на которую ссылаются записи (смещение и длина).
+SNAPSHOT_MAGIC = b"TSKS"
+SNAPSHOT_VERSION = 2
+HEADER = struct.Struct("<4sHxxIQq")
+# Заголовок версии 1, без максимального ID. Такие снимки по-прежнему читаются
+HEADER_V1 = struct.Struct("<4sHxxIQ")
+# ID, смещение и длина заголовка, смещение и длина описания, срок и дата создания (порядковые номера дней),
+# коды приоритета, категории и статуса
+RECORD = struct.Struct("<qQIQIiibbbx")
+
+
+def encode_snapshot(tasks: Iterable[Task], max_id: int = 0) -> bytes:
+    """
+    Кодирует задачи в бинарный снимок
+
+    :param tasks: Задачи с назначенными ID
+    :param max_id: Максимальный ID, когда-либо выданный в хранилище. Не меньше наибольшего ID задач
+    :return: Содержимое снимка
+    :raises ValueError: Если у задачи нет ID или значение перечислимого поля неизвестно
+    """
+    tasks = sorted(tasks, key=lambda task: task.id)
+    records = bytearray()
+    heap = bytearray()
+
+    for task in tasks:
+        if task.id is None:
+            raise ValueError("У задачи нет ID")
+        try:
+            codes = PRIORITY_CODES[task.priority], CATEGORY_CODES[task.category], STATUS_CODES[task.status]
+        except KeyError as e:
+            raise ValueError(f"Недопустимое значение поля задачи: {e}")
+
+        title = task.title.encode("utf-8")
+        description = task.description.encode("utf-8")
+        records += RECORD.pack(
+            task.id, len(heap), len(title), len(heap) + len(title), len(description),
+            task.due_date.toordinal(), task.created_at.toordinal(), *codes
+        )
+        heap += title
+        heap += description
+
+    max_id = max(max_id, tasks[-1].id if tasks else 0)
+    header = HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(tasks), HEADER.size + len(records), max_id)
+    return header + records + heap
+
+
+class SnapshotReader:
+    """
+    Класс для чтения бинарного снимка без его полного разбора
+
+    При открытии читается только заголовок, каждая задача декодируется при обращении к ней.
+    Записи отсортированы по ID, поэтому поиск задачи по ID выполняется двоичным поиском.
+    """
+
+    def __init__(self, buffer: bytes | mmap.mmap) -> None:
+        """
+        Инициализация чтения снимка
+
+        :param buffer: Содержимое снимка (байты или отображенный в память файл)
+        :raises ValueError: Если формат снимка не поддерживается
+        """
+        magic, version = struct.unpack_from("<4sH", buffer, 0)
+        if magic != SNAPSHOT_MAGIC or version not in (1, SNAPSHOT_VERSION):
+            raise ValueError("Неподдерживаемый формат снимка задач")
+        self.buffer = buffer
+        if version == 1:
+            _, _, self.count, self.heap_offset = HEADER_V1.unpack_from(buffer, 0)
+            self.records_offset = HEADER_V1.size
+            self.max_id = self.task_id(self.count - 1) if self.count else 0
+        else:
+            _, _, self.count, self.heap_offset, self.max_id = HEADER.unpack_from(buffer, 0)
+            self.records_offset = HEADER.size
+
+    @classmethod
+    def open(cls, file_path: str) -> 'SnapshotReader':
+        """
+        Отображает файл снимка в память
+
+        :param file_path: Путь к файлу снимка
+        :return: Объект для чтения снимка
+        """
+        with open(file_path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        """
+        Количество задач в снимке
+
+        :return: Количество записей
+        """
+        return self.count
+
+    def __getitem__(self, row: int) -> Task:
+        """
+        Декодирует задачу из записи
+
+        :param row: Номер записи
+        :return: Объект задачи
+        """
+        (task_id, title_offset, title_length, description_offset, description_length,
+         due_date, created_at, priority, category, status) = RECORD.unpack_from(self.buffer, self._offset(row))
+        heap = self.heap_offset
+        return Task(
+            title=self.buffer[heap + title_offset:heap + title_offset + title_length].decode("utf-8"),
+            description=self.buffer[
+                heap + description_offset:heap + description_offset + description_length
+            ].decode("utf-8"),
+            due_date=date.fromordinal(due_date),
+            priority=Task.ALL_PRIORITIES[priority],
+            category=Task.ALL_CATEGORIES[category],
+            status=Task.ALL_STATUSES[status],
+            created_at=date.fromordinal(created_at),
+            task_id=task_id
+        )
+
+    def task_id(self, row: int) -> int:
+        """
+        Читает только ID задачи из записи
+
+        :param row: Номер записи
+        :return: ID задачи
+        """
+        return struct.unpack_from("<q", self.buffer, self._offset(row))[0]
+
+    def find(self, task_id: int) -> int:
+        """
+        Ищет запись по ID задачи
+
+        :param task_id: ID задачи
+        :return: Номер записи или -1, если задачи нет в снимке
+        """
+        row = bisect.bisect_left(range(self.count), task_id, key=self.task_id)
+        if row < self.count and self.task_id(row) == task_id:
+            return row
+        return -1
+
+    def _offset(self, row: int) -> int:
+        """
+        Возвращает смещение записи в буфере
+
+        :param row: Номер записи
+        :return: Смещение в байтах
+        :raises IndexError: Если номер записи вне диапазона
+        """
+        if not 0 <= row < self.count:
+            raise IndexError("Номер записи снимка вне диапазона")
+        return self.records_offset + row * RECORD.size
+
+
+class LazyTaskMap(MutableMapping):
+    """
+    Словарь задач по ID поверх снимка
+
+    Задачи из снимка декодируются при первом обращении и кэшируются. Изменения хранятся
+    поверх снимка: измененные задачи — в кэше, новые — в отдельном словаре, удаленные ID — в множестве.
+    Порядок обхода: задачи снимка по возрастанию ID, затем новые задачи в порядке добавления.
+    """
+
+    def __init__(self, reader: SnapshotReader | None = None) -> None:
+        """
+        Инициализация словаря
+
+        :param reader: Снимок задач. По умолчанию пустой
+        """
+        self._reader = reader
+        self._cache: dict[int, Task] = {}
+        self._added: dict[int, Task] = {}
+        self._deleted: set[int] = set()
+
+    def _in_snapshot(self, task_id: int) -> bool:
+        """
+        Проверяет, есть ли задача в снимке (без учета удалений)
+
+        :param task_id: ID задачи
+        :return: True, если задача есть в снимке
+        """
+        if task_id in self._cache:
+            return True
+        return self._reader is not None and self._reader.find(task_id) >= 0
+
+    def __getitem__(self, task_id: int) -> Task:
+        if task_id in self._added:
+            return self._added[task_id]
+        if task_id in self._deleted:
+            raise KeyError(task_id)
+        if task_id not in self._cache:
+            row = self._reader.find(task_id) if self._reader is not None else -1
+            if row < 0:
+                raise KeyError(task_id)
+            self._cache[task_id] = self._reader[row]
+        return self._cache[task_id]
+
+    def __setitem__(self, task_id: int, task: Task) -> None:
+        if task_id not in self._added and self._in_snapshot(task_id):
+            self._deleted.discard(task_id)
+            self._cache[task_id] = task
+        else:
+            self._added[task_id] = task
+
+    def __delitem__(self, task_id: int) -> None:
+        if task_id in self._added:
+            del self._added[task_id]
+        elif task_id not in self._deleted and self._in_snapshot(task_id):
+            self._deleted.add(task_id)
+            self._cache.pop(task_id, None)
+        else:
+            raise KeyError(task_id)
+
+    def __contains__(self, task_id: object) -> bool:
+        if task_id in self._added:
+            return True
+        return task_id not in self._deleted and isinstance(task_id, int) and self._in_snapshot(task_id)
+
+    def __iter__(self) -> Iterator[int]:
+        if self._reader is not None:
+            for row in range(len(self._reader)):
+                task_id = self._reader.task_id(row)
+                if task_id not in self._deleted:
+                    yield task_id
+        yield from self._added
+
+    def __len__(self) -> int:
+        base = len(self._reader) if self._reader is not None else 0
+        return base - len(self._deleted) + len(self._added)
+
+    def items(self) -> Iterator[tuple[int, Task]]:
+        """
+        Перебирает пары (ID, задача) без поиска каждой задачи в снимке
+
+        :return: Итератор по парам
+        """
+        if self._reader is not None:
+            for row in range(len(self._reader)):
+                task_id = self._reader.task_id(row)
+                if task_id in self._deleted:
+                    continue
+                if task_id not in self._cache:
+                    self._cache[task_id] = self._reader[row]
+                yield task_id, self._cache[task_id]
+        yield from self._added.items()
+
+    def values(self) -> Iterator[Task]:
+        """
+        Перебирает задачи в порядке обхода словаря
+
+        :return: Итератор по задачам
+        """
+        for _, task in self.items():
+            yield task
+
+    def copy(self) -> 'LazyTaskMap':
+        """
+        Возвращает копию словаря без декодирования задач снимка
+
+        :return: Копия словаря
+        """
+        task_map = LazyTaskMap(self._reader)
+        task_map._cache = dict(self._cache)
+        task_map._added = dict(self._added)
+        task_map._deleted = set(self._deleted)
+        return task_map
+
+
+class SnapshotStorage(Storage):
+    """
+    Хранилище задач в бинарном формате снимка
+
+    Снимок отображается в память, и задачи декодируются только при обращении к ним, поэтому время
+    запуска не зависит от количества задач. Изменения всегда пишутся в журнал (см. `Storage`),
+    а при сжатии журнала записывается новый снимок. JSON используется только для импорта и экспорта.
+    """
+
+    lazy_loading = True
+
+    def __init__(self, file_path: str = "data/tasks.bin", journal: bool = True, compact_threshold: int = 1000) -> None:
+        """
+        Инициализация хранилища
+
+        :param file_path: Путь к файлу снимка. По умолчанию "data/tasks.bin"
+        :param journal: Не используется, журнал включен всегда
+        :param compact_threshold: Количество записей журнала, после которого записывается новый снимок
+        """
+        super().__init__(file_path, journal=True, compact_threshold=compact_threshold)
+        self.journal_path = f"{file_path}.journal"
+
+    def load_task_map(self) -> LazyTaskMap:
+        """
+        Открывает снимок и применяет к нему журнал изменений
+
+        :return: Словарь задач по ID с ленивым декодированием
+        """
+        reader = None
+        if os.path.exists(self.file_path) and os.path.getsize(self.file_path) > 0:
+            reader = SnapshotReader.open(self.file_path)
+        task_map = LazyTaskMap(reader)
+        self._max_id = reader.max_id if reader is not None else 0
+        self._apply_journal(task_map)
+        return task_map
+
+    def load_tasks(self) -> list[Task]:
+        """
+        Загружает и декодирует все задачи
+
+        :return: Список задач
+        """
+        return list(self.load_task_map().values())
+
+    def save_tasks(self, tasks: Iterable[Task]) -> None:
+        """
+        Записывает новый снимок через временный файл и очищает журнал
+
+        :param tasks: Задачи с назначенными ID
+        """
+        tasks = list(tasks)
+        self._max_id = max([self._max_id] + [task.id for task in tasks if task.id is not None])
+        data = encode_snapshot(tasks, self._max_id)
+        self._replace_file(self.file_path, data)
+        self._truncate_journal()
+        self._create_backup(data)
+
+    def restore_backup(self, point: datetime | None = None) -> list[Task]:
+        """
+        Восстанавливает задачи из резервной копии снимка
+
+        :param point: Момент времени, на который нужно восстановить данные. По умолчанию последняя копия
+        :return: Восстановленный список задач
+        :raises LookupError: Если подходящей копии нет
+        """
+        reader = SnapshotReader(self.backups.restore(point))
+        tasks = [reader[row] for row in range(len(reader))]
+        self.save_tasks(tasks)
+        return tasks
@@ -0,0 +1,236 @@
+"""Модуль для хранения задач в базе данных SQLite"""
+
+import json
+import os
+import sqlite3
+from collections.abc import Iterable
+from datetime import date, datetime
+
+from .backup import BackupManager
+from .file_lock import FileLock
+from .storage import Storage, backup_dir_for
+from .task import Task
+
+
+class SQLiteStorage(Storage):
+    """
+    Хранилище задач в локальной базе данных SQLite
+
+    Первичный ключ таблицы совпадает с постоянным ID задачи, задачи загружаются в порядке ID.
+    """
+
+    incremental_writes = True
+    transactional_imports = True
+
+    def __init__(
+            self, file_path: str = "data/tasks.db", journal: bool = False, compact_threshold: int = 1000
+    ) -> None:
+        """
+        Инициализация хранилища
+
+        :param file_path: Путь к файлу базы данных. По умолчанию "data/tasks.db"
+        :param journal: Не используется, SQLite ведет собственный журнал (WAL)
+        :param compact_threshold: Не используется
+        """
+        self.file_path = file_path
+        self.backup_dir = backup_dir_for(file_path)
+        self.journal = False
+        self.backups = BackupManager(self.backup_dir)
+        self.lock = FileLock(f"{file_path}.lock")
+
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """
+        Создает таблицы, если их еще нет
+
+        Запросы выполняются по индексам `TaskManager` в памяти, поэтому индексы по столбцам, созданные
+        прежними версиями, удаляются: они только замедляют запись.
+        """
+        with self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    due_date TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+                """
+            )
+            # Служебные значения хранилища, например максимальный выданный ID (см. `max_id`)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            for column in ("status", "category", "priority", "due_date"):
+                self.connection.execute(f"DROP INDEX IF EXISTS idx_tasks_{column}")
+
+    @staticmethod
+    def _task_to_row(task: Task) -> tuple:
+        """
+        Преобразует задачу в строку таблицы
+
+        :param task: Объект задачи
+        :return: Кортеж значений для вставки
+        """
+        return (
+            task.id, task.title, task.description, task.due_date.isoformat(),
+            task.priority, task.category, task.status, task.created_at.isoformat()
+        )
+
+    @staticmethod
+    def _row_to_task(row: tuple) -> Task:
+        """
+        Преобразует строку таблицы в задачу
+
+        :param row: Кортеж (id, title, description, due_date, priority, category, status, created_at)
+        :return: Объект задачи
+        """
+        task_id, title, description, due_date, priority, category, status, created_at = row
+        return Task(
+            title=title,
+            description=description,
+            due_date=date.fromisoformat(due_date),
+            priority=priority,
+            category=category,
+            status=status,
+            created_at=datetime.fromisoformat(created_at).date(),
+            task_id=task_id
+        )
+
+    def load_tasks(self) -> list[Task]:
+        """
+        Загружает задачи из базы данных
+
+        :return: Список задач
+        """
+        rows = self.connection.execute(
+            "SELECT id, title, description, due_date, priority, category, status, created_at "
+            "FROM tasks ORDER BY id"
+        )
+        return [self._row_to_task(row) for row in rows]
+
+    def max_id(self) -> int:
+        """
+        Возвращает максимальный ID, когда-либо сохраненный в базе данных
+
+        Хранится в таблице `meta` и не уменьшается при удалении задач. Для баз данных, созданных
+        до появления таблицы `meta`, берется наибольший ID задач.
+
+        :return: Максимальный ID или 0
+        """
+        (max_id,) = self.connection.execute(
+            "SELECT MAX(COALESCE((SELECT value FROM meta WHERE key = 'max_id'), 0), "
+            "COALESCE((SELECT MAX(id) FROM tasks), 0))"
+        ).fetchone()
+        return max_id
+
+    def save_tasks(self, tasks: Iterable[Task]) -> None:
+        """
+        Полностью перезаписывает задачи в базе данных одной транзакцией
+
+        :param tasks: Задачи для сохранения
+        """
+        tasks = list(tasks)
+        with self.connection:
+            self.connection.execute("DELETE FROM tasks")
+            self._insert_tasks(tasks)
+        self._create_backup(tasks)
+
+    def write_changes(self, tasks: Iterable[Task] | None, changes: list[tuple[str, int, Task | None]]) -> None:
+        """
+        Применяет изменения к базе данных одной транзакцией
+
+        :param tasks: Актуальные задачи (не используется)
+        :param changes: Изменения в виде кортежей (операция, ID задачи, задача)
+        """
+        with self.connection:
+            for op, task_id, task in changes:
+                if op == "add":
+                    self._insert_tasks([task])
+                elif op == "edit":
+                    self._update_task(task_id, task)
+                elif op == "delete":
+                    self._delete_task(task_id)
+
+    def compact(self, tasks: Iterable[Task]) -> None:
+        """
+        Сжимает файл базы данных
+
+        :param tasks: Актуальные задачи (не используется)
+        """
+        self.connection.execute("VACUUM")
+
+    def _insert_tasks(self, tasks: list[Task]) -> None:
+        """
+        Вставляет задачи с уже назначенными ID
+
+        :param tasks: Список задач
+        """
+        if not tasks:
+            return
+        self.connection.executemany(
+            "INSERT INTO tasks (id, title, description, due_date, priority, category, status, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (self._task_to_row(task) for task in tasks)
+        )
+        self.connection.execute(
+            "INSERT INTO meta (key, value) VALUES ('max_id', ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)",
+            (max(task.id for task in tasks),)
+        )
+
+    def _update_task(self, task_id: int, task: Task) -> None:
+        """
+        Обновляет задачу по ID
+
+        :param task_id: ID задачи
+        :param task: Обновленный объект задачи
+        :raises IndexError: Если ID задачи недопустим
+        """
+        cursor = self.connection.execute(
+            "UPDATE tasks SET title = ?, description = ?, due_date = ?, priority = ?, category = ?, status = ? "
+            "WHERE id = ?",
+            (task.title, task.description, task.due_date.isoformat(),
+             task.priority, task.category, task.status, task_id)
+        )
+        if cursor.rowcount == 0:
+            raise IndexError("Недопустимый ID задачи")
+
+    def _delete_task(self, task_id: int) -> None:
+        """
+        Удаляет задачу по ID
+
+        :param task_id: ID задачи
+        :raises IndexError: Если ID задачи недопустим
+        """
+        cursor = self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        if cursor.rowcount == 0:
+            raise IndexError("Недопустимый ID задачи")
+
+    def _watched_paths(self) -> list[str]:
+        """
+        Файл базы данных и журнал WAL, в который SQLite записывает изменения
+
+        :return: Список путей
+        """
+        return [self.file_path, f"{self.file_path}-wal"]
+
+    def _create_backup(self, tasks: list[Task]) -> None:
+        """
+        Создает резервную копию задач в формате JSON через `BackupManager`
+
+        Копии имеют тот же формат, что и у `Storage`, поэтому восстанавливаются через `restore_backup`.
+
+        :param tasks: Сохраненный список задач
+        """
+        data = json.dumps([task.to_dict() for task in tasks], indent=4)
+        self.backups.backup(data.encode())
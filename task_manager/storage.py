@@ -1,120 +1,348 @@
 """Модуль для работы с хранилищем задач"""
 
-import csv
 import json
 import os
+from collections.abc import Iterable, MutableMapping
 from datetime import datetime
 
+from .backup import BackupManager
+from .file_lock import FileLock
 from .task import Task
 
+# Путь к хранилищу по умолчанию, можно переопределить переменной окружения TASKS_STORAGE
+DEFAULT_FILE_PATH = os.environ.get("TASKS_STORAGE", "data/tasks.json")
+
+# Расширения файлов, для которых используется SQLite-хранилище
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# Расширения файлов, для которых используется хранилище в бинарном формате снимка
+SNAPSHOT_EXTENSIONS = (".bin",)
+
+# Расширения директорий, для которых используется хранилище, разбитое на разделы
+PARTITIONED_EXTENSIONS = (".parts",)
+
+
+def backup_dir_for(file_path: str) -> str:
+    """
+    Возвращает директорию резервных копий хранилища
+
+    У каждого хранилища своя история копий рядом с его файлом: для "data/tasks.json" это
+    "data/backup/tasks.json", поэтому хранилища в одной директории не смешивают копии друг друга.
+
+    :param file_path: Путь к файлу или директории хранилища
+    :return: Путь к директории резервных копий
+    """
+    path = os.path.normpath(file_path)
+    return os.path.join(os.path.dirname(path), "backup", os.path.basename(path))
+
 
 class Storage:
     """Класс для работы с хранилищем задач"""
 
-    def __init__(self, file_path: str = "data/tasks.json") -> None:
+    # Загружает ли хранилище задачи лениво (см. `SnapshotStorage.load_task_map`)
+    lazy_loading = False
+
+    # Разбито ли хранилище на разделы, загружаемые по отдельности (см. `PartitionedStorage`)
+    partitioned = False
+
+    # Сохраняется ли импорт одной транзакцией хранилища, даже если оно пишет только изменения
+    # (см. `TaskManager._import_transaction`)
+    transactional_imports = False
+
+    def __new__(cls, file_path: str = DEFAULT_FILE_PATH, *args, **kwargs) -> 'Storage':
+        """
+        Выбирает реализацию хранилища по расширению файла
+
+        Для путей с расширением из `SQLITE_EXTENSIONS` создается `SQLiteStorage`,
+        для путей с расширением из `SNAPSHOT_EXTENSIONS` — `SnapshotStorage`,
+        для путей с расширением из `PARTITIONED_EXTENSIONS` — `PartitionedStorage`.
+        """
+        if cls is Storage and file_path.lower().endswith(SQLITE_EXTENSIONS):
+            from .sqlite_storage import SQLiteStorage
+            cls = SQLiteStorage
+        elif cls is Storage and file_path.lower().endswith(SNAPSHOT_EXTENSIONS):
+            from .snapshot import SnapshotStorage
+            cls = SnapshotStorage
+        elif cls is Storage and file_path.lower().endswith(PARTITIONED_EXTENSIONS):
+            from .partitioned_storage import PartitionedStorage
+            cls = PartitionedStorage
+        return super().__new__(cls)
+
+    def __init__(
+            self, file_path: str = DEFAULT_FILE_PATH, journal: bool = False, compact_threshold: int = 1000
+    ) -> None:
         """
         Инициализация хранилища
 
-        :param file_path: Путь к файлу с задачами. По умолчанию "data/tasks.json"
+        В режиме журнала изменения не перезаписывают весь файл, а дописываются короткими записями
+        в файл журнала рядом с основным файлом. При загрузке журнал применяется поверх снимка,
+        а после `compact_threshold` записей сворачивается в новый снимок.
+
+        Для работы нескольких процессов с одним хранилищем используются `lock` (межпроцессная блокировка
+        файла "<путь>.lock") и `change_token` (признак изменения файлов хранилища).
+
+        :param file_path: Путь к файлу с задачами. По умолчанию `DEFAULT_FILE_PATH`
+        :param journal: Включить режим журнала. По умолчанию выключен
+        :param compact_threshold: Количество записей журнала, после которого выполняется сжатие
         """
         self.file_path = file_path
-        self.backup_dir = "data/backup"
-        os.makedirs(self.backup_dir, exist_ok=True)
+        self.backup_dir = backup_dir_for(file_path)
+        self.journal = journal
+        self.journal_path = f"{os.path.splitext(file_path)[0]}.journal"
+        self.compact_threshold = compact_threshold
+        self._journal_records = 0
+        self._max_id = 0
+        self.backups = BackupManager(self.backup_dir)
+        self.lock = FileLock(f"{file_path}.lock")
+
+    @property
+    def incremental_writes(self) -> bool:
+        """
+        Записывает ли хранилище только изменения, а не весь список задач
+
+        :return: True в режиме журнала
+        """
+        return self.journal
 
     def load_tasks(self) -> list[Task]:
         """
-        Загружает задачи из JSON-файла
+        Загружает задачи из JSON-файла и применяет к ним журнал изменений
 
         :return: Список задач
         """
+        tasks = []
+        self._max_id = 0
         if os.path.exists(self.file_path):
-            with open(self.file_path, "r") as file:
-                tasks_data = json.load(file)
-                return [Task.from_dict(task_data) for task_data in tasks_data]
-        return []
+            with open(self.file_path, "rb") as file:
+                tasks, self._max_id = self._decode_tasks(file.read())
+        if self.journal:
+            tasks = self._replay_journal(tasks)
+        return tasks
 
-    def save_tasks(self, tasks: list[Task]) -> None:
+    def save_tasks(self, tasks: Iterable[Task]) -> None:
         """
         Сохраняет задачи в JSON-файл
 
+        Вместе с задачами сохраняется максимальный выданный ID (см. `max_id`).
+        Полный снимок включает все изменения из журнала, поэтому журнал после сохранения очищается.
+
         :param tasks: Список задач для сохранения
         """
-        with open(self.file_path, "w") as file:
-            tasks_data = [task.to_dict() for task in tasks]
-            json.dump(tasks_data, file, indent=4)
-        self._create_backup()
+        tasks = list(tasks)
+        self._max_id = max([self._max_id] + [task.id for task in tasks if task.id is not None])
+        document = {"max_id": self._max_id, "tasks": [task.to_dict() for task in tasks]}
+        data = json.dumps(document, indent=4).encode()
+        self._replace_file(self.file_path, data)
+        self._truncate_journal()
+        self._create_backup(data)
+
+    def max_id(self) -> int:
+        """
+        Возвращает максимальный ID, когда-либо сохраненный в хранилище
+
+        Значение не уменьшается при удалении задачи с наибольшим ID, поэтому ее ID не выдается повторно
+        и после перезапуска. Актуально после `load_tasks`.
+
+        :return: Максимальный ID или 0
+        """
+        return self._max_id
 
-    def edit_task(self, task_id: int, updated_task: Task) -> None:
+    @property
+    def needs_compaction(self) -> bool:
         """
-        Редактирует задачу по ID
+        Превысил ли журнал порог `compact_threshold`
 
-        :param task_id: ID задачи для редактирования
-        :param updated_task: Обновленный объект задачи
-        :raises IndexError: Если ID задачи недопустим
+        :return: True, если журнал пора свернуть в снимок через `compact`
         """
-        tasks = self.load_tasks()
+        return self.journal and self._journal_records >= self.compact_threshold
 
-        if 0 <= task_id < len(tasks):
-            tasks[task_id] = updated_task
+    def write_changes(self, tasks: Iterable[Task] | None, changes: list[tuple[str, int, Task | None]]) -> None:
+        """
+        Сохраняет изменения задач
+
+        Без журнала весь список перезаписывается через `save_tasks`. В режиме журнала изменения
+        дописываются в конец журнала, а при превышении порога журнал сворачивается в снимок.
+
+        :param tasks: Актуальные задачи (после применения изменений). Для хранилищ с `incremental_writes`
+            можно передать None, тогда журнал не сворачивается автоматически и вызывающий сам проверяет
+            `needs_compaction`
+        :param changes: Изменения в виде кортежей (операция, ID задачи, задача).
+            Операции: "add", "edit", "delete". Для "delete" задача равна None
+        """
+        self._max_id = max([self._max_id] + [task_id for _, task_id, _ in changes])
+        if not self.journal:
             self.save_tasks(tasks)
-        else:
-            raise IndexError("Недопустимый ID задачи")
+            return
+
+        lines = []
+        for op, task_id, task in changes:
+            record = {"op": op, "id": task_id}
+            if task is not None:
+                record["task"] = task.to_dict()
+            lines.append(json.dumps(record) + "\n")
+
+        with open(self.journal_path, "a") as journal:
+            journal.writelines(lines)
+            journal.flush()
+            os.fsync(journal.fileno())
+        self._journal_records += len(lines)
+
+        if tasks is not None and self.needs_compaction:
+            self.compact(tasks)
+
+    def change_token(self) -> tuple:
+        """
+        Возвращает признак текущего состояния файлов хранилища
+
+        Признак составляется из времени изменения, размера и inode файлов (см. `_watched_paths`)
+        и меняется при каждой записи, в том числе другим процессом. Стоит одного `os.stat` на файл.
 
-    def import_from_json(self, file_path: str) -> None:
+        :return: Кортеж, который можно сравнивать с ранее полученным
         """
-        Импортирует задачи из JSON-файла
+        token = []
+        for path in self._watched_paths():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                token.append(None)
+            else:
+                token.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        return tuple(token)
 
-        :param file_path: Путь к JSON-файлу с задачами
-        :raises Exception: Если произошла ошибка при импорте
+    def reopen(self) -> None:
         """
-        try:
-            existing_tasks = self.load_tasks()
+        Сбрасывает сведения о хранилище, прочитанные из его файлов ранее
 
-            with open(file_path, "r") as file:
-                tasks_data = json.load(file)
-                new_tasks = [Task.from_dict(task_data) for task_data in tasks_data]
+        Вызывается перед повторной загрузкой задач, если хранилище изменено другим процессом.
+        """
 
-            combined_tasks = existing_tasks + new_tasks
-            self.save_tasks(combined_tasks)
-        except Exception as e:
-            raise Exception(f"Ошибка при импорте из JSON: {e}")
+    def restore_backup(self, point: datetime | None = None) -> list[Task]:
+        """
+        Восстанавливает задачи из резервной копии
 
-    def import_from_csv(self, file_path: str) -> None:
+        :param point: Момент времени, на который нужно восстановить данные. По умолчанию последняя копия
+        :return: Восстановленный список задач
+        :raises LookupError: Если подходящей копии нет
         """
-        Импортирует задачи из CSV-файла
+        tasks, _ = self._decode_tasks(self.backups.restore(point))
+        self.save_tasks(tasks)
+        return tasks
 
-        :param file_path: Путь к CSV-файлу с задачами
-        :raises Exception: Если произошла ошибка при импорте
+    def compact(self, tasks: Iterable[Task]) -> None:
         """
-        try:
-            existing_tasks = self.load_tasks()
+        Сворачивает журнал в новый снимок
 
-            new_tasks = []
-            with open(file_path, "r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    task = Task(
-                        title=row["Title"],
-                        description=row["Description"],
-                        due_date=datetime.fromisoformat(row["Due Date"]),
-                        priority=row["Priority"],
-                        category=row["Category"],
-                        status=row["Status"]
-                    )
-                    new_tasks.append(task)
+        :param tasks: Актуальные задачи
+        """
+        self.save_tasks(tasks)
 
-            combined_tasks = existing_tasks + new_tasks
-            self.save_tasks(combined_tasks)
-        except Exception as e:
-            raise Exception(f"Ошибка при импорте из CSV: {e}")
+    def _replay_journal(self, tasks: list[Task]) -> list[Task]:
+        """
+        Применяет записи журнала к списку задач
 
-    def _create_backup(self) -> None:
+        :param tasks: Список задач из снимка
+        :return: Список задач с примененными изменениями
         """
-        Создает резервную копию данных, сохраняется в директорию `backup_dir`
+        tasks_by_id = {task.id: task for task in tasks}
+        if not self._apply_journal(tasks_by_id):
+            return tasks
+        return list(tasks_by_id.values())
+
+    def _apply_journal(self, tasks_by_id: MutableMapping[int, Task]) -> bool:
         """
-        backup_file = os.path.join(self.backup_dir, f"tasks_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-        if os.path.exists(self.file_path):
-            with open(self.file_path, "r") as file:
-                data = file.read()
-            with open(backup_file, "w") as backup:
-                backup.write(data)
+        Применяет записи журнала к задачам, проиндексированным по ID
+
+        Недописанные строки (например, после аварийного завершения во время записи) пропускаются,
+        а журнал переписывается без них. Иначе следующие записи дописывались бы после поврежденной строки,
+        и при каждой загрузке ее пришлось бы снова обходить.
+
+        :param tasks_by_id: Задачи по ID, изменяются на месте
+        :return: True, если журнал существует
+        """
+        self._journal_records = 0
+        if not os.path.exists(self.journal_path):
+            return False
+
+        complete_lines = []
+        torn = False
+        with open(self.journal_path, "rb") as journal:
+            for line in journal:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Недописанная запись журнала")
+                    record = json.loads(line)
+                    op, task_id = record["op"], record["id"]
+                except (ValueError, KeyError, TypeError):
+                    torn = True
+                    continue
+
+                self._max_id = max(self._max_id, task_id)
+                if op in ("add", "edit"):
+                    tasks_by_id[task_id] = Task.from_dict(record["task"])
+                elif op == "delete":
+                    tasks_by_id.pop(task_id, None)
+                complete_lines.append(line)
+                self._journal_records += 1
+
+        if torn:
+            self._replace_file(self.journal_path, b"".join(complete_lines))
+        return True
+
+    @staticmethod
+    def _decode_tasks(data: bytes) -> tuple[list[Task], int]:
+        """
+        Разбирает содержимое JSON-файла задач
+
+        Файлы прежнего формата (список задач без максимального ID) тоже поддерживаются:
+        для них максимальный ID вычисляется по задачам.
+
+        :param data: Содержимое файла
+        :return: Список задач и максимальный выданный ID
+        """
+        document = json.loads(data)
+        if isinstance(document, list):
+            document = {"tasks": document}
+        tasks = [Task.from_dict(task_data) for task_data in document["tasks"]]
+        max_id = max([document.get("max_id", 0)] + [task.id for task in tasks if task.id is not None])
+        return tasks, max_id
+
+    def _watched_paths(self) -> list[str]:
+        """
+        Файлы, изменение которых означает изменение данных хранилища
+
+        :return: Список путей
+        """
+        return [self.file_path, self.journal_path]
+
+    @staticmethod
+    def _replace_file(path: str, data: bytes) -> None:
+        """
+        Атомарно заменяет файл: данные пишутся во временный файл, который затем переименовывается
+
+        Читатели (в том числе другие процессы) видят либо старое, либо новое содержимое файла целиком.
+
+        :param path: Путь к файлу
+        :param data: Новое содержимое
+        """
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+
+    def _truncate_journal(self) -> None:
+        """
+        Очищает журнал изменений
+        """
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_records = 0
+
+    def _create_backup(self, data: bytes) -> None:
+        """
+        Создает резервную копию данных через `BackupManager` в директории `backup_dir`
+
+        :param data: Содержимое сохраненного снимка
+        """
+        self.backups.backup(data)
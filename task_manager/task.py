@@ -1,13 +1,19 @@
 """Модуль для работы с задачами"""
 
+import sys
 from datetime import date, datetime
 
 
 class Task:
     """
     Класс, представляющий задачу.
+
+    Атрибуты объявлены через `__slots__`, чтобы у задач не было отдельного `__dict__`,
+    а значения приоритета, категории и статуса интернируются и разделяются всеми задачами.
     """
 
+    __slots__ = ("id", "title", "description", "due_date", "priority", "category", "status", "created_at")
+
     DEFAULT_STATUS = 'В работе'
     DEFAULT_PRIORITY = 'Средний'
     DEFAULT_CATEGORY = 'Работа'
@@ -16,9 +22,15 @@ class Task:
     ALL_PRIORITIES = ["Низкий", "Средний", "Высокий"]
     ALL_STATUSES = ["В работе", "Завершено"]
 
+    # Ранги значений для сортировки по смыслу: позиция значения в соответствующем списке `ALL_*`
+    CATEGORY_RANK = {value: rank for rank, value in enumerate(ALL_CATEGORIES)}
+    PRIORITY_RANK = {value: rank for rank, value in enumerate(ALL_PRIORITIES)}
+    STATUS_RANK = {value: rank for rank, value in enumerate(ALL_STATUSES)}
+
     def __init__(
             self, title: str, description: str, due_date: date,
-            priority: str = DEFAULT_PRIORITY, category: str = DEFAULT_CATEGORY, status: str = DEFAULT_STATUS
+            priority: str = DEFAULT_PRIORITY, category: str = DEFAULT_CATEGORY, status: str = DEFAULT_STATUS,
+            created_at: date | None = None, task_id: int | None = None
     ) -> None:
         """
         Инициализация задачи
@@ -29,14 +41,17 @@ class Task:
         :param priority: Приоритет задачи. По умолчанию "Средний"
         :param category: Категория задачи. По умолчанию "Работа"
         :param status: Статус задачи. По умолчанию "В работе"
+        :param created_at: Дата создания задачи. По умолчанию текущая дата
+        :param task_id: Постоянный ID задачи. Назначается `TaskManager` при добавлении задачи
         """
+        self.id = task_id
         self.title = title
         self.description = description
         self.due_date = due_date
-        self.priority = priority
-        self.category = category
-        self.status = status
-        self.created_at = date.today()
+        self.priority = sys.intern(priority)
+        self.category = sys.intern(category)
+        self.status = sys.intern(status)
+        self.created_at = created_at if created_at is not None else date.today()
 
     def to_dict(self) -> dict[str, date | str | None]:
         """
@@ -45,13 +60,14 @@ class Task:
         :return: Словарь с данными задачи
         """
         return {
+            "id": self.id,
             "title": self.title,
             "description": self.description,
             "due_date": self.due_date.isoformat(),
             "priority": self.priority,
             "category": self.category,
             "status": self.status,
-            "created_at": datetime.now().isoformat()
+            "created_at": self.created_at.isoformat()
         }
 
     @classmethod
@@ -68,5 +84,7 @@ class Task:
             due_date=date.fromisoformat(data["due_date"]),
             priority=data["priority"],
             category=data["category"],
-            status=data["status"]
+            status=data["status"],
+            created_at=datetime.fromisoformat(data["created_at"]).date() if data.get("created_at") else None,
+            task_id=data.get("id")
         )
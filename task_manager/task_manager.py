@@ -1,27 +1,579 @@
 """Модуль для управления задачами"""
 
-from datetime import date
+import atexit
+import hashlib
+import json
+import uuid
+from collections.abc import Callable, Iterator, Mapping, MutableMapping
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from datetime import date, datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import TYPE_CHECKING
 
+from .events import TASK_ADDED, TASK_DELETED, TASK_UPDATED, EventBus, TaskEvent
+from .indexes import AggregateCounters, DueDateIndex, FieldIndex, SortedView, TextIndex
+from .importers import (
+    ImportResult, import_records, iter_csv_parallel, iter_csv_rows, iter_json_records,
+    task_from_csv_row, task_from_json_record, task_from_parsed, validate_task
+)
+from .query import SORT_KEYS, QueryEngine, QueryResult, TaskQuery
+from .rwlock import ReadWriteLock
 from .storage import Storage
 from .task import Task
+from .task_table import TaskTable
+from .write_behind import WriteBehindFlusher
+
+if TYPE_CHECKING:
+    from .timeseries import TaskTimeSeries
 
 
 class TaskManager:
     """Класс для управления задачами"""
 
-    def __init__(self) -> None:
-        """Инициализация менеджера задач"""
-        self.storage = Storage()
-        self.tasks = self.storage.load_tasks()
+    def __init__(
+            self, storage: Storage | None = None, write_behind: bool = False,
+            flush_interval: float = 1.0, flush_threshold: int = 500, shared: bool = False
+    ) -> None:
+        """
+        Инициализация менеджера задач
+
+        Задачи хранятся в словаре по постоянному ID, поэтому поиск, изменение и удаление
+        задачи по ID выполняются за O(1), а ID не меняются после удалений, сортировок и перезапусков.
+
+        В режиме `write_behind` менеджер является основной копией данных: изменения сразу
+        применяются в памяти, а в хранилище записываются фоновым потоком (см. `WriteBehindFlusher`).
+        Для немедленной записи используется `flush`, при завершении работы — `close`.
+
+        Об изменениях задач менеджер сообщает подписчикам `events` (см. `EventBus`): событие публикуется
+        после сохранения изменения, а события транзакции — одной пачкой после ее успешного завершения.
+
+        В режиме `shared` хранилище могут одновременно изменять несколько процессов (например, несколько
+        воркеров API). Каждое изменение выполняется под межпроцессной блокировкой хранилища: перед ним
+        задачи перечитываются, если другой процесс успел изменить хранилище, а запись выполняется сразу,
+        поэтому изменения разных процессов не затирают друг друга. Для чтения актуальных данных
+        перед запросом вызывается `refresh`.
+
+        Менеджер можно использовать из нескольких потоков (например, из потоков сервера API): чтения
+        выполняются параллельно под общей блокировкой чтения, а изменения и транзакции — по одному
+        под блокировкой записи (см. `ReadWriteLock`). Читатели получают копии списков и задачи,
+        которые менеджер после сохранения не изменяет, а для нескольких согласованных чтений есть `snapshot`.
+
+        :param storage: Хранилище задач. По умолчанию `Storage()` с файлом "data/tasks.json"
+        :param write_behind: Записывать изменения в фоне. По умолчанию выключено
+        :param flush_interval: Максимальная задержка фоновой записи в секундах. По умолчанию 1.0
+        :param flush_threshold: Количество изменений, при котором фоновая запись выполняется сразу
+        :param shared: Хранилище используется несколькими процессами. По умолчанию нет
+        :raises ValueError: Если одновременно включены `shared` и `write_behind`
+        """
+        if shared and write_behind:
+            raise ValueError("Фоновая запись несовместима с хранилищем, общим для нескольких процессов")
+        self.storage = storage if storage is not None else Storage()
+        self.shared = shared
+        self._storage_token: tuple | None = None
+        self._tasks: MutableMapping[int, Task] = {}
+        self._next_id = 1
+        self._pending: list[tuple[str, int, Task | None]] | None = None
+        self._pending_events: list[TaskEvent] | None = None
+        self.events = EventBus()
+        self._lock = ReadWriteLock()
+        self._snapshot: tuple[int, Mapping[int, Task]] | None = None
+        self._time_series: tuple[int, 'TaskTimeSeries'] | None = None
+        self._indexes = {field: FieldIndex(field) for field in ("status", "category", "priority")}
+        self._indexes["due_date"] = DueDateIndex()
+        self._indexes["open_due_date"] = DueDateIndex(exclude_status="Завершено")
+        self._indexes["text"] = TextIndex()
+        self._indexes["counts"] = AggregateCounters()
+        self._indexes["table"] = TaskTable()
+        self._indexes_ready = False
+        self._version = 0
+        self._modified_at: datetime | None = None
+        # Версия данных, все изменения которой записаны в хранилище
+        self._persisted_version = 0
+        self._instance = uuid.uuid4().hex[:12]
+        self._loaded_partitions: set[str] | None = None
+        with self._storage_lock():
+            if shared:
+                # Сведения о хранилище могли быть прочитаны при его создании, еще без блокировки
+                self.storage.reopen()
+            self._load_tasks()
+
+        self._flusher = None
+        if write_behind:
+            self._flusher = WriteBehindFlusher(self._write_changes, flush_interval, flush_threshold)
+            atexit.register(self.close)
+
+    def __len__(self) -> int:
+        """
+        Количество задач
+
+        :return: Количество задач
+        """
+        with self._reading():
+            return len(self._tasks)
+
+    @property
+    def version(self) -> int:
+        """
+        Версия данных менеджера
+
+        Увеличивается при каждом изменении задач (в том числе при загрузке и откате транзакции),
+        поэтому результат, вычисленный при одной версии, остается верным, пока версия не изменилась.
+
+        :return: Номер версии
+        """
+        return self._version
+
+    @property
+    def state_tag(self) -> str:
+        """
+        Признак состояния данных, общий для всех процессов, работающих с хранилищем
+
+        Если все изменения записаны, признак вычисляется из состояния файлов хранилища (см. `Storage.change_token`)
+        и поэтому совпадает у всех процессов, прочитавших те же данные, в том числе после перезапуска.
+        Пока есть изменения, которые еще не записаны (например, фоновой записью), данные известны только
+        этому менеджеру, и к признаку добавляются идентификатор менеджера и версия данных (см. `version`).
+
+        :return: Строка-признак
+        """
+        with self._lock.read():
+            tag = hashlib.blake2b(repr(self._storage_token).encode(), digest_size=8).hexdigest()
+            if self._persisted_version != self._version:
+                tag = f"{tag}-{self._instance}-{self._version}"
+            return tag
+
+    @property
+    def last_modified(self) -> datetime:
+        """
+        Время последнего изменения версии данных (см. `version`) в UTC
+
+        :return: Время изменения
+        """
+        return self._modified_at
+
+    @property
+    def tasks(self) -> list[Task]:
+        """
+        Список всех задач в порядке добавления
+
+        :return: Список задач
+        """
+        with self._reading():
+            return list(self._tasks.values())
+
+    def snapshot(self) -> Mapping[int, Task]:
+        """
+        Неизменяемый снимок всех задач по ID
+
+        Снимок копируется при первом обращении после изменения задач и затем разделяется всеми читателями
+        до следующего изменения. Изменения не затрагивают уже выданные снимки: менеджер не меняет
+        сохраненные задачи на месте, а заменяет их новыми объектами. Поэтому по снимку можно выполнить
+        несколько согласованных между собой чтений, не блокируя изменения задач.
+
+        :return: Словарь задач по ID только для чтения, в порядке добавления
+        """
+        with self._reading():
+            snapshot = self._snapshot
+            if snapshot is None or snapshot[0] != self._version:
+                snapshot = self._snapshot = (self._version, MappingProxyType(dict(self._tasks)))
+            return snapshot[1]
+
+    def _load_tasks(self) -> None:
+        """
+        Загружает задачи из хранилища и строит индекс по ID
+
+        Задачам без ID (сохраненным до появления постоянных ID) назначаются новые ID,
+        после чего хранилище перезаписывается один раз. Если хранилище поддерживает ленивую загрузку,
+        задачи декодируются только при обращении к ним. Если хранилище разбито на разделы,
+        при запуске не загружается ни один раздел (см. `_ensure_partitions`).
+        """
+        self._indexes_ready = False
+        self._touch()
+        # Признак состояния берется до чтения: запись, случившаяся во время чтения, будет замечена `refresh`
+        self._storage_token = self.storage.change_token()
+        self._persisted_version = self._version
+        if self.storage.lazy_loading:
+            self._tasks = self.storage.load_task_map()
+            self._next_id = self.storage.max_id() + 1
+            return
+        if self.storage.partitioned:
+            self._tasks = {}
+            self._loaded_partitions = set()
+            self._next_id = self.storage.max_id() + 1
+            return
+
+        tasks = self.storage.load_tasks()
+        self._tasks = {}
+        self._next_id = max([self.storage.max_id()] + [task.id for task in tasks if task.id is not None]) + 1
+
+        migrated = False
+        for task in tasks:
+            if task.id is None or task.id in self._tasks:
+                task.id = self._allocate_id()
+                migrated = True
+            self._tasks[task.id] = task
+
+        if migrated:
+            self.storage.save_tasks(self._tasks.values())
+            self._storage_token = self.storage.change_token()
+
+    def refresh(self) -> bool:
+        """
+        Перечитывает задачи, если хранилище было изменено другим процессом
+
+        Проверка стоит одного обращения к файловой системе (см. `Storage.change_token`). Во время транзакции
+        и в режиме `write_behind` (когда основной копией данных является сам менеджер) задачи не перечитываются.
+
+        :return: True, если задачи были перечитаны
+        """
+        with self._lock.read():
+            if self._pending is not None or self._flusher is not None:
+                return False
+            if self.storage.change_token() == self._storage_token:
+                return False
+        with self._lock.write(), self._storage_lock():
+            if self.storage.change_token() == self._storage_token:
+                return False
+            self._reload()
+            return True
+
+    def _reload(self) -> None:
+        """
+        Перечитывает задачи из хранилища, измененного другим процессом
+        """
+        self.storage.reopen()
+        self._load_tasks()
+
+    def _storage_lock(self) -> AbstractContextManager:
+        """
+        Межпроцессная блокировка хранилища в режиме `shared`
+
+        :return: Блокировка хранилища или пустой контекстный менеджер
+        """
+        return self.storage.lock if self.shared else nullcontext()
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """
+        Блокировка для изменения задач
+
+        Всегда блокирует менеджер для других потоков. В режиме `shared` также блокирует хранилище
+        для других процессов и перед изменением перечитывает задачи, если хранилище было изменено извне.
+        Внутри транзакции задачи не перечитываются: это сделано при ее начале.
+        """
+        with self._lock.write():
+            if not self.shared:
+                yield
+                return
+            with self.storage.lock:
+                if self._pending is None and self.storage.change_token() != self._storage_token:
+                    self._reload()
+                yield
+
+    def _allocate_id(self) -> int:
+        """
+        Выдает следующий свободный ID задачи
+
+        :return: Новый ID
+        """
+        task_id = self._next_id
+        self._next_id += 1
+        return task_id
+
+    @contextmanager
+    def _reading(
+            self, task_id: int | None = None, category: str | list[str] | None = None,
+            due_from: date | None = None, due_to: date | None = None,
+            indexes: bool = False, sort_field: str | None = None
+    ) -> Iterator[None]:
+        """
+        Блокировка для чтения задач
+
+        Читатели не блокируют друг друга. Разделы, индексы и представления, которые нужны чтению, но еще
+        не построены, строятся под блокировкой записи, после чего чтение повторяется под блокировкой
+        чтения: построение изменяет общее состояние, поэтому не может выполняться параллельно с чтениями.
+
+        :param task_id: ID задачи, раздел которой нужен
+        :param category: Категория или список категорий запроса
+        :param due_from: Нижняя граница срока выполнения запроса (включительно)
+        :param due_to: Верхняя граница срока выполнения запроса (включительно)
+        :param indexes: Чтению нужны вторичные индексы
+        :param sort_field: Поле, упорядоченное представление которого нужно чтению
+        """
+        while True:
+            with self._lock.read():
+                if (
+                        not self._missing_partitions(task_id, None, category, due_from, due_to)
+                        and (not indexes or self._indexes_ready)
+                        and (sort_field is None or f"sort_{sort_field}" in self._indexes)
+                ):
+                    yield
+                    return
+            with self._lock.write():
+                self._ensure_partitions(task_id, None, category, due_from, due_to)
+                if indexes:
+                    self._ensure_indexes()
+                if sort_field is not None:
+                    self._ensure_sorted_view(sort_field)
+
+    def _missing_partitions(
+            self, task_id: int | None = None, task: Task | None = None, category: str | list[str] | None = None,
+            due_from: date | None = None, due_to: date | None = None
+    ) -> list[str]:
+        """
+        Определяет разделы хранилища, которые нужны операции, но еще не загружены
+
+        Разделы определяются по ID задачи, по самой задаче или по условиям на категорию и срок выполнения;
+        если условий нет или по ним разделы сузить нельзя, нужны все разделы.
+
+        :param task_id: ID задачи, раздел которой нужен
+        :param task: Задача, раздел которой нужен (например, новая задача)
+        :param category: Категория или список категорий запроса
+        :param due_from: Нижняя граница срока выполнения запроса (включительно)
+        :param due_to: Верхняя граница срока выполнения запроса (включительно)
+        :return: Ключи незагруженных разделов. Для хранилищ без разделов — пустой список
+        """
+        if self._loaded_partitions is None:
+            return []
+        if task_id is not None:
+            keys = self.storage.partitions_for_id(task_id)
+        elif task is not None:
+            keys = [self.storage.partition_of(task)]
+        else:
+            keys = self.storage.partitions_for(category, due_from, due_to)
+            if keys is None:
+                keys = self.storage.partition_keys()
+        return [key for key in keys if key not in self._loaded_partitions]
+
+    def _ensure_partitions(
+            self, task_id: int | None = None, task: Task | None = None, category: str | list[str] | None = None,
+            due_from: date | None = None, due_to: date | None = None
+    ) -> None:
+        """
+        Загружает разделы хранилища, которые нужны операции
+
+        Для хранилищ без разделов ничего не делает. Нужные разделы определяются так же,
+        как в `_missing_partitions`. Каждый раздел загружается один раз, после чего индексы перестраиваются.
+
+        :param task_id: ID задачи, раздел которой нужен
+        :param task: Задача, раздел которой нужен (например, новая задача)
+        :param category: Категория или список категорий запроса
+        :param due_from: Нижняя граница срока выполнения запроса (включительно)
+        :param due_to: Верхняя граница срока выполнения запроса (включительно)
+        """
+        if self._loaded_partitions is None:
+            return
+        with self._lock.write():
+            missing = self._missing_partitions(task_id, task, category, due_from, due_to)
+            if not missing:
+                return
+            tasks = self.storage.load_partitions(missing)
+            if tasks:
+                for task in tasks:
+                    self._tasks.setdefault(task.id, task)
+                # Задачи хранятся в порядке ID, как и при полной загрузке
+                self._tasks = dict(sorted(self._tasks.items()))
+                self._indexes_ready = False
+                self._touch()
+            self._loaded_partitions.update(missing)
+
+    def _ensure_indexes(self) -> None:
+        """
+        Строит вторичные индексы при первом обращении к ним
+
+        Индексы строятся лениво, чтобы не замедлять запуск (в том числе с ленивым хранилищем),
+        а после построения поддерживаются при каждом изменении задач.
+        """
+        with self._lock.write():
+            if not self._indexes_ready:
+                for index in self._indexes.values():
+                    index.rebuild(self._tasks.values())
+                self._indexes_ready = True
+
+    def _index_add(self, task: Task) -> None:
+        """
+        Добавляет задачу во вторичные индексы
+
+        :param task: Новая задача
+        """
+        if self._indexes_ready:
+            for index in self._indexes.values():
+                index.add(task)
+
+    def _index_replace(self, old_task: Task, new_task: Task) -> None:
+        """
+        Обновляет вторичные индексы при изменении задачи
+
+        :param old_task: Задача до изменения
+        :param new_task: Задача после изменения
+        """
+        if self._indexes_ready:
+            for index in self._indexes.values():
+                index.replace(old_task, new_task)
+
+    def _index_remove(self, task: Task) -> None:
+        """
+        Удаляет задачу из вторичных индексов
+
+        :param task: Удаленная задача
+        """
+        if self._indexes_ready:
+            for index in self._indexes.values():
+                index.remove(task)
+
+    def _persist(self, changes: list[tuple[str, int, Task | None]]) -> None:
+        """
+        Сохраняет изменения или откладывает их до конца текущей транзакции
+
+        В режиме `write_behind` изменения ставятся в очередь фоновой записи.
+
+        :param changes: Изменения в виде кортежей (операция, ID задачи, задача)
+        """
+        self._touch()
+        if self._pending is not None:
+            self._pending.extend(changes)
+        elif self._flusher is not None:
+            self._flusher.enqueue(changes)
+        else:
+            self._write_changes(changes)
+
+    def _touch(self) -> None:
+        """
+        Увеличивает версию данных и запоминает время изменения
+        """
+        self._version += 1
+        self._modified_at = datetime.now(timezone.utc)
+
+    def _publish(self, event: TaskEvent) -> None:
+        """
+        Публикует событие или откладывает его до конца текущей транзакции
+
+        :param event: Событие об изменении задачи
+        """
+        if self._pending_events is not None:
+            self._pending_events.append(event)
+        else:
+            self.events.publish([event])
+
+    def _write_changes(self, changes: list[tuple[str, int, Task | None]]) -> None:
+        """
+        Записывает изменения в хранилище
+
+        Снимок задач берется под блокировкой, а сама запись выполняется без нее,
+        чтобы фоновая запись не блокировала изменения в памяти. Хранилищам, которые пишут только
+        изменения, полный список задач передается лишь при сжатии журнала.
+
+        Ошибка сжатия журнала не считается ошибкой записи: изменения к этому моменту уже записаны
+        в журнал, поэтому не должны записываться повторно (например, фоновой записью). Сжатие будет
+        повторено при следующей записи.
+
+        :param changes: Изменения в виде кортежей (операция, ID задачи, задача)
+        """
+        with self._lock.read():
+            tasks = None if self.storage.incremental_writes else list(self._tasks.values())
+            # Если в очереди фоновой записи нет более новых изменений, запись сохранит текущую версию данных
+            version = self._version if self._flusher is None or not self._flusher.pending_count else None
+        self.storage.write_changes(tasks, changes)
+        self._storage_token = self.storage.change_token()
+        if version is not None:
+            self._persisted_version = version
+
+        if self.storage.needs_compaction:
+            with self._lock.read():
+                tasks = list(self._tasks.values())
+            try:
+                self.storage.compact(tasks)
+            except Exception as e:
+                print(f"Ошибка при сжатии журнала: {e}")
+            self._storage_token = self.storage.change_token()
+
+    def flush(self) -> None:
+        """
+        Немедленно записывает в хранилище все отложенные изменения
+        """
+        if self._flusher is not None:
+            self._flusher.flush()
+
+    def close(self) -> None:
+        """
+        Останавливает фоновую запись и сохраняет все отложенные изменения
+        """
+        if self._flusher is not None:
+            self._flusher.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator['TaskManager']:
+        """
+        Объединяет изменения внутри блока `with` в одну запись в хранилище
+
+        Все изменения сохраняются одной записью (и одной резервной копией) при выходе из блока.
+        Если внутри блока или при сохранении возникло исключение, задачи в памяти возвращаются
+        к состоянию на начало транзакции. Вложенные транзакции входят во внешнюю.
+        В режиме `write_behind` изменения транзакции ставятся в очередь одной пачкой.
+        События об изменениях публикуются после сохранения, при откате не публикуются.
+        В режиме `shared` хранилище заблокировано для других процессов на все время транзакции.
+
+        :return: Менеджер задач
+        """
+        with self._exclusive():
+            if self._pending is not None:
+                yield self
+                return
+
+            tasks_snapshot = self._tasks.copy()
+            next_id_snapshot = self._next_id
+            persisted = self._persisted_version == self._version
+            partitions_snapshot = None if self._loaded_partitions is None else set(self._loaded_partitions)
+            self._pending = []
+            self._pending_events = events = []
+            try:
+                yield self
+                changes, self._pending = self._pending, None
+                if changes:
+                    self._persist(changes)
+            except BaseException:
+                self._tasks = tasks_snapshot
+                self._next_id = next_id_snapshot
+                self._loaded_partitions = partitions_snapshot
+                self._indexes_ready = False
+                self._touch()
+                if persisted:
+                    self._persisted_version = self._version
+                raise
+            finally:
+                self._pending = None
+                self._pending_events = None
+            if events:
+                self.events.publish(events)
 
     def add_task(self, task: Task) -> None:
         """
-        Добавляет новую задачу
+        Добавляет новую задачу и назначает ей ID
 
         :param task: Объект задачи для добавления
+        :raises ValueError: Если значение какого-либо поля недопустимо (см. `validate_task`)
+        """
+        validate_task(task)
+        with self._exclusive():
+            self._ensure_partitions(task=task)
+            task.id = self._allocate_id()
+            self._tasks[task.id] = task
+            self._index_add(task)
+            self._persist([("add", task.id, task)])
+            self._publish(TaskEvent(TASK_ADDED, task.id, None, task, self._version))
+
+    def add_tasks(self, tasks: list[Task]) -> list[int]:
         """
-        self.tasks.append(task)
-        self.storage.save_tasks(self.tasks)
+        Добавляет несколько задач одной записью в хранилище
+
+        :param tasks: Список задач для добавления
+        :return: Список назначенных ID
+        :raises ValueError: Если значение поля какой-либо задачи недопустимо. В этом случае ни одна задача
+            не добавляется
+        """
+        with self.transaction():
+            for task in tasks:
+                self.add_task(task)
+        return [task.id for task in tasks]
 
     def edit_task(self, task_id: int, updated_task: Task) -> None:
         """
@@ -30,12 +582,35 @@ class TaskManager:
         :param task_id: ID задачи для редактирования
         :param updated_task: Обновленный объект задачи
         :raises IndexError: Если ID задачи недопустим
+        :raises ValueError: Если значение какого-либо поля недопустимо (см. `validate_task`)
         """
-        if 0 <= task_id < len(self.tasks):
-            self.storage.edit_task(task_id, updated_task)
-            self.tasks = self.storage.load_tasks()
-        else:
-            raise IndexError("Недопустимый ID задачи")
+        validate_task(updated_task)
+        with self._exclusive():
+            self._ensure_partitions(task_id=task_id)
+            self._ensure_partitions(task=updated_task)
+            if task_id in self._tasks:
+                updated_task.id = task_id
+                old_task = self._tasks[task_id]
+                updated_task.created_at = old_task.created_at
+                self._tasks[task_id] = updated_task
+                self._index_replace(old_task, updated_task)
+                self._persist([("edit", task_id, updated_task)])
+                self._publish(TaskEvent(TASK_UPDATED, task_id, old_task, updated_task, self._version))
+            else:
+                raise IndexError("Недопустимый ID задачи")
+
+    def update_tasks(self, updates: dict[int, Task]) -> None:
+        """
+        Редактирует несколько задач одной записью в хранилище
+
+        :param updates: Словарь {ID задачи: обновленный объект задачи}
+        :raises IndexError: Если ID какой-либо задачи недопустим. В этом случае ни одна задача не изменяется
+        :raises ValueError: Если значение поля какой-либо задачи недопустимо. В этом случае ни одна задача
+            не изменяется
+        """
+        with self.transaction():
+            for task_id, updated_task in updates.items():
+                self.edit_task(task_id, updated_task)
 
     def delete_task(self, task_id: int) -> None:
         """
@@ -44,11 +619,117 @@ class TaskManager:
         :param task_id: ID задачи для удаления
         :raises IndexError: Если ID задачи недопустим
         """
-        if 0 <= task_id < len(self.tasks):
-            del self.tasks[task_id]
-            self.storage.save_tasks(self.tasks)
+        with self._exclusive():
+            self._ensure_partitions(task_id=task_id)
+            if task_id in self._tasks:
+                old_task = self._tasks.pop(task_id)
+                self._index_remove(old_task)
+                self._persist([("delete", task_id, None)])
+                self._publish(TaskEvent(TASK_DELETED, task_id, old_task, None, self._version))
+            else:
+                raise IndexError("Недопустимый ID задачи")
+
+    def delete_tasks(self, task_ids: list[int]) -> None:
+        """
+        Удаляет несколько задач одной записью в хранилище
+
+        :param task_ids: Список ID задач для удаления
+        :raises IndexError: Если ID какой-либо задачи недопустим. В этом случае ни одна задача не удаляется
+        """
+        with self.transaction():
+            for task_id in task_ids:
+                self.delete_task(task_id)
+
+    @contextmanager
+    def _import_transaction(self) -> Iterator[None]:
+        """
+        Объединяет пачки импорта в одну запись, если хранилище перезаписывает весь список задач
+
+        Для хранилищ, которые пишут только изменения (журнал), каждая пачка сохраняется отдельно,
+        иначе каждая пачка приводила бы к полной перезаписи файла. Хранилище с разделами переписывает
+        затронутые разделы целиком, поэтому для него пачки тоже объединяются. Хранилища с
+        `transactional_imports` (SQLite) сохраняют весь импорт одной транзакцией, чтобы ошибка посреди
+        импорта не оставляла его часть.
+        """
+        if self.storage.incremental_writes and not (self.storage.partitioned or self.storage.transactional_imports):
+            yield
+        else:
+            with self.transaction():
+                yield
+
+    def import_from_json(
+            self, file_path: str, batch_size: int = 1000,
+            on_progress: Callable[[ImportResult], None] | None = None,
+            on_error: Callable[[int, str], None] | None = None
+    ) -> ImportResult:
+        """
+        Потоково импортирует задачи из JSON-файла
+
+        Файл разбирается по частям, задачи добавляются пачками по `batch_size` через `add_tasks`,
+        поэтому память на разбор не зависит от размера файла. Некорректные записи пропускаются.
+
+        :param file_path: Путь к JSON-файлу с задачами
+        :param batch_size: Размер пачки. По умолчанию 1000
+        :param on_progress: Вызывается после каждой пачки с текущими итогами импорта
+        :param on_error: Вызывается для каждой некорректной записи с ее номером и описанием ошибки
+        :return: Итоги импорта
+        :raises Exception: Если файл не удалось прочитать или разобрать
+        """
+        try:
+            with self._import_transaction():
+                return import_records(
+                    iter_json_records(file_path), task_from_json_record, self.add_tasks,
+                    batch_size, on_progress, on_error
+                )
+        except Exception as e:
+            raise Exception(f"Ошибка при импорте из JSON: {e}")
+
+    def import_from_csv(
+            self, file_path: str, batch_size: int = 1000,
+            on_progress: Callable[[ImportResult], None] | None = None,
+            on_error: Callable[[int, str], None] | None = None, workers: int | None = None
+    ) -> ImportResult:
+        """
+        Потоково импортирует задачи из CSV-файла
+
+        Строки читаются по одной, задачи добавляются пачками по `batch_size` через `add_tasks`.
+        Некорректные строки пропускаются. Если передан `workers`, файл делится на части по границам
+        строк и разбирается в пуле из `workers` процессов (см. `iter_csv_parallel`); порядок задач
+        при этом сохраняется.
+
+        :param file_path: Путь к CSV-файлу с задачами
+        :param batch_size: Размер пачки. По умолчанию 1000
+        :param on_progress: Вызывается после каждой пачки с текущими итогами импорта
+        :param on_error: Вызывается для каждой некорректной строки с ее номером и описанием ошибки
+        :param workers: Количество процессов для параллельного разбора. По умолчанию разбор в текущем процессе
+        :return: Итоги импорта
+        :raises Exception: Если файл не удалось прочитать
+        """
+        if workers:
+            records, convert = iter_csv_parallel(file_path, workers), task_from_parsed
         else:
-            raise IndexError("Недопустимый ID задачи")
+            records, convert = iter_csv_rows(file_path), task_from_csv_row
+
+        try:
+            with self._import_transaction():
+                return import_records(records, convert, self.add_tasks, batch_size, on_progress, on_error)
+        except Exception as e:
+            raise Exception(f"Ошибка при импорте из CSV: {e}")
+
+    def export_to_json(self, file_path: str) -> None:
+        """
+        Экспортирует все задачи в JSON-файл
+
+        Задачи записываются по одной, без построения всего документа в памяти.
+
+        :param file_path: Путь к JSON-файлу
+        """
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write("[")
+            for position, task in enumerate(self.snapshot().values()):
+                file.write(",\n" if position else "\n")
+                file.write(json.dumps(task.to_dict(), ensure_ascii=False))
+            file.write("\n]\n")
 
     def get_task(self, task_id: int) -> Task:
         """
@@ -58,10 +739,11 @@ class TaskManager:
         :return: Объект задачи
         :raises IndexError: Если ID задачи недопустим
         """
-        if 0 <= task_id < len(self.tasks):
-            return self.tasks[task_id]
-        else:
-            raise IndexError("Недопустимый ID задачи")
+        with self._reading(task_id=task_id):
+            if task_id in self._tasks:
+                return self._tasks[task_id]
+            else:
+                raise IndexError("Недопустимый ID задачи")
 
     def get_tasks(self) -> list[Task]:
         """
@@ -71,6 +753,34 @@ class TaskManager:
         """
         return self.tasks
 
+    def query(self, query: TaskQuery) -> QueryResult:
+        """
+        Выполняет запрос с фильтрами, сортировкой и постраничным выводом
+
+        :param query: Описание запроса
+        :return: Результат запроса, не связанный с внутренним состоянием менеджера
+        """
+        with self._reading(
+                category=query.filters.get("category"), due_from=query.due_from, due_to=query.due_to,
+                indexes=True, sort_field=query.sort[0][0] if len(query.sort) == 1 else None
+        ):
+            return QueryEngine(self._tasks, self._indexes).execute(query)
+
+    def _ensure_sorted_view(self, field: str) -> None:
+        """
+        Создает упорядоченное представление столбца при первой сортировке по нему
+
+        Далее представление поддерживается при изменениях вместе с остальными индексами,
+        поэтому повторные сортировки по тому же столбцу не сортируют задачи заново.
+
+        :param field: Поле сортировки
+        """
+        name = f"sort_{field}"
+        if name not in self._indexes:
+            view = SortedView(SORT_KEYS[field])
+            view.rebuild(self._tasks.values())
+            self._indexes[name] = view
+
     def get_tasks_by_status(self, status: str) -> list[Task]:
         """
         Возвращает задачи по статусу
@@ -78,7 +788,7 @@ class TaskManager:
         :param status: Статус задач для фильтрации
         :return: Список задач с указанным статусом
         """
-        return [task for task in self.tasks if task.status == status]
+        return self._get_indexed("status", status)
 
     def get_tasks_by_category(self, category: str) -> list[Task]:
         """
@@ -87,29 +797,145 @@ class TaskManager:
         :param category: Категория задач для фильтрации
         :return: Список задач с указанной категорией
         """
-        return [task for task in self.tasks if task.category == category]
+        return self._get_indexed("category", category)
+
+    def get_tasks_by_priority(self, priority: str) -> list[Task]:
+        """
+        Возвращает задачи по приоритету
+
+        :param priority: Приоритет задач для фильтрации
+        :return: Список задач с указанным приоритетом
+        """
+        return self._get_indexed("priority", priority)
 
-    def get_overdue_tasks(self) -> list[Task]:
+    def _get_indexed(self, field: str, value: str) -> list[Task]:
+        """
+        Возвращает задачи с указанным значением поля через вторичный индекс
+
+        :param field: Имя поля (status, category, priority)
+        :param value: Значение поля
+        :return: Список задач в порядке ID
+        """
+        with self._reading(category=value if field == "category" else None, indexes=True):
+            return [self._tasks[task_id] for task_id in self._indexes[field].get(value)]
+
+    def get_overdue_tasks(self, until: date | None = None) -> list[Task]:
         """
         Возвращает просроченные задачи
 
-        :return: Список просроченных задач
+        :param until: Задачи со сроком раньше этой даты считаются просроченными. По умолчанию текущая дата
+        :return: Список незавершенных задач в порядке срока выполнения
+        """
+        with self._reading(due_to=until or date.today(), indexes=True):
+            task_ids = self._indexes["open_due_date"].range(due_to=until or date.today())
+            return [self._tasks[task_id] for task_id in task_ids]
+
+    def count_overdue_tasks(self, until: date | None = None) -> int:
         """
-        now = date.today()
-        return [task for task in self.tasks if task.due_date < now and task.status != "Завершено"]
+        Возвращает количество просроченных задач без их выборки
 
-    def search_tasks(self, keyword: str) -> list[Task]:
+        :param until: Задачи со сроком раньше этой даты считаются просроченными. По умолчанию текущая дата
+        :return: Количество незавершенных задач со сроком раньше `until`
         """
-        Ищет задачи по ключевому слову
+        with self._reading(due_to=until or date.today(), indexes=True):
+            return self._indexes["open_due_date"].count(due_to=until or date.today())
 
-        :param keyword: Ключевое слово для поиска
-        :return: Список задач, содержащих ключевое слово
+    def count_tasks(self, category: str | None = None, priority: str | None = None, status: str | None = None) -> int:
         """
-        keyword = keyword.lower()
-        return [
-            task for task in self.tasks
-            if (keyword in task.title.lower() or
-                keyword in task.description.lower() or
-                keyword in task.category.lower() or
-                keyword in task.status.lower())
-        ]
+        Возвращает количество задач с указанными значениями полей
+
+        :param category: Категория. По умолчанию любая
+        :param priority: Приоритет. По умолчанию любой
+        :param status: Статус. По умолчанию любой
+        :return: Количество задач
+        """
+        with self._reading(category=category, indexes=True):
+            return self._indexes["counts"].count(category, priority, status)
+
+    def count_tasks_by(self, field: str) -> dict[str, int]:
+        """
+        Группирует количество задач по значениям поля
+
+        :param field: Поле группировки: category, priority или status
+        :return: Словарь {значение: количество} по всем допустимым значениям поля, включая нулевые
+        :raises ValueError: Если поле не поддерживается
+        """
+        all_values = {"category": Task.ALL_CATEGORIES, "priority": Task.ALL_PRIORITIES, "status": Task.ALL_STATUSES}
+        if field not in all_values:
+            raise ValueError(f"Недопустимое поле группировки: {field}")
+        with self._reading(indexes=True):
+            counts = self._indexes["counts"].count_by(field)
+        return {value: counts.get(value, 0) for value in all_values[field]}
+
+    def get_stats(self) -> dict:
+        """
+        Возвращает сводную статистику по задачам
+
+        Статистика собирается из поддерживаемых счетчиков и индекса сроков, без обхода задач.
+
+        :return: Словарь с общим количеством, количеством завершенных и просроченных задач,
+            группировками по категории, приоритету и статусу и количеством задач по каждому сочетанию
+        """
+        with self._reading(indexes=True):
+            counters = self._indexes["counts"]
+            return {
+                "total": len(self._tasks),
+                "completed": counters.count(status="Завершено"),
+                "overdue": self.count_overdue_tasks(),
+                "by_category": self.count_tasks_by("category"),
+                "by_priority": self.count_tasks_by("priority"),
+                "by_status": self.count_tasks_by("status"),
+                "breakdown": [
+                    {"category": category, "priority": priority, "status": status, "count": count}
+                    for (category, priority, status), count in sorted(counters.items())
+                ],
+            }
+
+    def get_tasks_due_between(self, start_date: date, end_date: date) -> list[Task]:
+        """
+        Возвращает задачи со сроком выполнения в диапазоне дат
+
+        :param start_date: Начало диапазона (включительно)
+        :param end_date: Конец диапазона (включительно)
+        :return: Список задач в порядке срока выполнения
+        """
+        with self._reading(due_from=start_date, due_to=end_date, indexes=True):
+            task_ids = self._indexes["due_date"].range(start_date, end_date + timedelta(days=1))
+            return [self._tasks[task_id] for task_id in task_ids]
+
+    def search_tasks(self, keyword: str, limit: int | None = None) -> list[Task]:
+        """
+        Ищет задачи по словам запроса
+
+        Поиск выполняется по инвертированному индексу заголовка, описания, категории и статуса:
+        каждое слово запроса должно встречаться в задаче как слово или начало слова, без учета
+        регистра и различия "е" и "ё". Результаты упорядочены по релевантности.
+
+        :param keyword: Строка запроса
+        :param limit: Максимальное количество результатов. По умолчанию без ограничения
+        :return: Список найденных задач. Если в запросе нет слов — все задачи
+        """
+        with self._reading(indexes=True):
+            task_ids = self._indexes["text"].search(keyword)
+            if task_ids is None:
+                task_ids = list(self._tasks)
+            return [self._tasks[task_id] for task_id in task_ids[:limit]]
+
+    def time_series(self) -> 'TaskTimeSeries':
+        """
+        Возвращает расчет временных рядов по всем задачам
+
+        Массивы NumPy копируются из столбцов поддерживаемой таблицы задач (см. `TaskTable`),
+        без обхода объектов задач, один раз на версию данных (см. `version`): до следующего изменения
+        задач все вызовы получают тот же расчет.
+
+        :return: Расчет временных рядов (см. `TaskTimeSeries`)
+        """
+        # NumPy нужен только временным рядам, поэтому модуль импортируется при первом расчете
+        from .timeseries import TaskTimeSeries
+
+        with self._reading(indexes=True):
+            cached = self._time_series
+            if cached is None or cached[0] != self._version:
+                cached = self._time_series = (self._version, TaskTimeSeries(self._indexes["table"]))
+            return cached[1]
@@ -0,0 +1,269 @@
+"""Модуль для компактного хранения задач в виде столбцов"""
+
+from array import array
+from collections.abc import Iterable, Iterator
+from datetime import date
+
+from .task import Task
+
+# Коды значений перечислимых полей: индекс значения в соответствующем списке `Task.ALL_*`
+PRIORITY_CODES = Task.PRIORITY_RANK
+CATEGORY_CODES = Task.CATEGORY_RANK
+STATUS_CODES = Task.STATUS_RANK
+
+# Код значения, которого нет в `Task.ALL_*` (например, в задаче, сохраненной вручную)
+UNKNOWN_CODE = -1
+
+
+class TaskTable:
+    """
+    Таблица задач, хранящая каждое поле в отдельном столбце
+
+    Приоритет, категория и статус хранятся как однобайтовые коды (индексы в `Task.ALL_PRIORITIES`,
+    `Task.ALL_CATEGORIES`, `Task.ALL_STATUSES`), даты — как порядковые номера дней, ID — как 64-битные
+    целые. Фильтрация и сортировка выполняются по этим массивам без создания объектов `Task`;
+    объект задачи собирается только при обращении к строке.
+
+    `TaskManager` поддерживает таблицу как вторичный индекс (методы `rebuild`, `add`, `replace`, `remove`),
+    а `TaskTimeSeries` берет из нее столбцы для массивов NumPy без обхода объектов задач.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пустой таблицы"""
+        self.rebuild([])
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task]) -> 'TaskTable':
+        """
+        Создает таблицу из задач
+
+        :param tasks: Задачи с назначенными ID
+        :return: Таблица задач
+        """
+        table = cls()
+        table.rebuild(tasks)
+        return table
+
+    def rebuild(self, tasks: Iterable[Task]) -> None:
+        """
+        Заполняет таблицу заново
+
+        :param tasks: Задачи с назначенными ID
+        """
+        self.ids = array("q")
+        self.titles: list[str] = []
+        self.descriptions: list[str] = []
+        self.due_dates = array("i")
+        self.created_dates = array("i")
+        self.priorities = array("b")
+        self.categories = array("b")
+        self.statuses = array("b")
+        self._rows: dict[int, int] = {}
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        """
+        Количество задач в таблице
+
+        :return: Количество строк
+        """
+        return len(self.ids)
+
+    def __getitem__(self, row: int) -> Task:
+        """
+        Собирает объект задачи из строки таблицы
+
+        :param row: Номер строки
+        :return: Объект задачи
+        :raises ValueError: Если значение перечислимого поля в строке неизвестно
+        """
+        return Task(
+            title=self.titles[row],
+            description=self.descriptions[row],
+            due_date=date.fromordinal(self.due_dates[row]),
+            priority=self._decode(Task.ALL_PRIORITIES, self.priorities[row]),
+            category=self._decode(Task.ALL_CATEGORIES, self.categories[row]),
+            status=self._decode(Task.ALL_STATUSES, self.statuses[row]),
+            created_at=date.fromordinal(self.created_dates[row]),
+            task_id=self.ids[row]
+        )
+
+    def __iter__(self) -> Iterator[Task]:
+        """
+        Перебирает задачи в порядке строк
+
+        :return: Итератор по задачам
+        """
+        for row in range(len(self)):
+            yield self[row]
+
+    def row_of(self, task_id: int) -> int:
+        """
+        Возвращает номер строки задачи по ID
+
+        :param task_id: ID задачи
+        :return: Номер строки
+        :raises IndexError: Если задачи с таким ID нет
+        """
+        if task_id not in self._rows:
+            raise IndexError("Недопустимый ID задачи")
+        return self._rows[task_id]
+
+    def add(self, task: Task) -> None:
+        """
+        Добавляет задачу в конец таблицы
+
+        Неизвестные значения перечислимых полей сохраняются с кодом `UNKNOWN_CODE`.
+
+        :param task: Объект задачи с назначенным ID
+        :raises ValueError: Если у задачи нет ID
+        """
+        if task.id is None:
+            raise ValueError("У задачи нет ID")
+        priority, category, status = self._encode(task)
+
+        self._rows[task.id] = len(self.ids)
+        self.ids.append(task.id)
+        self.titles.append(task.title)
+        self.descriptions.append(task.description)
+        self.due_dates.append(task.due_date.toordinal())
+        self.created_dates.append(task.created_at.toordinal())
+        self.priorities.append(priority)
+        self.categories.append(category)
+        self.statuses.append(status)
+
+    def replace(self, old_task: Task, new_task: Task) -> None:
+        """
+        Заменяет строку задачи с тем же ID
+
+        :param old_task: Задача до изменения
+        :param new_task: Задача после изменения
+        :raises IndexError: Если задачи с таким ID нет
+        """
+        row = self.row_of(old_task.id)
+        priority, category, status = self._encode(new_task)
+
+        self.titles[row] = new_task.title
+        self.descriptions[row] = new_task.description
+        self.due_dates[row] = new_task.due_date.toordinal()
+        self.created_dates[row] = new_task.created_at.toordinal()
+        self.priorities[row] = priority
+        self.categories[row] = category
+        self.statuses[row] = status
+
+    def remove(self, task: Task) -> None:
+        """
+        Удаляет задачу из таблицы
+
+        На место удаленной строки переносится последняя строка, поэтому удаление выполняется за O(1),
+        но порядок строк не сохраняется.
+
+        :param task: Удаленная задача
+        :raises IndexError: Если задачи с таким ID нет
+        """
+        row = self.row_of(task.id)
+        last = len(self.ids) - 1
+        for column in (
+                self.ids, self.titles, self.descriptions, self.due_dates,
+                self.created_dates, self.priorities, self.categories, self.statuses
+        ):
+            column[row] = column[last]
+            column.pop()
+
+        del self._rows[task.id]
+        if row != last:
+            self._rows[self.ids[row]] = row
+
+    def filter(
+            self, priority: str | None = None, category: str | None = None, status: str | None = None,
+            exclude_status: str | None = None, due_from: date | None = None, due_to: date | None = None
+    ) -> list[int]:
+        """
+        Возвращает номера строк, подходящих под все переданные фильтры
+
+        :param priority: Приоритет задачи
+        :param category: Категория задачи
+        :param status: Статус задачи
+        :param exclude_status: Статус, задачи с которым не попадают в результат
+        :param due_from: Нижняя граница срока выполнения (включительно)
+        :param due_to: Верхняя граница срока выполнения (не включительно)
+        :return: Список номеров строк по возрастанию
+        """
+        rows = range(len(self))
+        if priority is not None:
+            code, column = PRIORITY_CODES.get(priority, -1), self.priorities
+            rows = [row for row in rows if column[row] == code]
+        if category is not None:
+            code, column = CATEGORY_CODES.get(category, -1), self.categories
+            rows = [row for row in rows if column[row] == code]
+        if status is not None:
+            code, column = STATUS_CODES.get(status, -1), self.statuses
+            rows = [row for row in rows if column[row] == code]
+        if exclude_status is not None:
+            code, column = STATUS_CODES.get(exclude_status, -1), self.statuses
+            rows = [row for row in rows if column[row] != code]
+        if due_from is not None:
+            low, column = due_from.toordinal(), self.due_dates
+            rows = [row for row in rows if column[row] >= low]
+        if due_to is not None:
+            high, column = due_to.toordinal(), self.due_dates
+            rows = [row for row in rows if column[row] < high]
+        return list(rows)
+
+    def argsort(self, column: str, reverse: bool = False, rows: Iterable[int] | None = None) -> list[int]:
+        """
+        Возвращает номера строк, упорядоченные по столбцу
+
+        Приоритет, категория и статус упорядочиваются по кодам, то есть в порядке
+        `Task.ALL_PRIORITIES`, `Task.ALL_CATEGORIES` и `Task.ALL_STATUSES`.
+
+        :param column: Имя поля: id, title, description, due_date, created_at, priority, category, status
+        :param reverse: Сортировка по убыванию
+        :param rows: Номера строк для сортировки. По умолчанию все строки
+        :return: Список номеров строк
+        :raises ValueError: Если столбец неизвестен
+        """
+        columns = {
+            "id": self.ids,
+            "title": self.titles,
+            "description": self.descriptions,
+            "due_date": self.due_dates,
+            "created_at": self.created_dates,
+            "priority": self.priorities,
+            "category": self.categories,
+            "status": self.statuses,
+        }
+        if column not in columns:
+            raise ValueError(f"Неизвестный столбец: {column}")
+        if rows is None:
+            rows = range(len(self))
+        return sorted(rows, key=columns[column].__getitem__, reverse=reverse)
+
+    @staticmethod
+    def _encode(task: Task) -> tuple[int, int, int]:
+        """
+        Кодирует перечислимые поля задачи
+
+        :param task: Объект задачи
+        :return: Коды приоритета, категории и статуса. Для неизвестных значений `UNKNOWN_CODE`
+        """
+        return (
+            PRIORITY_CODES.get(task.priority, UNKNOWN_CODE),
+            CATEGORY_CODES.get(task.category, UNKNOWN_CODE),
+            STATUS_CODES.get(task.status, UNKNOWN_CODE),
+        )
+
+    @staticmethod
+    def _decode(values: list[str], code: int) -> str:
+        """
+        Возвращает значение перечислимого поля по коду
+
+        :param values: Допустимые значения поля
+        :param code: Код значения
+        :return: Значение поля
+        :raises ValueError: Если код равен `UNKNOWN_CODE`
+        """
+        if code == UNKNOWN_CODE:
+            raise ValueError("Неизвестное значение поля задачи")
+        return values[code]
@@ -0,0 +1,195 @@
+"""Модуль для расчета временных рядов по задачам"""
+
+from collections.abc import Iterable
+from datetime import date, timedelta
+
+import numpy as np
+
+from .task import Task
+from .task_table import TaskTable
+
+# Порядковый номер дня 1970-01-01, от которого отсчитываются даты numpy.datetime64
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+FREQUENCIES = ("day", "week", "month")
+
+
+class TaskTimeSeries:
+    """
+    Класс для векторного расчета временных рядов по задачам
+
+    При создании столбцы таблицы задач один раз копируются в массивы NumPy (сроки и даты создания —
+    порядковыми номерами дней, статус и категория — кодами, см. `TaskTable`), после чего ряды за любой
+    период считаются операциями над массивами без обхода задач.
+
+    Дата завершения задач не хранится, поэтому завершенная задача считается завершенной
+    в день своего срока выполнения.
+    """
+
+    def __init__(self, table: TaskTable) -> None:
+        """
+        Инициализация и копирование столбцов
+
+        :param table: Таблица задач
+        """
+        self.due = np.array(table.due_dates, dtype=np.int64)
+        self.created = np.array(table.created_dates, dtype=np.int64)
+        self.statuses = np.array(table.statuses, dtype=np.int8)
+        self.categories = np.array(table.categories, dtype=np.int8)
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task]) -> 'TaskTimeSeries':
+        """
+        Создает расчет по списку задач
+
+        :param tasks: Задачи с назначенными ID
+        :return: Расчет временных рядов
+        """
+        return cls(TaskTable.from_tasks(tasks))
+
+    def __len__(self) -> int:
+        """
+        Количество задач
+
+        :return: Количество задач
+        """
+        return len(self.due)
+
+    def series(
+            self, start_date: date, end_date: date, freq: str = "day", window: int = 7, category: str | None = None
+    ) -> dict[str, list]:
+        """
+        Рассчитывает временные ряды за период
+
+        Для каждого интервала (дня, недели с понедельника или месяца) считаются:
+        created — создано задач; due — задач со сроком в интервале; completed — завершенных задач
+        со сроком в интервале; overdue и backlog — сколько задач были просрочены и не завершены
+        на последний день интервала; completion_rate — доля завершенных среди задач со сроком
+        в последних `window` интервалах.
+
+        :param start_date: Начало периода (включительно)
+        :param end_date: Конец периода (включительно)
+        :param freq: Размер интервала: "day", "week" или "month". По умолчанию "day"
+        :param window: Количество интервалов скользящего окна для completion_rate. По умолчанию 7
+        :param category: Учитывать только задачи этой категории. По умолчанию все задачи
+        :return: Словарь рядов одинаковой длины и список начальных дат интервалов (periods) в формате ISO
+        :raises ValueError: Если интервал, окно или период недопустимы
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Недопустимый интервал: {freq}")
+        if window < 1:
+            raise ValueError("Размер окна должен быть положительным")
+        if end_date < start_date:
+            raise ValueError("Конец периода раньше начала")
+
+        due, created, statuses = self.due, self.created, self.statuses
+        if category is not None:
+            mask = self.categories == Task.CATEGORY_RANK.get(category, -1)
+            due, created, statuses = due[mask], created[mask], statuses[mask]
+        completed = statuses == Task.STATUS_RANK["Завершено"]
+
+        first = self._bucket(np.array([start_date.toordinal()]), freq)[0]
+        last = self._bucket(np.array([end_date.toordinal()]), freq)[0]
+        size = int(last - first + 1)
+        starts = self._bucket_starts(first, size, freq)
+        # Последний день каждого интервала, обрезанный по границам периода
+        ends = np.minimum(np.append(starts[1:] - 1, self._bucket_starts(last + 1, 1, freq) - 1), end_date.toordinal())
+        starts = np.maximum(starts, start_date.toordinal())
+
+        created_counts = self._histogram(created, first, size, freq, start_date, end_date)
+        due_counts = self._histogram(due, first, size, freq, start_date, end_date)
+        completed_counts = self._histogram(due[completed], first, size, freq, start_date, end_date)
+
+        # Задача просрочена на день L, если создана не позже L и ее срок раньше L
+        open_overdue_from = np.sort(np.maximum(created[~completed], due[~completed] + 1))
+        overdue = np.searchsorted(open_overdue_from, ends, side="right")
+        # Задача в работе на день L, если создана не позже L и не завершена к L
+        created_until = np.searchsorted(np.sort(created), ends, side="right")
+        completed_until = np.searchsorted(np.sort(np.maximum(created[completed], due[completed])), ends, side="right")
+        backlog = created_until - completed_until
+
+        kernel = np.ones(window, dtype=np.int64)
+        rolling_completed = np.convolve(completed_counts, kernel)[:size]
+        rolling_due = np.convolve(due_counts, kernel)[:size]
+        completion_rate = np.divide(
+            rolling_completed, rolling_due, out=np.zeros(size, dtype=np.float64), where=rolling_due > 0
+        )
+
+        return {
+            "periods": [date.fromordinal(int(ordinal)).isoformat() for ordinal in starts],
+            "created": created_counts.tolist(),
+            "due": due_counts.tolist(),
+            "completed": completed_counts.tolist(),
+            "overdue": overdue.tolist(),
+            "backlog": backlog.tolist(),
+            "completion_rate": np.round(completion_rate, 4).tolist(),
+        }
+
+    def _histogram(
+            self, ordinals: np.ndarray, first: int, size: int, freq: str, start_date: date, end_date: date
+    ) -> np.ndarray:
+        """
+        Считает количество дат в каждом интервале периода
+
+        :param ordinals: Даты в виде порядковых номеров дней
+        :param first: Номер первого интервала периода
+        :param size: Количество интервалов
+        :param freq: Размер интервала
+        :param start_date: Начало периода (включительно)
+        :param end_date: Конец периода (включительно)
+        :return: Массив количеств длины `size`
+        """
+        ordinals = ordinals[(ordinals >= start_date.toordinal()) & (ordinals <= end_date.toordinal())]
+        return np.bincount(self._bucket(ordinals, freq) - first, minlength=size)[:size]
+
+    @staticmethod
+    def _bucket(ordinals: np.ndarray, freq: str) -> np.ndarray:
+        """
+        Переводит даты в номера интервалов
+
+        :param ordinals: Даты в виде порядковых номеров дней
+        :param freq: Размер интервала
+        :return: Номера интервалов: порядковый номер дня, недели (с понедельника) или месяца
+        """
+        if freq == "day":
+            return ordinals
+        if freq == "week":
+            # День с порядковым номером 1 (1 января 1 года) — понедельник
+            return (ordinals - 1) // 7
+        days = (ordinals - EPOCH_ORDINAL).astype("datetime64[D]")
+        return days.astype("datetime64[M]").astype(np.int64)
+
+    @staticmethod
+    def _bucket_starts(first: int, size: int, freq: str) -> np.ndarray:
+        """
+        Возвращает первые дни интервалов
+
+        :param first: Номер первого интервала
+        :param size: Количество интервалов
+        :param freq: Размер интервала
+        :return: Порядковые номера первых дней интервалов
+        """
+        numbers = np.arange(first, first + size, dtype=np.int64)
+        if freq == "day":
+            return numbers
+        if freq == "week":
+            return numbers * 7 + 1
+        return numbers.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) + EPOCH_ORDINAL
+
+
+def default_period(freq: str = "day", periods: int = 30, end_date: date | None = None) -> tuple[date, date]:
+    """
+    Возвращает период из последних `periods` интервалов, заканчивающийся `end_date`
+
+    :param freq: Размер интервала: "day", "week" или "month"
+    :param periods: Количество интервалов. По умолчанию 30
+    :param end_date: Конец периода. По умолчанию текущая дата
+    :return: Начало и конец периода
+    """
+    end_date = end_date or date.today()
+    if freq == "week":
+        return end_date - timedelta(days=end_date.weekday() + 7 * (periods - 1)), end_date
+    if freq == "month":
+        month = end_date.year * 12 + end_date.month - periods
+        return date(month // 12, month % 12 + 1, 1), end_date
+    return end_date - timedelta(days=periods - 1), end_date
@@ -0,0 +1,108 @@
+"""Модуль для отложенной (write-behind) записи изменений в хранилище"""
+
+import threading
+from collections.abc import Callable
+
+from .task import Task
+
+
+class WriteBehindFlusher:
+    """
+    Класс для фоновой записи изменений задач
+
+    Изменения накапливаются в очереди и записываются фоновым потоком пачкой: раз в `interval`
+    секунд или сразу, как только в очереди набирается `threshold` изменений. Записи выполняются
+    строго по очереди, поэтому порядок изменений в хранилище сохраняется.
+    """
+
+    def __init__(
+            self, write: Callable[[list[tuple[str, int, Task | None]]], None],
+            interval: float = 1.0, threshold: int = 500
+    ) -> None:
+        """
+        Инициализация и запуск фонового потока
+
+        :param write: Функция записи пачки изменений в хранилище
+        :param interval: Максимальная задержка записи в секундах. По умолчанию 1.0
+        :param threshold: Количество изменений, при котором запись выполняется без ожидания. По умолчанию 500
+        """
+        self._write = write
+        self.interval = interval
+        self.threshold = threshold
+        self._pending: list[tuple[str, int, Task | None]] = []
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="task-write-behind", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending_count(self) -> int:
+        """
+        Количество изменений, еще не записанных в хранилище
+
+        :return: Размер очереди
+        """
+        with self._condition:
+            return len(self._pending)
+
+    def enqueue(self, changes: list[tuple[str, int, Task | None]]) -> None:
+        """
+        Добавляет изменения в очередь на запись
+
+        :param changes: Изменения в виде кортежей (операция, ID задачи, задача)
+        :raises RuntimeError: Если запись уже остановлена через `close`
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Фоновая запись остановлена")
+            self._pending.extend(changes)
+            if len(self._pending) >= self.threshold:
+                self._condition.notify()
+
+    def flush(self) -> None:
+        """
+        Синхронно записывает все накопленные изменения
+
+        Если запись завершилась ошибкой, изменения возвращаются в начало очереди, а исключение
+        пробрасывается вызывающему.
+        """
+        with self._write_lock:
+            with self._condition:
+                changes, self._pending = self._pending, []
+            if not changes:
+                return
+            try:
+                self._write(changes)
+            except BaseException:
+                with self._condition:
+                    self._pending[:0] = changes
+                raise
+
+    def close(self) -> None:
+        """
+        Останавливает фоновый поток и записывает оставшиеся изменения
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        """
+        Цикл фонового потока
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or len(self._pending) >= self.threshold, timeout=self.interval
+                )
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Ошибка при сохранении задач: {e}")
@@ -0,0 +1,186 @@
+"""Тесты HTTP API задач"""
+
+from datetime import date
+
+import pytest
+
+from task_manager.task import Task
+
+pytest.importorskip("flask")
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """
+    Модуль API поверх пустого хранилища во временном каталоге
+
+    Модуль импортируется после смены каталога, потому что при импорте открывает хранилище по умолчанию.
+    """
+    monkeypatch.chdir(tmp_path)
+    from task_manager import api
+    task_api = api.TaskAPI(shared=False)
+    monkeypatch.setattr(api, "task_api", task_api)
+    yield api
+    task_api.task_manager.close()
+
+
+@pytest.fixture
+def client(api):
+    """Тестовый клиент Flask"""
+    return api.app.test_client()
+
+
+def add_tasks(api, titles: list[str]) -> None:
+    """Добавляет задачи с заданными заголовками и возрастающими сроками"""
+    api.task_api.task_manager.add_tasks([
+        Task(title, "Описание", date(2025, 1, day)) for day, title in enumerate(titles, start=1)
+    ])
+
+
+def test_next_cursor_replays_to_the_end(api, client):
+    """Переход по X-Next-Cursor возвращает все задачи по одному разу и без ошибок"""
+    titles = [f"Задача {number}" for number in range(7)]
+    add_tasks(api, titles)
+
+    seen, params = [], {"sort_by": "due_date", "limit": "3"}
+    while True:
+        response = client.get("/tasks", query_string=params)
+        assert response.status_code == 200
+        seen += [task["title"] for task in response.get_json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"sort_by": "due_date", "limit": "3", "cursor": cursor}
+    assert seen == titles
+
+
+def test_next_cursor_replays_for_sorted_search(api, client):
+    """Курсор поиска с явной сортировкой принимается на следующем запросе"""
+    add_tasks(api, ["отчет 1", "отчет 2", "отчет 3", "звонок"])
+
+    params = {"q": "отчет", "sort_by": "due_date", "limit": "2"}
+    response = client.get("/tasks", query_string=params)
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get("/tasks", query_string={**params, "cursor": cursor})
+    assert response.status_code == 200
+    assert [task["title"] for task in response.get_json()] == ["отчет 3"]
+
+
+def test_no_cursor_for_relevance_order(api, client):
+    """Поиск без сортировки упорядочен по релевантности, поэтому курсор не выдается"""
+    add_tasks(api, ["отчет 1", "отчет 2", "отчет 3"])
+
+    response = client.get("/tasks", query_string={"q": "отчет", "limit": "2"})
+    assert response.status_code == 200
+    assert len(response.get_json()) == 2
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_post_and_put_store_due_date_as_date(api, client):
+    """Срок задачи из POST и PUT хранится как дата, как и в остальных запросах"""
+    data = {"title": "Отчет", "description": "Описание", "due_date": "2025-01-05", "priority": "Низкий",
+            "category": "Работа"}
+    assert client.post("/tasks", json=data).status_code == 201
+    task_id = api.task_api.task_manager.tasks[0].id
+    assert api.task_api.task_manager.get_task(task_id).due_date == date(2025, 1, 5)
+
+    response = client.put(f"/tasks/{task_id}", json={**data, "due_date": "2025-02-01T10:30:00"})
+    assert response.status_code == 200
+    assert api.task_api.task_manager.get_task(task_id).due_date == date(2025, 2, 1)
+
+    response = client.get("/tasks/overdue")
+    assert response.status_code == 200
+    assert [task["due_date"] for task in response.get_json()] == ["2025-02-01"]
+
+
+def test_post_rejects_missing_field(client):
+    """Задача без обязательного поля не добавляется"""
+    response = client.post("/tasks", json={"title": "Отчет"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("limit", ["abc", "-1", "1.5"])
+def test_search_rejects_invalid_limit(api, client, limit):
+    """Недопустимый limit поиска отклоняется так же, как в GET /tasks"""
+    add_tasks(api, ["отчет 1", "отчет 2"])
+    assert client.get("/tasks/search", query_string={"q": "отчет", "limit": limit}).status_code == 400
+    assert client.get("/tasks", query_string={"limit": limit}).status_code == 400
+
+
+def test_search_limit(api, client):
+    """Поиск возвращает не больше limit задач"""
+    add_tasks(api, ["отчет 1", "отчет 2", "отчет 3"])
+    response = client.get("/tasks/search", query_string={"q": "отчет", "limit": "2"})
+    assert response.status_code == 200
+    assert len(response.get_json()) == 2
+
+
+TASK_DATA = {"title": "Отчет", "description": "Описание", "due_date": "2025-01-05", "priority": "Низкий",
+             "category": "Работа"}
+
+
+@pytest.mark.parametrize("field, value", [("priority", "Urgent"), ("category", "Хобби"), ("status", "Отложено")])
+def test_mutations_reject_unknown_values(api, client, field, value):
+    """Значения вне Task.ALL_* отклоняются во всех изменяющих запросах"""
+    add_tasks(api, ["Задача"])
+    task_id = api.task_api.task_manager.tasks[0].id
+    before = api.task_api.task_manager.tasks[0].to_dict()
+
+    assert client.post("/tasks", json={**TASK_DATA, field: value}).status_code == 400
+    assert client.put(f"/tasks/{task_id}", json={**TASK_DATA, field: value}).status_code == 400
+    assert client.patch(f"/tasks/{task_id}", json={field: value}).status_code == 400
+    assert client.post("/tasks/batch", json=[{"id": task_id, field: value}]).status_code == 400
+    assert client.post("/tasks/batch", json=[{**TASK_DATA, field: value}]).status_code == 400
+    assert [task.to_dict() for task in api.task_api.task_manager.tasks] == [before]
+
+
+def test_batch_rejects_unknown_fields(api, client):
+    """Пакетный запрос отклоняет неизвестные поля так же, как PATCH"""
+    add_tasks(api, ["Задача"])
+    task_id = api.task_api.task_manager.tasks[0].id
+
+    response = client.post("/tasks/batch", json=[{"id": task_id, "titel": "Опечатка"}])
+    assert response.status_code == 400
+    assert "titel" in response.get_json()["results"][0]["message"]
+    assert client.post("/tasks/batch", json=[{**TASK_DATA, "created_at": "2025-01-01"}]).status_code == 400
+    assert client.patch(f"/tasks/{task_id}", json={"titel": "Опечатка"}).status_code == 400
+    assert len(api.task_api.task_manager.tasks) == 1
+    assert client.post("/tasks/batch", json=[{"id": task_id, "title": "Новая"}]).status_code == 200
+
+
+def test_etag_is_shared_between_processes(api, client, monkeypatch):
+    """ETag записанных данных одинаков у экземпляров API над одним хранилищем, поэтому 304 работает между ними"""
+    writer, reader = api.TaskAPI(shared=True), api.TaskAPI(shared=True)
+    monkeypatch.setattr(api, "task_api", writer)
+    assert client.post("/tasks", json=TASK_DATA).status_code == 201
+    etag = client.get("/tasks").headers["ETag"]
+
+    monkeypatch.setattr(api, "task_api", reader)
+    response = client.get("/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    monkeypatch.setattr(api, "task_api", writer)
+    assert client.post("/tasks", json=TASK_DATA).status_code == 201
+    monkeypatch.setattr(api, "task_api", reader)
+    response = client.get("/tasks", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.get_json()) == 2
+
+
+def test_etag_changes_before_write_behind_flush(api, client):
+    """При фоновой записи ETag меняется сразу после изменения и становится общим после записи"""
+    etag = client.get("/tasks").headers["ETag"]
+    assert client.post("/tasks", json=TASK_DATA).status_code == 201
+    pending = client.get("/tasks").headers["ETag"]
+    assert pending != etag
+
+    api.task_api.task_manager.flush()
+    flushed = client.get("/tasks").headers["ETag"]
+    assert flushed != pending
+    restarted = api.TaskAPI(shared=False)
+    try:
+        assert restarted.task_manager.state_tag == api.task_api.task_manager.state_tag
+    finally:
+        restarted.task_manager.close()
@@ -0,0 +1,37 @@
+"""Короткий прогон нагрузочной проверки `benchmarks.concurrency_stress`"""
+
+import threading
+import time
+from functools import partial
+
+import pytest
+
+from benchmarks.concurrency_stress import StressState, random_task, reader, verify, writer
+from task_manager.storage import Storage
+from task_manager.task_manager import TaskManager
+
+
+@pytest.mark.parametrize("extension, journal, write_behind", [
+    ("json", False, False),
+    ("json", True, True),
+    ("bin", False, True),
+    ("db", False, False),
+])
+def test_concurrent_readers_and_writers(tmp_path, extension, journal, write_behind):
+    """Читатели и писатели в нескольких потоках не видят несогласованных данных"""
+    storage = partial(Storage, str(tmp_path / f"tasks.{extension}"), journal=journal)
+    manager = TaskManager(storage(), write_behind=write_behind)
+    manager.add_tasks([random_task() for _ in range(200)])
+
+    state = StressState()
+    deadline = time.perf_counter() + 0.5
+    threads = [threading.Thread(target=writer, args=(manager, state, deadline)) for _ in range(2)]
+    threads += [threading.Thread(target=reader, args=(manager, state, deadline)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    verify(manager, storage, state)
+
+    assert state.errors == []
+    assert sum(state.operations.values()) > 0
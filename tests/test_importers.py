@@ -0,0 +1,44 @@
+"""Тесты потокового импорта задач"""
+
+import json
+
+import pytest
+
+from task_manager.importers import iter_json_records
+
+
+def read_records(tmp_path, text: str, chunk_size: int) -> list:
+    """Записывает текст во временный файл и читает из него элементы JSON-массива"""
+    path = tmp_path / "tasks.json"
+    path.write_text(text, encoding="utf-8")
+    return list(iter_json_records(str(path), chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 7, 64])
+def test_values_do_not_depend_on_chunk_size(tmp_path, chunk_size):
+    """Значение, которое заканчивается на границе блока, дочитывается из следующего блока"""
+    text = '[12345, 6, -7.25e3, true, "строка", {"a": [1, 22]}, null, 333]'
+    assert read_records(tmp_path, text, chunk_size) == [12345, 6, -7250.0, True, "строка", {"a": [1, 22]}, None, 333]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+@pytest.mark.parametrize("text", ["[]", " [ ] ", "[1]", "[ 1 , 2 ]"])
+def test_valid_arrays(tmp_path, text, chunk_size):
+    """Пустой массив и массивы с пробелами разбираются"""
+    assert read_records(tmp_path, text, chunk_size) == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64])
+@pytest.mark.parametrize("text", [
+    '[{"a": 1} {"b": 2}]',
+    "[1 2]",
+    '[{"a": 1}, ]',
+    "[,1]",
+    "[1,,2]",
+    "[1",
+    '{"a": 1}',
+])
+def test_malformed_arrays_are_rejected(tmp_path, text, chunk_size):
+    """Пропущенные и лишние запятые, незакрытый массив и не массив вызывают ошибку"""
+    with pytest.raises(ValueError):
+        read_records(tmp_path, text, chunk_size)
@@ -0,0 +1,104 @@
+"""Тесты постраничного вывода запросов по курсору"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from task_manager.query import SORT_KEYS, QueryEngine, TaskQuery
+from task_manager.storage import Storage
+from task_manager.task import Task
+from task_manager.task_manager import TaskManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """Менеджер с задачами, у которых много одинаковых значений столбцов"""
+    manager = TaskManager(Storage(str(tmp_path / "tasks.json")))
+    manager.add_tasks([
+        Task(
+            f"Задача {number % 4}", "Описание", date(2025, 1, 1) + timedelta(days=number % 5),
+            Task.ALL_PRIORITIES[number % 3], Task.ALL_CATEGORIES[number % 3], Task.ALL_STATUSES[number % 2]
+        )
+        for number in range(30)
+    ])
+    return manager
+
+
+def run(manager: TaskManager, query: TaskQuery, use_view: bool):
+    """Выполняет запрос через представление столбца менеджера или перебором задач без индексов"""
+    if use_view:
+        return manager.query(query)
+    return QueryEngine(dict(manager.snapshot()), {}).execute(query)
+
+
+def expected_order(tasks: list[Task], field: str, direction: str) -> list[int]:
+    """ID задач в порядке сортировки: по значению столбца, при равных значениях — по возрастанию ID"""
+    tasks = sorted(tasks, key=lambda task: task.id)
+    return [task.id for task in sorted(tasks, key=SORT_KEYS[field], reverse=direction == "desc")]
+
+
+def paginate(manager: TaskManager, use_view: bool, page_size: int, after: list | None = None, **params) -> list[int]:
+    """Проходит страницы запроса по курсору, начиная после `after`, и возвращает ID задач"""
+    seen = []
+    # Курсор, который не продвигается, повторял бы страницы бесконечно
+    for _ in range(len(manager) + 1):
+        query = TaskQuery(limit=page_size, after=after, **params)
+        page = run(manager, query, use_view)
+        seen += [task.id for task in page]
+        if len(page) < page_size:
+            return seen
+        after = query.cursor(page[-1])
+    pytest.fail("Страницы по курсору не заканчиваются")
+
+
+@pytest.mark.parametrize("use_view", [True, False])
+@pytest.mark.parametrize("field", ["priority", "due_date", "title", "status"])
+@pytest.mark.parametrize("direction", ["asc", "desc"])
+@pytest.mark.parametrize("page_size", [1, 4, 7])
+def test_cursor_pages_cover_ties(manager, use_view, field, direction, page_size):
+    """Страницы по курсору проходят группы одинаковых значений без пропусков и повторов"""
+    seen = paginate(manager, use_view, page_size, sort=[(field, direction)])
+    assert seen == expected_order(manager.tasks, field, direction)
+
+
+@pytest.mark.parametrize("use_view", [True, False])
+@pytest.mark.parametrize("direction", ["asc", "desc"])
+def test_cursor_with_filters(manager, use_view, direction):
+    """Курсор сочетается с фильтрами и диапазоном сроков, а total считает все подходящие задачи"""
+    params = {
+        "filters": {"status": "В работе"}, "due_from": date(2025, 1, 2), "sort": [("due_date", direction)]
+    }
+    matching = [
+        task for task in manager.tasks if task.status == "В работе" and task.due_date >= date(2025, 1, 2)
+    ]
+    assert paginate(manager, use_view, 3, **params) == expected_order(matching, "due_date", direction)
+
+    first = TaskQuery(limit=3, **params)
+    page = run(manager, first, use_view)
+    second = run(manager, TaskQuery(limit=3, after=first.cursor(page[-1]), **params), use_view)
+    assert second.total == len(matching)
+
+
+@pytest.mark.parametrize("use_view", [True, False])
+def test_cursor_survives_changes_between_pages(manager, use_view):
+    """Задачи, добавленные и удаленные между страницами, не сдвигают следующую страницу"""
+    sort = [("due_date", "desc")]
+    # Граница страницы приходится на середину группы задач с одинаковым сроком
+    query = TaskQuery(sort=sort, limit=8)
+    first = [task.id for task in run(manager, query, use_view)]
+    after = query.cursor(manager.get_task(first[-1]))
+    rest = expected_order(manager.tasks, "due_date", "desc")[8:]
+
+    # Удаляются задача с уже выданной страницы и задача со следующей
+    manager.delete_tasks([first[0], rest[0]])
+    # Новая задача с самым поздним сроком стоит раньше курсора, с самым ранним — после него
+    before_id, after_id = manager.add_tasks([
+        Task("Новая", "", date(2025, 2, 1), "Высокий", "Работа", "В работе"),
+        Task("Новая", "", date(2024, 12, 1), "Низкий", "Работа", "В работе"),
+    ])
+
+    seen = first + paginate(manager, use_view, 8, sort=sort, after=after)
+    assert len(seen) == len(set(seen))
+    assert before_id not in seen
+    assert seen[-1] == after_id
+    assert seen[len(first):-1] == rest[1:]
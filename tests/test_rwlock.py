@@ -0,0 +1,275 @@
+"""Тесты блокировки чтения-записи"""
+
+import threading
+import time
+from collections.abc import Callable
+
+import pytest
+
+from task_manager.rwlock import ReadWriteLock
+
+TIMEOUT = 5.0
+
+
+class Interrupted(Exception):
+    """Исключение, прерывающее ожидание блокировки"""
+
+
+def wait_until(predicate: Callable[[], bool]) -> None:
+    """Ждет выполнения условия не дольше `TIMEOUT`"""
+    deadline = time.monotonic() + TIMEOUT
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("Условие не выполнилось за отведенное время")
+        time.sleep(0.001)
+
+
+class Worker:
+    """Поток, который захватывает блокировку и держит ее, пока его не отпустят"""
+
+    def __init__(self, acquire: Callable[[], None], release: Callable[[], None]) -> None:
+        """Запуск потока"""
+        self.acquired = threading.Event()
+        self.proceed = threading.Event()
+        self.error: BaseException | None = None
+        self._acquire = acquire
+        self._release = release
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        """Захват, ожидание разрешения и освобождение блокировки"""
+        try:
+            self._acquire()
+        except BaseException as e:
+            self.error = e
+            return
+        self.acquired.set()
+        self.proceed.wait(TIMEOUT)
+        self._release()
+
+    def finish(self) -> None:
+        """Отпускает блокировку и дожидается завершения потока"""
+        self.proceed.set()
+        self.thread.join(TIMEOUT)
+        assert not self.thread.is_alive()
+
+
+def reader(lock: ReadWriteLock) -> Worker:
+    """Поток, удерживающий блокировку чтения"""
+    return Worker(lock.acquire_read, lock.release_read)
+
+
+def writer(lock: ReadWriteLock) -> Worker:
+    """Поток, удерживающий блокировку записи"""
+    return Worker(lock.acquire_write, lock.release_write)
+
+
+def interruptible(lock: ReadWriteLock, monkeypatch) -> Callable[[Worker], None]:
+    """
+    Позволяет прервать ожидание блокировки потоком исключением `Interrupted`
+
+    :return: Функция, прерывающая ожидание переданного потока
+    """
+    condition = lock._condition
+    wait = condition.wait
+    targets = set()
+
+    def interruptible_wait(timeout: float | None = None) -> bool:
+        if threading.get_ident() in targets:
+            raise Interrupted()
+        return wait(timeout)
+
+    def interrupt(worker: Worker) -> None:
+        with condition:
+            targets.add(worker.thread.ident)
+            condition.notify_all()
+        worker.thread.join(TIMEOUT)
+        assert isinstance(worker.error, Interrupted)
+
+    monkeypatch.setattr(condition, "wait", interruptible_wait)
+    return interrupt
+
+
+def test_readers_share_lock():
+    """Несколько читателей держат блокировку одновременно"""
+    lock = ReadWriteLock()
+    readers = [reader(lock) for _ in range(3)]
+    for worker in readers:
+        assert worker.acquired.wait(TIMEOUT)
+    for worker in readers:
+        worker.finish()
+
+
+def test_writer_excludes_readers_and_writers():
+    """Пока писатель держит блокировку, другие потоки не читают и не пишут"""
+    lock = ReadWriteLock()
+    first = writer(lock)
+    assert first.acquired.wait(TIMEOUT)
+    second, blocked_reader = writer(lock), reader(lock)
+    wait_until(lambda: lock._readers_waiting == 1 and len(lock._write_queue) == 1)
+    assert not second.acquired.is_set() and not blocked_reader.acquired.is_set()
+
+    first.finish()
+    # Читатель, дождавшийся окончания записи, входит раньше следующего писателя
+    assert blocked_reader.acquired.wait(TIMEOUT)
+    assert not second.acquired.is_set()
+    blocked_reader.finish()
+    assert second.acquired.wait(TIMEOUT)
+    second.finish()
+
+
+def test_writer_waits_for_readers():
+    """Писатель ждет, пока читатели отпустят блокировку, а новые читатели ждут писателя"""
+    lock = ReadWriteLock()
+    first = reader(lock)
+    assert first.acquired.wait(TIMEOUT)
+    waiting_writer = writer(lock)
+    wait_until(lambda: len(lock._write_queue) == 1)
+    late_reader = reader(lock)
+    wait_until(lambda: lock._readers_waiting == 1)
+
+    first.finish()
+    assert waiting_writer.acquired.wait(TIMEOUT)
+    assert not late_reader.acquired.is_set()
+    waiting_writer.finish()
+    assert late_reader.acquired.wait(TIMEOUT)
+    late_reader.finish()
+
+
+def test_writer_reenters_write_and_read():
+    """Писатель повторно захватывает запись и чтение"""
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                assert lock._writer == threading.get_ident()
+        assert lock._write_depth == 1
+
+    worker = writer(lock)
+    assert worker.acquired.wait(TIMEOUT)
+    worker.finish()
+
+
+def test_reader_reenters_while_writer_waits():
+    """Читатель повторно захватывает чтение, даже если уже ждет писатель"""
+    lock = ReadWriteLock()
+    writer_queued, reentered = threading.Event(), threading.Event()
+
+    def hold() -> None:
+        with lock.read():
+            writer_queued.wait(TIMEOUT)
+            with lock.read():
+                reentered.set()
+
+    thread = threading.Thread(target=hold, daemon=True)
+    thread.start()
+    wait_until(lambda: bool(lock._readers))
+    waiting_writer = writer(lock)
+    wait_until(lambda: len(lock._write_queue) == 1)
+
+    writer_queued.set()
+    assert reentered.wait(TIMEOUT)
+    thread.join(TIMEOUT)
+    assert waiting_writer.acquired.wait(TIMEOUT)
+    waiting_writer.finish()
+
+
+def test_read_to_write_upgrade_raises():
+    """Захват записи читателем отклоняется, а блокировка остается пригодной"""
+    lock = ReadWriteLock()
+    with lock.read():
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+        assert not lock._write_queue
+
+    worker = writer(lock)
+    assert worker.acquired.wait(TIMEOUT)
+    worker.finish()
+
+
+def test_release_without_acquire_raises():
+    """Освобождение блокировки, которую поток не держит, отклоняется"""
+    lock = ReadWriteLock()
+    with pytest.raises(RuntimeError):
+        lock.release_read()
+    with pytest.raises(RuntimeError):
+        lock.release_write()
+
+    # Чужую блокировку освободить тоже нельзя
+    worker = writer(lock)
+    assert worker.acquired.wait(TIMEOUT)
+    with pytest.raises(RuntimeError):
+        lock.release_write()
+    worker.finish()
+    worker = reader(lock)
+    assert worker.acquired.wait(TIMEOUT)
+    with pytest.raises(RuntimeError):
+        lock.release_read()
+    worker.finish()
+
+
+def test_context_managers_release_on_exception():
+    """Блокировки `read` и `write` освобождаются при исключении внутри блока"""
+    lock = ReadWriteLock()
+    with pytest.raises(ValueError):
+        with lock.write():
+            raise ValueError()
+    with pytest.raises(ValueError):
+        with lock.read():
+            raise ValueError()
+    assert lock._writer is None and not lock._readers
+
+
+def test_interrupted_writer_lets_readers_in(monkeypatch):
+    """Читатели, пропускавшие ожидающего писателя вперед, входят, если его ожидание прервано"""
+    lock = ReadWriteLock()
+    interrupt = interruptible(lock, monkeypatch)
+    holder = reader(lock)
+    assert holder.acquired.wait(TIMEOUT)
+    waiting_writer = writer(lock)
+    wait_until(lambda: len(lock._write_queue) == 1)
+    late_reader = reader(lock)
+    wait_until(lambda: lock._readers_waiting == 1)
+
+    interrupt(waiting_writer)
+    assert late_reader.acquired.wait(TIMEOUT)
+    assert not lock._write_queue
+    late_reader.finish()
+    holder.finish()
+
+
+def test_interrupted_writer_lets_next_writer_in(monkeypatch):
+    """Прерванный писатель из начала очереди не задерживает следующего"""
+    lock = ReadWriteLock()
+    interrupt = interruptible(lock, monkeypatch)
+    holder = reader(lock)
+    assert holder.acquired.wait(TIMEOUT)
+    first = writer(lock)
+    wait_until(lambda: len(lock._write_queue) == 1)
+    second = writer(lock)
+    wait_until(lambda: len(lock._write_queue) == 2)
+
+    interrupt(first)
+    holder.finish()
+    assert second.acquired.wait(TIMEOUT)
+    second.finish()
+
+
+def test_interrupted_reader_does_not_block_writers(monkeypatch):
+    """Писатель не ждет читателя, ожидание которого прервано"""
+    lock = ReadWriteLock()
+    interrupt = interruptible(lock, monkeypatch)
+    holder = writer(lock)
+    assert holder.acquired.wait(TIMEOUT)
+    waiting_reader = reader(lock)
+    wait_until(lambda: lock._readers_waiting == 1)
+    waiting_writer = writer(lock)
+    wait_until(lambda: len(lock._write_queue) == 1)
+
+    interrupt(waiting_reader)
+    assert lock._readers_waiting == 0
+    holder.finish()
+    assert waiting_writer.acquired.wait(TIMEOUT)
+    assert lock._readers_admitted == 0
+    waiting_writer.finish()
@@ -0,0 +1,110 @@
+"""Тесты хранилища задач"""
+
+import json
+from datetime import date
+
+import pytest
+
+from task_manager.storage import Storage
+from task_manager.task import Task
+from task_manager.task_manager import TaskManager
+
+
+def make_task(title: str) -> Task:
+    """Создает задачу с заданным заголовком"""
+    return Task(title, "Описание", date(2025, 1, 1))
+
+
+def test_journal_keeps_writes_after_torn_record(tmp_path, monkeypatch):
+    """Записи, сделанные после аварийного обрыва журнала, не теряются при следующей загрузке"""
+    monkeypatch.chdir(tmp_path)
+    file_path = str(tmp_path / "tasks.json")
+
+    manager = TaskManager(Storage(file_path, journal=True))
+    manager.add_task(make_task("one"))
+    # Аварийное завершение посреди записи: в конце журнала остается недописанная строка
+    with open(manager.storage.journal_path, "a") as journal:
+        journal.write('{"op": "add", "id": 2, "task": {"tit')
+
+    manager = TaskManager(Storage(file_path, journal=True))
+    assert [task.title for task in manager.tasks] == ["one"]
+    manager.add_task(make_task("two"))
+    manager.add_task(make_task("three"))
+
+    manager = TaskManager(Storage(file_path, journal=True))
+    assert [task.title for task in manager.tasks] == ["one", "two", "three"]
+
+
+@pytest.mark.parametrize("extension", [".json", ".bin", ".db", ".parts"])
+def test_backups_stay_next_to_storage(tmp_path, monkeypatch, extension):
+    """Резервные копии хранилища пишутся рядом с ним, а не в data/backup текущей директории"""
+    monkeypatch.chdir(tmp_path)
+    file_path = str(tmp_path / "store" / f"tasks{extension}")
+    (tmp_path / "store").mkdir()
+
+    manager = TaskManager(Storage(file_path))
+    manager.add_task(make_task("one"))
+    manager.add_task(make_task("two"))
+    manager.close()
+
+    assert any((tmp_path / "store" / "backup" / f"tasks{extension}").iterdir())
+    assert not (tmp_path / "data").exists()
+
+
+def test_sqlite_import_is_one_transaction(tmp_path, monkeypatch):
+    """Ошибка посреди импорта в SQLite не оставляет в базе уже разобранные задачи"""
+    monkeypatch.chdir(tmp_path)
+    file_path = str(tmp_path / "tasks.db")
+    record = {"title": "Отчет", "description": "Описание", "due_date": "2025-01-01", "priority": "Низкий",
+              "category": "Работа", "status": "В работе"}
+    source = tmp_path / "import.json"
+    source.write_text(f"[{json.dumps(record)}, {json.dumps(record)}, {{\"title\": ", encoding="utf-8")
+
+    manager = TaskManager(Storage(file_path))
+    with pytest.raises(Exception):
+        manager.import_from_json(str(source), batch_size=1)
+    assert len(manager) == 0
+    manager.close()
+
+    storage = Storage(file_path)
+    assert storage.load_tasks() == []
+    indexes = storage.connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall()
+    assert not [name for (name,) in indexes if name.startswith("idx_tasks_")]
+
+
+def test_snapshot_rejects_unknown_values(tmp_path):
+    """Задача со значением вне `Task.ALL_*` не попадает в хранилище снимка и не ломает следующие записи"""
+    file_path = str(tmp_path / "tasks.bin")
+    manager = TaskManager(Storage(file_path, compact_threshold=2))
+    task = make_task("Срочная")
+    task.priority = "Urgent"
+    with pytest.raises(ValueError):
+        manager.add_task(task)
+    with pytest.raises(ValueError):
+        manager.add_tasks([make_task("one"), task])
+    manager.add_tasks([make_task("one"), make_task("two"), make_task("three")])
+
+    manager = TaskManager(Storage(file_path, compact_threshold=2))
+    assert [task.title for task in manager.tasks] == ["one", "two", "three"]
+
+
+def test_compaction_failure_does_not_repeat_journaled_changes(tmp_path, monkeypatch):
+    """Если сжатие журнала не удалось, изменения, уже записанные в журнал, не записываются повторно"""
+    file_path = str(tmp_path / "tasks.bin")
+    storage = Storage(file_path, compact_threshold=1)
+
+    def fail_compact(tasks):
+        raise OSError("диск заполнен")
+
+    monkeypatch.setattr(storage, "compact", fail_compact)
+    manager = TaskManager(storage, write_behind=True, flush_interval=60)
+    manager.add_task(make_task("one"))
+    manager.flush()
+    manager.add_task(make_task("two"))
+    manager.flush()
+    manager.close()
+
+    with open(storage.journal_path) as journal:
+        assert len(journal.readlines()) == 2
+    manager = TaskManager(Storage(file_path))
+    assert [task.title for task in manager.tasks] == ["one", "two"]
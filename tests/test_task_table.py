@@ -0,0 +1,79 @@
+"""Тесты столбцовой таблицы задач"""
+
+from datetime import date
+
+import pytest
+
+from task_manager.storage import Storage
+from task_manager.task import Task
+from task_manager.task_manager import TaskManager
+from task_manager.task_table import UNKNOWN_CODE, TaskTable
+
+
+def make_task(title: str, day: int, status: str = "В работе", category: str = "Работа") -> Task:
+    """Создает задачу со сроком в январе 2025 года"""
+    return Task(title, "Описание", date(2025, 1, day), "Средний", category, status)
+
+
+def test_table_follows_manager_changes(tmp_path):
+    """Таблица, которую поддерживает менеджер, совпадает с задачами после добавлений, изменений и удалений"""
+    manager = TaskManager(Storage(str(tmp_path / "tasks.json")))
+    manager.add_tasks([make_task(f"Задача {day}", day) for day in range(1, 6)])
+    manager.time_series()
+    manager.edit_task(2, make_task("Изменена", 20, status="Завершено", category="Учеба"))
+    manager.delete_task(1)
+    manager.add_task(make_task("Новая", 9))
+
+    table = manager._indexes["table"]
+    rows = sorted((task.to_dict() for task in table), key=lambda data: data["id"])
+    assert rows == [task.to_dict() for task in manager.tasks]
+    assert table[table.row_of(2)].category == "Учеба"
+    with pytest.raises(IndexError):
+        table.row_of(1)
+
+
+def test_filter_and_argsort_over_codes():
+    """Фильтры и сортировки работают по кодам и порядковым номерам дат"""
+    table = TaskTable.from_tasks([
+        Task("a", "", date(2025, 1, 3), "Высокий", "Работа", "Завершено", task_id=1),
+        Task("b", "", date(2025, 1, 1), "Низкий", "Личное", "В работе", task_id=2),
+        Task("c", "", date(2025, 1, 2), "Средний", "Работа", "В работе", task_id=3),
+    ])
+    rows = table.filter(category="Работа", exclude_status="Завершено")
+    assert [table.ids[row] for row in rows] == [3]
+    assert [table.ids[row] for row in table.argsort("due_date")] == [2, 3, 1]
+    assert [table.ids[row] for row in table.argsort("priority", reverse=True)] == [1, 3, 2]
+
+
+def test_unknown_values_are_kept_as_unknown_code():
+    """Значение вне `Task.ALL_*` не мешает построить таблицу, но не восстанавливается в задачу"""
+    table = TaskTable.from_tasks([Task("a", "", date(2025, 1, 1), "Срочный", "Работа", "В работе", task_id=1)])
+    assert table.priorities[0] == UNKNOWN_CODE
+    with pytest.raises(ValueError):
+        table[0]
+
+
+def test_time_series_from_table_matches_tasks(tmp_path):
+    """Ряды по таблице менеджера совпадают с рядами, посчитанными по списку задач"""
+    pytest.importorskip("numpy")
+    from task_manager.timeseries import TaskTimeSeries
+
+    manager = TaskManager(Storage(str(tmp_path / "tasks.json")))
+    manager.add_tasks([make_task(f"Задача {day}", day, "Завершено" if day % 3 else "В работе") for day in range(1, 29)])
+    manager.delete_task(5)
+    start, end = date(2024, 12, 25), date(2025, 2, 5)
+    assert manager.time_series().series(start, end, freq="week") == \
+        TaskTimeSeries.from_tasks(manager.tasks).series(start, end, freq="week")
+
+
+def test_time_series_is_built_once_per_version(tmp_path):
+    """Расчет временных рядов переиспользуется, пока задачи не изменились"""
+    pytest.importorskip("numpy")
+    manager = TaskManager(Storage(str(tmp_path / "tasks.json")))
+    manager.add_task(make_task("Задача", 1))
+    engine = manager.time_series()
+    assert manager.time_series() is engine
+
+    manager.add_task(make_task("Еще задача", 2))
+    assert manager.time_series() is not engine
+    assert len(manager.time_series()) == 2